@@ -0,0 +1,623 @@
+"""background.py: Background expansion solver for Zero Field Primordial
+
+Integrates the coupled Klein-Gordon + Friedmann system for φ, φ̇ and H in
+the scale factor. The right-hand side is written with plain NumPy
+operations, so the same function advances a single model or a whole batch
+of parameter vectors stacked as one (3, N_params) state.
+
+The batched integrators share the output a-grid across the batch, so one
+call evaluates every walker of an emcee step at once:
+  - solve_zero_field_shooting (default): forward from z_i = 1000 with
+    φ̇_i = 0, φ_i root-found so that H(z=0) = H0 (warm-started per point);
+  - solve_zero_field_adaptive: backward from a = 1 in ln a, per-member
+    adaptive Dormand-Prince steps, averaged WKB fluid once m_phi/H is large;
+  - solve_zero_field_batch: fixed-step RK4 in a, backward from a = 1.
+"""
+
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from telemetry import TELEMETRY
+
+# ============================================================================
+# COSMOLOGICAL MODEL
+# ============================================================================
+
+N_NODES = 100   # output nodes in the scale factor (as in the original odeint grid)
+N_SUBSTEPS = 1  # RK4 steps between output nodes (rel. error ~1e-9 on H)
+PHI0 = 1e-10    # Small initial field value at a = 1
+PHI_DOT0 = 0.0
+
+def H_lcdm(z, H0, Omega_m):
+    """ΛCDM Hubble parameter"""
+    Omega_Lambda = 1.0 - Omega_m
+    return H0 * np.sqrt(Omega_m * (1 + z)**3 + Omega_Lambda)
+
+def friedmann_zero_field(y, a, H0, Omega_m, m_phi):
+    """
+    Friedmann equations for Zero Field Primordial model
+    y = [phi, phi_dot, H]
+
+    Each component of y may be a scalar or an array over a batch of
+    parameter vectors (H0, Omega_m, m_phi broadcast against it).
+    """
+    phi, phi_dot, H = y
+
+    # Scalar field energy density and pressure
+    rho_phi = 0.5 * phi_dot**2 + 0.5 * m_phi**2 * phi**2
+    p_phi = 0.5 * phi_dot**2 - 0.5 * m_phi**2 * phi**2
+
+    # Matter density (dust)
+    rho_m = Omega_m * (H0**2) * (a**(-3))
+
+    # Klein-Gordon equation
+    dphi_da = phi_dot / (a * H)
+    dphi_dot_da = -(3 * H / (a * H)) * phi_dot - (m_phi**2 * phi) / (a * H**2)
+    dH_da = -((3/2) * H / a) * (1 + (p_phi + 0) / (rho_m + rho_phi))
+
+    return np.array([dphi_da, dphi_dot_da, dH_da])
+
+# ============================================================================
+# BATCHED SOLVER
+# ============================================================================
+
+def _broadcast_params(H0, Omega_m, m_phi):
+    """Broadcast parameters to 1D arrays of common length N_params"""
+    H0, Omega_m, m_phi = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(H0, dtype=float)),
+        np.atleast_1d(np.asarray(Omega_m, dtype=float)),
+        np.atleast_1d(np.asarray(m_phi, dtype=float)))
+    return H0.ravel(), Omega_m.ravel(), m_phi.ravel()
+
+def solve_zero_field_batch(a_array, H0, Omega_m, m_phi, substeps=N_SUBSTEPS):
+    """
+    Integrate [phi, phi_dot, H] from a_array[0] = 1 for a batch of models.
+
+    Returns array of shape (len(a_array), 3, N_params).
+    """
+    H0, Omega_m, m_phi = _broadcast_params(H0, Omega_m, m_phi)
+    args = (H0, Omega_m, m_phi)
+
+    y = np.array([np.full_like(H0, PHI0), np.full_like(H0, PHI_DOT0), H0])
+    sol = np.empty((len(a_array), 3, len(H0)))
+    sol[0] = y
+
+    for i in range(1, len(a_array)):
+        a = a_array[i - 1]
+        h = (a_array[i] - a) / substeps
+        for _ in range(substeps):
+            k1 = friedmann_zero_field(y, a, *args)
+            k2 = friedmann_zero_field(y + 0.5 * h * k1, a + 0.5 * h, *args)
+            k3 = friedmann_zero_field(y + 0.5 * h * k2, a + 0.5 * h, *args)
+            k4 = friedmann_zero_field(y + h * k3, a + h, *args)
+            y = y + (h / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+            a = a + h
+        sol[i] = y
+
+    return sol
+
+# ============================================================================
+# ADAPTIVE SOLVER WITH WKB REGIME
+# ============================================================================
+
+# Which integrator solve_background_batch uses: 'shooting' (from z_i, H(0) = H0
+# enforced), or the a = 1 integrators 'adaptive' / 'rk4'
+SOLVER = 'shooting'
+RTOL = 1e-8            # per-step relative tolerance of the adaptive solver
+WKB_THRESHOLD = 10.0   # m_phi / H above which the field is treated as an averaged fluid
+MAX_STEPS = 10000      # step budget per output interval before declaring failure
+
+# Dormand-Prince 5(4) tableau
+_DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_DP_B5 = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+_DP_B4 = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+def _rhs_ln_a(x, y, H0, Omega_m, m_phi, wkb):
+    """
+    d[phi, phi_dot, H]/d ln a for a batch.
+
+    Members flagged wkb use the averaged description of a rapidly
+    oscillating field: pressureless (w ≈ 0) with amplitude φ ∝ a^(-3/2).
+    """
+    a = np.exp(x)
+    full = a * friedmann_zero_field(y, a, H0, Omega_m, m_phi)
+    if not np.any(wkb):
+        return full
+    averaged = np.array([-1.5 * y[0], np.zeros_like(y[1]), -1.5 * y[2]])
+    return np.where(wkb, averaged, full)
+
+def solve_zero_field_adaptive(a_array, H0, Omega_m, m_phi, rtol=RTOL,
+                              wkb_threshold=WKB_THRESHOLD):
+    """
+    Integrate [phi, phi_dot, H] in ln a with per-member adaptive step control.
+
+    Every member of the batch advances with its own Dormand-Prince 5(4)
+    step size between consecutive output nodes of a_array. While
+    m_phi / H > wkb_threshold the member follows the averaged (WKB) fluid
+    instead of resolving the oscillations, which keeps the step count
+    bounded across the m_phi prior. Members that exhaust MAX_STEPS or whose
+    step size underflows are returned as NaN.
+
+    Telemetry: 'solver.nfev' (batched RHS evaluations, also histogrammed
+    per call as 'solver.nfev_per_call'), 'solver.wkb' and
+    'solver.abort.max_steps' / 'solver.abort.step_underflow' (members).
+
+    Returns array of shape (len(a_array), 3, N_params).
+    """
+    H0, Omega_m, m_phi = _broadcast_params(H0, Omega_m, m_phi)
+    args = (H0, Omega_m, m_phi)
+    n = len(H0)
+
+    y = np.array([np.full_like(H0, PHI0), np.full_like(H0, PHI_DOT0), H0])
+    sol = np.empty((len(a_array), 3, n))
+    sol[0] = y
+
+    # Absolute error floors: field scales set by the initial amplitude
+    atol = rtol * np.array([np.full(n, abs(PHI0)), abs(PHI0) * H0, np.zeros(n)])
+
+    x_nodes = np.log(a_array)
+    x = np.full(n, x_nodes[0])
+    h = np.full(n, x_nodes[1] - x_nodes[0] if len(x_nodes) > 1 else 0.0)
+    wkb = m_phi / H0 > wkb_threshold
+    TELEMETRY.count('solver.wkb', np.count_nonzero(wkb))
+    failed = np.zeros(n, dtype=bool)
+    exhausted = np.zeros(n, dtype=bool)
+    nfev = 0
+
+    with np.errstate(all='ignore'):
+        for i in range(1, len(x_nodes)):
+            target = x_nodes[i]
+            for _ in range(MAX_STEPS):
+                remaining = target - x
+                active = (np.abs(remaining) > 1e-14 * max(1.0, abs(target))) & ~failed
+                if not np.any(active):
+                    break
+                wkb &= m_phi / y[2] > wkb_threshold
+                h_try = np.where(active, np.sign(remaining) *
+                                 np.minimum(np.abs(h), np.abs(remaining)), 0.0)
+
+                k = np.empty((7,) + y.shape)
+                k[0] = _rhs_ln_a(x, y, *args, wkb)
+                for j in range(1, 7):
+                    y_stage = y + h_try * np.tensordot(_DP_A[j], k[:j], axes=1)
+                    k[j] = _rhs_ln_a(x + _DP_C[j] * h_try, y_stage, *args, wkb)
+                y5 = y + h_try * np.tensordot(_DP_B5, k, axes=1)
+                err_vec = h_try * np.tensordot(_DP_B5 - _DP_B4, k, axes=1)
+                nfev += 7
+
+                scale = atol + rtol * np.maximum(np.abs(y), np.abs(y5))
+                err = np.sqrt(np.mean((err_vec / np.where(scale > 0, scale, 1.0))**2, axis=0))
+                err = np.where(np.isfinite(err), err, np.inf)
+
+                accept = active & (err <= 1.0)
+                y = np.where(accept, y5, y)
+                x = np.where(accept, x + h_try, x)
+                factor = np.clip(0.9 * np.where(err > 0, err, 1e-10)**-0.2, 0.2, 5.0)
+                h = np.where(active, h_try * factor, h)
+                failed |= active & (np.abs(h) < 1e-12)
+            else:
+                exhausted |= (np.abs(target - x) > 1e-14 * max(1.0, abs(target))) & ~failed
+                failed |= exhausted
+            sol[i] = y
+
+    TELEMETRY.count('solver.nfev', nfev)
+    TELEMETRY.observe('solver.nfev_per_call', nfev)
+    TELEMETRY.count('solver.abort.max_steps', np.count_nonzero(exhausted))
+    TELEMETRY.count('solver.abort.step_underflow', np.count_nonzero(failed & ~exhausted))
+    sol[:, :, failed] = np.nan
+    return sol
+
+# ============================================================================
+# SHOOTING FROM z_i
+# ============================================================================
+
+# Initial conditions of model/condicoes_iniciais.md: φ̇_i = 0 at z_i, with φ_i
+# found by root-finding so that the flat closure gives H(z=0) = H0.
+Z_INITIAL = 1000.0
+GEV_PER_H_UNIT = 2.1332e-44  # ħ × (1 km/s/Mpc) in GeV: m_phi [GeV] → H units
+N_EARLY_STEPS = 150          # RK4 steps in ln a from z_i to the top of the output grid
+N_NODE_SUBSTEPS = 1          # RK4 steps between output nodes
+SHOOT_TOL = 1e-8             # |ln(ρ_φ0 / ρ_crit,0(1 - Ω_m))| at convergence
+SHOOT_XTOL = 1e-12           # bracket width in ln ψ_i that also counts as converged
+SHOOT_MAXITER = 60
+
+class ShootingCache:
+    """
+    Solved shooting problems for warm starts.
+
+    In units of H0 the problem depends only on (Omega_m, m_phi / H0), so
+    one entry serves every H0. Each entry holds the root ln ψ_i (ψ = m φ in
+    units of H0) and the local slope d ln ρ_φ0 / d ln ψ_i; a new point
+    starts from its nearest cached neighbour with a Newton step on that
+    slope, which usually lands within SHOOT_TOL in one or two integrations.
+    Oldest entries are dropped beyond maxsize.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.points = np.empty((0, 2))
+        self.values = np.empty((0, 2))
+
+    def nearest(self, points):
+        """(ln ψ_i, slope) of the nearest cached point, or None if empty"""
+        if not len(self.points):
+            return None
+        idx = np.empty(len(points), dtype=int)
+        for start in range(0, len(points), 256):  # bounded (256, size) distance blocks
+            block = points[start:start + 256, None, :] - self.points[None, :, :]
+            idx[start:start + 256] = np.argmin(np.sum(block**2, axis=-1), axis=1)
+        return self.values[idx]
+
+    def add(self, points, values):
+        self.points = np.concatenate([self.points, points])[-self.maxsize:]
+        self.values = np.concatenate([self.values, values])[-self.maxsize:]
+
+    def clear(self):
+        self.__init__(self.maxsize)
+
+    def info(self):
+        return {'size': len(self.points), 'maxsize': self.maxsize}
+
+SHOOTING_CACHE = ShootingCache()
+
+def _shooting_grid(a_array):
+    """ln a steps from z_i through the output nodes; indices of the nodes in it"""
+    x_nodes = np.log(a_array)
+    order = np.argsort(x_nodes)
+    x_out = x_nodes[order]
+    early = np.linspace(-np.log1p(Z_INITIAL), x_out[0], N_EARLY_STEPS + 1)
+    late = [np.linspace(x_out[i], x_out[i + 1], N_NODE_SUBSTEPS + 1)[1:]
+            for i in range(len(x_out) - 1)]
+    grid = np.concatenate([early] + late)
+    node_idx = np.empty(len(x_nodes), dtype=int)
+    node_idx[order] = N_EARLY_STEPS + N_NODE_SUBSTEPS * np.arange(len(x_out))
+    return grid, node_idx
+
+def _hubble_units(x, y, Omega_m):
+    """H / H0 from the closure H² = H0²Ω_m a⁻³ + ρ_φ, ρ_φ = (ψ² + v²)/6"""
+    return np.sqrt(Omega_m * np.exp(-3 * x) + (y[0]**2 + y[1]**2) / 6.0)
+
+def _wkb_regime(x, Omega_m, mu, wkb_threshold):
+    """
+    Members in the averaged regime at ln a = x: m_phi / H above the threshold
+    on the expansion the closure targets (H0²(Ω_m a⁻³ + 1 - Ω_m)). Depending
+    only on (Ω_m, μ) and not on ψ_i, the switch does not move between root-
+    finding iterations, so ρ_φ0 is a continuous function of ψ_i.
+    """
+    return mu > wkb_threshold * np.sqrt(Omega_m * np.exp(-3 * x) + 1 - Omega_m)
+
+def _rhs_shooting(x, y, Omega_m, mu, wkb):
+    """
+    d[ψ, v]/d ln a in units of H0, with ψ = m φ and v = dφ/dt (φ in M_Pl).
+
+    Members flagged wkb follow the averaged field (ρ_φ ∝ a⁻³).
+    """
+    h = _hubble_units(x, y, Omega_m)
+    full = np.array([mu * y[1] / h, -3 * y[1] - mu * y[0] / h])
+    if not np.any(wkb):
+        return full
+    return np.where(wkb, -1.5 * y, full)
+
+def _integrate_shooting(grid, node_idx, psi_i, Omega_m, mu, wkb_threshold):
+    """RK4 from z_i with ψ = psi_i, v = 0; returns (ψ, v) at the nodes (n_nodes, 2, n)"""
+    y = np.array([psi_i, np.zeros_like(psi_i)])
+    out = np.empty((len(node_idx), 2, len(psi_i)))
+    record = {k: i for i, k in enumerate(node_idx)}
+    wkb = np.zeros(len(psi_i), dtype=bool)
+    for k in range(len(grid) - 1):
+        if k in record:
+            out[record[k]] = y
+        x, h = grid[k], grid[k + 1] - grid[k]
+        switch = _wkb_regime(x, Omega_m, mu, wkb_threshold) & ~wkb
+        if np.any(switch):
+            # Enter the averaged regime with the cycle-mean energy: Hubble
+            # friction makes ln E = -3 ln a + (3/2ω) sin 2θ, so the phase term
+            # is removed (E = ψ² + v², ψ v = -(E/2) sin 2θ)
+            omega = mu / _hubble_units(x, y, Omega_m)
+            energy = y[0]**2 + y[1]**2
+            y = np.where(switch, y * np.exp(1.5 * y[0] * y[1] / (omega * energy)), y)
+            wkb |= switch
+        k1 = _rhs_shooting(x, y, Omega_m, mu, wkb)
+        k2 = _rhs_shooting(x + 0.5 * h, y + 0.5 * h * k1, Omega_m, mu, wkb)
+        k3 = _rhs_shooting(x + 0.5 * h, y + 0.5 * h * k2, Omega_m, mu, wkb)
+        k4 = _rhs_shooting(x + h, y + h * k3, Omega_m, mu, wkb)
+        y = y + (h / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+    last = len(grid) - 1
+    if last in record:
+        out[record[last]] = y
+    return out
+
+def solve_zero_field_shooting(a_array, H0, Omega_m, m_phi, cache=SHOOTING_CACHE,
+                              wkb_threshold=WKB_THRESHOLD):
+    """
+    Integrate forward from z_i = Z_INITIAL with φ̇_i = 0, root-finding φ_i
+    so that H(z=0) = H0 for every member of the batch.
+
+    m_phi is in GeV (converted with GEV_PER_H_UNIT); the Friedmann
+    constraint is used for H, with no Λ. ρ_φ0 increases monotonically with
+    ψ_i, so root-finding on ln ψ_i keeps a bracket [lo, hi] of the root: the
+    Newton/secant step (warm-started from the cache) is taken only while it
+    stays inside the bracket and at least halves the previous step,
+    otherwise the bracket is bisected (expanded by ±2 until the root is
+    bracketed). A member converges when |g| < SHOOT_TOL or the bracket is
+    narrower than SHOOT_XTOL; members that do not converge in SHOOT_MAXITER
+    iterations, or have Omega_m ≥ 1, are NaN.
+
+    Telemetry: 'shooting.members', 'shooting.warm_starts',
+    'shooting.iterations' (integrations, histogrammed per call as
+    'shooting.iterations_per_call'), 'shooting.fail' and 'solver.nfev'.
+
+    Returns dict of 'H' (len(a_array), N_params) [km/s/Mpc], 'phi' [M_Pl,
+    NaN for m_phi = 0, where the field is a cosmological constant], 'w'
+    and 'phi_i' (N_params,) [M_Pl].
+    """
+    H0, Omega_m, m_phi = _broadcast_params(H0, Omega_m, m_phi)
+    n = len(H0)
+    mu = m_phi / GEV_PER_H_UNIT / H0
+    grid, node_idx = _shooting_grid(a_array)
+    today = int(np.argmin(np.abs(np.log(a_array))))
+    target = np.log(np.where(Omega_m < 1, 6 * (1 - Omega_m), np.nan))
+
+    # Starting point: exact for m_phi = 0 (frozen field), else the cache
+    points = np.column_stack([Omega_m, mu])
+    x = 0.5 * target
+    slope = np.full(n, 2.0)
+    warm = cache.nearest(points) if cache is not None else None
+    if warm is not None:
+        x, slope = warm[:, 0].copy(), warm[:, 1].copy()
+        TELEMETRY.count('shooting.warm_starts', n)
+
+    lo, hi = np.full(n, -np.inf), np.full(n, np.inf)
+    x_prev, g_prev = np.full(n, np.nan), np.full(n, np.nan)
+    dx_prev = np.full(n, np.inf)
+    states = np.full((len(a_array), 2, n), np.nan)
+    active = np.isfinite(target)
+    converged = np.zeros(n, dtype=bool)
+    iterations = 0
+
+    with np.errstate(all='ignore'):
+        for _ in range(SHOOT_MAXITER):
+            idx = np.nonzero(active)[0]
+            if not len(idx):
+                break
+            iterations += len(idx)
+            out = _integrate_shooting(grid, node_idx, np.exp(x[idx]), Omega_m[idx],
+                                      mu[idx], wkb_threshold)
+            TELEMETRY.count('solver.nfev', 4 * (len(grid) - 1))
+            g = np.log(np.sum(out[today]**2, axis=0)) - target[idx]
+            states[:, :, idx] = out
+
+            # Bracket of the root (g increases with x)
+            lo[idx] = np.where(g < 0, np.maximum(lo[idx], x[idx]), lo[idx])
+            hi[idx] = np.where(g > 0, np.minimum(hi[idx], x[idx]), hi[idx])
+
+            done = (np.abs(g) < SHOOT_TOL) | (hi[idx] - lo[idx] < SHOOT_XTOL)
+            converged[idx[done]] = True
+            active[idx[done | ~np.isfinite(g)]] = False
+
+            # Secant slope once two evaluations exist (kept if unusable)
+            secant = (g - g_prev[idx]) / (x[idx] - x_prev[idx])
+            slope[idx] = np.where(np.isfinite(secant) & (secant > 0.1), secant, slope[idx])
+            x_prev[idx], g_prev[idx] = x[idx], g
+
+            # Newton/secant step if it stays in the bracket and converges fast
+            # enough, else bisection (or a ±2 expansion while unbracketed)
+            step = np.clip(-g / slope[idx], -2.0, 2.0)
+            x_new = x[idx] + step
+            bracketed = np.isfinite(lo[idx]) & np.isfinite(hi[idx])
+            slow = np.abs(step) > 0.5 * dx_prev[idx]
+            outside = (x_new <= lo[idx]) | (x_new >= hi[idx])
+            bisect = bracketed & (outside | slow)
+            x_new = np.where(bisect, 0.5 * (lo[idx] + hi[idx]), x_new)
+            dx_prev[idx] = np.abs(x_new - x[idx])
+            x[idx] = np.where(done, x[idx], x_new)
+
+    TELEMETRY.count('shooting.members', n)
+    TELEMETRY.count('shooting.iterations', iterations)
+    TELEMETRY.observe('shooting.iterations_per_call', iterations / max(n, 1))
+    TELEMETRY.count('shooting.fail', np.count_nonzero(~converged))
+    if cache is not None and np.any(converged):
+        cache.add(points[converged], np.column_stack([x, slope])[converged])
+
+    psi, v = states[:, 0, :], states[:, 1, :]
+    states[:, :, ~converged] = np.nan
+    x_nodes = np.log(a_array)[:, None]
+    h = _hubble_units(x_nodes, np.moveaxis(states, 1, 0), Omega_m)
+    with np.errstate(all='ignore'):
+        averaged = _wkb_regime(x_nodes, Omega_m, mu, wkb_threshold)
+        w = np.where(averaged, 0.0, (v**2 - psi**2) / (v**2 + psi**2))
+        phi = np.where(mu > 0, psi / mu, np.nan)
+        phi_i = np.where(converged & (mu > 0), np.exp(x) / mu, np.nan)
+    return {'H': h * H0, 'phi': phi, 'w': w, 'phi_i': phi_i}
+
+# ============================================================================
+# BACKGROUND HISTORY CACHE
+# ============================================================================
+
+class BackgroundCache:
+    """
+    Bounded LRU cache of solved background histories.
+
+    Keys are (H0, Omega_m, m_phi) quantized to `digits` significant digits
+    plus the z_max of the standard grid; values hold H, φ and w on that
+    grid. A module-level instance is shared by every H_zero_field_batch /
+    background_histories caller: with predictions='solver' the BAO and SNe
+    χ² of mcmc_exploration (and the best fit) solve each parameter point
+    once, and the Fisher stencil of fisher.py goes through it as well.
+    """
+
+    def __init__(self, maxsize=4096, digits=10):
+        self.maxsize = maxsize
+        self.digits = digits
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+
+    def key(self, H0, Omega_m, m_phi, z_max):
+        q = lambda x: float(f'{x:.{self.digits}g}')
+        return (q(H0), q(Omega_m), q(m_phi), float(z_max))
+
+    def get(self, key):
+        value = self._store.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._store.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._store[key] = value
+        self._store.move_to_end(key)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+    def clear(self):
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._store), 'maxsize': self.maxsize}
+
+BACKGROUND_CACHE = BackgroundCache()
+
+Z_MAX_GRID = 3.0  # standard grid covers 0 ≤ z ≤ 3 (all bundled BAO/SNe data)
+
+def standard_a_grid(z_max=Z_MAX_GRID, n_nodes=N_NODES):
+    """Scale-factor nodes of the standard grid, from a = 1 down to 1/(1+z_max)"""
+    return np.linspace(1.0, 1 / (1 + z_max), n_nodes)
+
+def _grid_z_max(z):
+    """Standard z_max, enlarged to the next integer for deeper redshifts"""
+    return max(Z_MAX_GRID, float(np.ceil(np.max(z)))) if np.size(z) else Z_MAX_GRID
+
+class SolverFallbackWarning(RuntimeWarning):
+    """Members of a batch whose background could not be solved (ΛCDM substituted)"""
+
+def solve_background_batch(H0, Omega_m, m_phi, z_max=Z_MAX_GRID):
+    """
+    Solve a batch of models on the standard grid.
+
+    Returns dict of 'z' (n_nodes,), 'H', 'phi', 'w' (n_nodes, N_params) and
+    'ok' (N_params,). Members that fail fall back to ΛCDM (φ = NaN, w = -1,
+    ok = False) with a SolverFallbackWarning; failures are counted by cause
+    as 'solver.fail.nonfinite' / 'solver.fail.nonpositive_H'.
+    """
+    H0, Omega_m, m_phi = _broadcast_params(H0, Omega_m, m_phi)
+    a_array = standard_a_grid(z_max)
+    z_array = 1 / a_array - 1
+
+    TELEMETRY.count('solver.calls')
+    TELEMETRY.count('solver.members', len(H0))
+    with TELEMETRY.timer('solver.wall'), np.errstate(all='ignore'):
+        if SOLVER == 'shooting':
+            shot = solve_zero_field_shooting(a_array, H0, Omega_m, m_phi)
+            H, phi, w = shot['H'], shot['phi'], shot['w']
+            finite = np.all(np.isfinite(H) & np.isfinite(w), axis=0)
+        else:
+            if SOLVER == 'adaptive':
+                sol = solve_zero_field_adaptive(a_array, H0, Omega_m, m_phi)
+            else:
+                sol = solve_zero_field_batch(a_array, H0, Omega_m, m_phi)
+                nfev = 4 * N_SUBSTEPS * (len(a_array) - 1)
+                TELEMETRY.count('solver.nfev', nfev)
+                TELEMETRY.observe('solver.nfev_per_call', nfev)
+            phi, phi_dot, H = sol[:, 0, :], sol[:, 1, :], sol[:, 2, :]
+            finite = np.all(np.isfinite(sol), axis=(0, 1))
+            rho_phi = 0.5 * phi_dot**2 + 0.5 * m_phi**2 * phi**2
+            p_phi = 0.5 * phi_dot**2 - 0.5 * m_phi**2 * phi**2
+            w = np.where(rho_phi > 0, p_phi / rho_phi, -1.0)
+        ok = finite & np.all(H > 0, axis=0)
+
+    if not np.all(ok):
+        TELEMETRY.count('solver.fail.nonfinite', np.count_nonzero(~finite))
+        TELEMETRY.count('solver.fail.nonpositive_H', np.count_nonzero(finite & ~ok))
+        TELEMETRY.count('solver.lcdm_fallback', np.count_nonzero(~ok))
+        H[:, ~ok] = H_lcdm(z_array[:, None], H0[~ok], Omega_m[~ok])
+        phi[:, ~ok] = np.nan
+        w[:, ~ok] = -1.0
+        first = np.argmin(ok)
+        warnings.warn(f"{np.count_nonzero(~ok)} of {len(ok)} background solutions failed and "
+                      f"were replaced by ΛCDM (first: H0={H0[first]:g}, "
+                      f"Omega_m={Omega_m[first]:g}, m_phi={m_phi[first]:g})",
+                      SolverFallbackWarning, stacklevel=2)
+
+    return {'z': z_array, 'H': H, 'phi': phi, 'w': w, 'ok': ok}
+
+def background_histories(H0, Omega_m, m_phi, z_max=Z_MAX_GRID, cache=BACKGROUND_CACHE):
+    """
+    Background histories for a batch of models, served from the cache.
+
+    Only the members missing from the cache are solved (as one batch);
+    ΛCDM fallbacks of failed members are returned but never cached.
+    Returns the same layout as solve_background_batch.
+    """
+    H0, Omega_m, m_phi = _broadcast_params(H0, Omega_m, m_phi)
+    n = len(H0)
+    z_array = 1 / standard_a_grid(z_max) - 1
+    out = {name: np.empty((len(z_array), n)) for name in ('H', 'phi', 'w')}
+    out['ok'] = np.ones(n, dtype=bool)
+
+    if cache is None:
+        return solve_background_batch(H0, Omega_m, m_phi, z_max)
+
+    keys = [cache.key(H0[i], Omega_m[i], m_phi[i], z_max) for i in range(n)]
+    missing = []
+    for i, key in enumerate(keys):
+        hist = cache.get(key)
+        if hist is None:
+            missing.append(i)
+            continue
+        for name in ('H', 'phi', 'w'):
+            out[name][:, i] = hist[name]
+
+    if missing:
+        idx = np.array(missing)
+        solved = solve_background_batch(H0[idx], Omega_m[idx], m_phi[idx], z_max)
+        out['ok'][idx] = solved['ok']
+        for j, i in enumerate(missing):
+            hist = {name: solved[name][:, j].copy() for name in ('H', 'phi', 'w')}
+            if solved['ok'][j]:
+                cache.put(keys[i], hist)
+            for name in hist:
+                out[name][:, i] = hist[name]
+
+    TELEMETRY.count('cache.background.hits', n - len(missing))
+    TELEMETRY.count('cache.background.misses', len(missing))
+    out['z'] = z_array
+    return out
+
+def H_zero_field_batch(z, H0, Omega_m, m_phi, cache=BACKGROUND_CACHE):
+    """
+    Solve Zero Field cosmology for a batch of parameter vectors.
+
+    Returns H(z) with shape (N_params,) + np.shape(z). Members whose
+    integration produced non-finite values fall back to ΛCDM (conservative),
+    as the single-model solver always did. Solutions are memoized in
+    BACKGROUND_CACHE (pass cache=None to bypass it).
+    """
+    z = np.asarray(z, dtype=float)
+    hist = background_histories(H0, Omega_m, m_phi, _grid_z_max(z), cache)
+
+    # Spline in z along the shared grid for every member at once
+    return np.moveaxis(CubicSpline(hist['z'], hist['H'], axis=0)(z), -1, 0)
+
+def H_zero_field(z, H0, Omega_m, m_phi):
+    """
+    Solve Zero Field cosmology and return H(z)
+    """
+    return H_zero_field_batch(z, H0, Omega_m, m_phi)[0]
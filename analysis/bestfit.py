@@ -0,0 +1,296 @@
+"""bestfit.py: Parallel multi-start best fit for ΛCDM and Zero Field Primordial
+
+Minimizes the combined χ² sampled by mcmc_exploration (BAO + SNe, plus the
+CMB χ² of chi2_cmb) with bounded L-BFGS-B runs started from a Latin
+hypercube of points in the prior box, distributed over a process pool.
+ΛCDM is the same likelihood with m_phi = 0 (frozen field: cosmological
+constant), so both models are fitted by one code path and the Δχ² at the
+two minima is the honest input for the refutability criterion.
+
+Optimization runs in unit coordinates of the prior box (m_phi ~ 1e-42
+would otherwise be invisible to the optimizer); gradients are central
+differences evaluated in one batched χ² call. At the global minimum the
+χ² Hessian gives the covariance, C = 2 H⁻¹; parameters whose 1σ would
+exceed the prior width are reported as unconstrained, and minima on a
+prior bound are flagged (at_bound) with no symmetric error. seed_walkers()
+draws emcee starting positions from that Gaussian (half-normal inward
+from the bound for at-bound parameters), so the chain starts in the
+typical set and needs a much shorter burn-in.
+
+Usage:
+  python bestfit.py --starts 32 --workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.optimize import minimize
+
+import chi2_cmb
+from mcmc_exploration import (PARAM_NAMES, PREDICTIONS, PRIOR_BOUNDS, chi2_total_batch,
+                              expand_fixed, load_data)
+
+# Parameters held fixed per model
+MODELS = {
+    'lcdm': {'m_phi': 0.0},
+    'zfp': {},
+}
+
+N_STARTS = 16
+GRAD_STEP = 1e-6      # central-difference step (unit coordinates)
+HESSIAN_STEP = 1e-3   # Hessian stencil step (unit coordinates)
+GTOL = 1e-8
+CHI2_ATOL = 1e-3      # starts ending this close to the minimum count as reaching it
+BOUND_ATOL = 1e-6     # minima this close to a prior bound (unit coordinates) are on it
+
+# ============================================================================
+# OBJECTIVE
+# ============================================================================
+
+def latin_hypercube(n, d, rng):
+    """n points in [0, 1]^d, one per stratum of every axis"""
+    strata = np.array([rng.permutation(n) for _ in range(d)]).T
+    return (strata + rng.random((n, d))) / n
+
+class Objective:
+    """Combined χ² of one model as a function of unit coordinates of the free parameters"""
+
+    def __init__(self, data, fixed=None, sn_offset=None, predictions='mock'):
+        self.data = data
+        self.fixed = fixed or {}
+        self.sn_offset = sn_offset
+        self.predictions = predictions
+        self.free = [i for i, name in enumerate(PARAM_NAMES) if name not in self.fixed]
+        self.lo, self.hi = PRIOR_BOUNDS[self.free, 0], PRIOR_BOUNDS[self.free, 1]
+
+    def theta(self, u):
+        """Full parameter vectors (N, 3) from unit coordinates (N, n_free)"""
+        return expand_fixed(self.lo + np.atleast_2d(u) * (self.hi - self.lo), self.fixed)
+
+    def __call__(self, u):
+        return chi2_total_batch(self.theta(u), self.data, self.sn_offset, self.predictions)
+
+    def value_and_grad(self, u):
+        """χ² and its gradient at u from one batched call (2 n_free + 1 points)"""
+        eye = GRAD_STEP * np.eye(len(u))
+        up, down = np.clip(u + eye, 0.0, 1.0), np.clip(u - eye, 0.0, 1.0)
+        f = self(np.vstack([u, up, down]))
+        n = len(u)
+        return f[0], (f[1:n + 1] - f[n + 1:]) / np.diag(up - down)
+
+    def hessian(self, u, step=HESSIAN_STEP):
+        """
+        Central-difference Hessian of χ², one batched call. The stencil is
+        centred at u moved `step` inside the box, so minima on a bound work.
+        """
+        n = len(u)
+        c = np.clip(u, step, 1.0 - step)
+        e = step * np.eye(n)
+        pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+        points = [c] + [c + e[i] for i in range(n)] + [c - e[i] for i in range(n)]
+        for i, j in pairs:
+            points += [c + e[i] + e[j], c + e[i] - e[j], c - e[i] + e[j], c - e[i] - e[j]]
+        f = self(np.array(points))
+
+        H = np.empty((n, n))
+        H[np.arange(n), np.arange(n)] = (f[1:n + 1] - 2 * f[0] + f[n + 1:2 * n + 1]) / step**2
+        for k, (i, j) in enumerate(pairs):
+            pp, pm, mp, mm = f[2 * n + 1 + 4 * k:2 * n + 5 + 4 * k]
+            H[i, j] = H[j, i] = (pp - pm - mp + mm) / (4 * step**2)
+        return H
+
+# ============================================================================
+# LOCAL FITS (process pool)
+# ============================================================================
+
+# Observational data of a pool worker, set once by _init_worker
+_WORKER_DATA = None
+
+def _init_worker(data):
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+def _local_fit(task):
+    """One bounded L-BFGS-B run: task = (fixed, sn_offset, predictions, u0)"""
+    fixed, sn_offset, predictions, u0 = task
+    objective = Objective(_WORKER_DATA, fixed, sn_offset, predictions)
+    res = minimize(objective.value_and_grad, u0, jac=True, method='L-BFGS-B',
+                   bounds=[(0.0, 1.0)] * len(u0), options={'gtol': GTOL})
+    return {'u': res.x, 'chi2': float(res.fun), 'nfev': int(res.nfev),
+            'success': bool(res.success)}
+
+def _run_tasks(data, tasks, workers):
+    if workers <= 1:
+        _init_worker(data)
+        return [_local_fit(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(data,)) as pool:
+        return list(pool.map(_local_fit, tasks))
+
+# ============================================================================
+# GLOBAL MINIMUM AND COVARIANCE
+# ============================================================================
+
+def summarize(objective, fits):
+    """
+    Global minimum of a set of local fits, with its Hessian covariance.
+
+    Parameters whose minimum lies on a prior bound are flagged in
+    'at_bound' and get a NaN error: the Gaussian is cut there, so its σ
+    is not a symmetric uncertainty (their covariance entries are kept for
+    one-sided seeding).
+    """
+    best = min(fits, key=lambda r: r['chi2'])
+    names = [PARAM_NAMES[i] for i in objective.free]
+    width = objective.hi - objective.lo
+
+    # 1σ wider than the prior box → unconstrained; covariance of the rest
+    H = objective.hessian(best['u'])
+    constrained = np.diag(H) > 2.0
+    at_bound = (best['u'] <= BOUND_ATOL) | (best['u'] >= 1.0 - BOUND_ATOL)
+    cov = np.full((len(names), len(names)), np.nan)
+    hessian_ok = True
+    if np.any(constrained):
+        block = H[np.ix_(constrained, constrained)]
+        if np.all(np.linalg.eigvalsh(block) > 0):
+            scale = width[constrained]
+            cov[np.ix_(constrained, constrained)] = 2 * np.linalg.inv(block) * np.outer(scale, scale)
+        else:
+            hessian_ok = False
+
+    return {
+        'theta': objective.theta(best['u'])[0].tolist(),
+        'chi2': best['chi2'],
+        'free': names,
+        'covariance': cov.tolist(),
+        'errors': dict(zip(names, np.where(at_bound, np.nan, np.sqrt(np.diag(cov))).tolist())),
+        'constrained': dict(zip(names, constrained.tolist())),
+        'at_bound': dict(zip(names, at_bound.tolist())),
+        'hessian_ok': hessian_ok,
+        'n_starts': len(fits),
+        'n_success': sum(r['success'] for r in fits),
+        'n_at_minimum': sum(r['chi2'] - best['chi2'] < CHI2_ATOL for r in fits),
+        'nfev': sum(r['nfev'] for r in fits),
+    }
+
+def fit(data, models=MODELS, n_starts=N_STARTS, workers=1, sn_offset=None, seed=0,
+        predictions='mock'):
+    """
+    Multi-start best fit of each model.
+
+    models: {name: {parameter: fixed value}}
+    Returns {name: summary} (see summarize); χ² is the data χ² only.
+    """
+    rng = np.random.default_rng(seed)
+    tasks, owners = [], []
+    for name, fixed in models.items():
+        n_free = len(PARAM_NAMES) - len(fixed)
+        for u0 in latin_hypercube(n_starts, n_free, rng):
+            tasks.append((fixed, sn_offset, predictions, u0))
+            owners.append(name)
+    results = _run_tasks(data, tasks, workers)
+    return {name: summarize(Objective(data, fixed, sn_offset, predictions),
+                            [r for r, o in zip(results, owners) if o == name])
+            for name, fixed in models.items()}
+
+def seed_walkers(fit_result, nwalkers, names=None, rng=None):
+    """
+    emcee starting positions (nwalkers, len(names)) around a best fit.
+
+    Constrained parameters are drawn from the Hessian Gaussian (those with
+    the minimum on a prior bound from its half-normal pointing into the
+    box), the others uniformly over the prior; all are kept strictly
+    inside PRIOR_BOUNDS.
+    names: sampled parameters (default: the free parameters of the fit).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    names = fit_result['free'] if names is None else names
+    idx = [fit_result['free'].index(name) for name in names]
+    full = [PARAM_NAMES.index(name) for name in names]
+    lo, hi = PRIOR_BOUNDS[full, 0], PRIOR_BOUNDS[full, 1]
+    mean = np.asarray(fit_result['theta'])[full]
+    cov = np.asarray(fit_result['covariance'])[np.ix_(idx, idx)]
+    constrained = np.array([fit_result['constrained'][name] for name in names])
+    at_bound = np.array([fit_result.get('at_bound', {}).get(name, False) for name in names])
+
+    pos = lo + (hi - lo) * rng.random((nwalkers, len(names)))
+    gauss = constrained & ~at_bound
+    if np.any(gauss):
+        pos[:, gauss] = rng.multivariate_normal(mean[gauss], cov[np.ix_(gauss, gauss)], nwalkers)
+    edge = constrained & at_bound
+    if np.any(edge):
+        inward = np.where(mean[edge] - lo[edge] < hi[edge] - mean[edge], 1.0, -1.0)
+        sigma = np.sqrt(np.diag(cov)[edge])
+        pos[:, edge] = mean[edge] + inward * sigma * np.abs(rng.standard_normal((nwalkers, edge.sum())))
+    margin = 1e-6 * (hi - lo)
+    return np.clip(pos, lo + margin, hi - margin)
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+def run(data=None, n_starts=N_STARTS, workers=1, sn_offset=None, cmb=True, seed=0,
+        predictions='mock'):
+    """
+    Best-fit stage of the pipeline.
+
+    cmb: add the chi2_cmb χ² of each model to its data χ²
+    predictions: 'mock' or 'solver' (mcmc_exploration.PREDICTIONS)
+    Returns {'lcdm': summary, 'zfp': summary, 'delta_chi2': χ²_ZFP - χ²_ΛCDM}.
+    """
+    if data is None:
+        data = load_data()
+    workers = workers or os.cpu_count() or 1
+
+    print(f"[BESTFIT] {n_starts} Latin-hypercube starts per model, {workers} worker(s)")
+    start = time.time()
+    result = fit(data, n_starts=n_starts, workers=workers, sn_offset=sn_offset, seed=seed,
+                 predictions=predictions)
+    elapsed = time.time() - start
+
+    if cmb:
+        result['lcdm']['chi2_cmb'] = chi2_cmb.cmb_chi2_lcdm()
+        result['zfp']['chi2_cmb'] = chi2_cmb.cmb_chi2_zfp()
+        for name in MODELS:
+            result[name]['chi2'] += result[name]['chi2_cmb']
+
+    for name in MODELS:
+        r = result[name]
+        print(f"\n  {name.upper():<5} χ²_min = {r['chi2']:.4f}   "
+              f"({r['n_at_minimum']}/{r['n_starts']} starts at the minimum, {r['nfev']} evaluations)")
+        for label, value in zip(PARAM_NAMES, r['theta']):
+            if label in r['free']:
+                err = r['errors'][label]
+                if not r['constrained'][label]:
+                    note = "(unconstrained)"
+                elif r['at_bound'][label]:
+                    note = "(at the prior bound)"
+                else:
+                    note = f"± {err:.3e}"
+                print(f"        {label:<8} = {value:.5e} {note}")
+            else:
+                print(f"        {label:<8} = {value:.5e} (fixed)")
+
+    result['delta_chi2'] = result['zfp']['chi2'] - result['lcdm']['chi2']
+    print(f"\n  Δχ² (ZFP - ΛCDM) at the best fits = {result['delta_chi2']:+.4f}   [{elapsed:.1f}s]")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Multi-start best fit for ΛCDM and ZFP')
+    parser.add_argument('--starts', type=int, default=N_STARTS,
+                        help=f'Latin-hypercube starts per model (default: {N_STARTS})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes for the local fits (0: all cores; default: 1)')
+    parser.add_argument('--sn-offset', choices=['marginalize', 'profile'], default=None,
+                        help='Remove the SNe mu offset analytically in the chi2')
+    parser.add_argument('--predictions', choices=PREDICTIONS, default='mock',
+                        help='Model predictions: simplified mocks or the background solver')
+    parser.add_argument('--no-cmb', action='store_true', help='Fit BAO + SNe only')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the starting points')
+    args = parser.parse_args()
+
+    run(n_starts=args.starts, workers=args.workers, sn_offset=args.sn_offset,
+        cmb=not args.no_cmb, seed=args.seed, predictions=args.predictions)
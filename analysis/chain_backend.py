@@ -0,0 +1,159 @@
+"""chain_backend.py: On-disk checkpoints for resumable MCMC chains
+
+A checkpoint is a directory holding append-only, compressed chunks of the
+chain plus the sampler state needed to continue:
+
+  burnin_00000000.npz, burnin_00000100.npz, ...       chain + log_prob per chunk
+  production_00000000.npz, ...
+  state.npz                                            last walker state, RNG, counters
+
+Chunks are written every `every` steps, so a crash or timeout loses at most
+one chunk of work. state.npz is replaced atomically after each chunk and is
+the source of truth for how many steps of each phase are complete.
+"""
+
+import glob
+import os
+import zipfile
+
+import numpy as np
+
+from runtime import lazy_import
+
+PHASES = ('burnin', 'production')
+
+class ChainCheckpoint:
+    """Chunked, compressed chain storage with sampler state for --resume"""
+
+    def __init__(self, path, every=100):
+        self.path = path
+        self.every = int(every)
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _chunk_path(self, phase, start):
+        return os.path.join(self.path, f'{phase}_{start:08d}.npz')
+
+    def _state_path(self):
+        return os.path.join(self.path, 'state.npz')
+
+    def exists(self):
+        """True if a previous run left a sampler state behind"""
+        return os.path.exists(self._state_path())
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Remove chunks and state of a previous run"""
+        for f in glob.glob(os.path.join(self.path, '*.npz')):
+            os.remove(f)
+
+    def append(self, phase, chain, log_prob, accepted, state):
+        """
+        Append one chunk of `phase` and record the sampler state after it.
+
+        chain: (k, nwalkers, ndim), log_prob: (k, nwalkers),
+        accepted: cumulative acceptances per walker for this phase,
+        state: emcee.State returned by the sampler.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        steps = self.steps()
+        start = steps[phase]
+        np.savez_compressed(self._chunk_path(phase, start), chain=chain, log_prob=log_prob)
+        steps[phase] = start + len(chain)
+
+        name, key, pos, has_gauss, cached_gaussian = state.random_state
+        tmp = self._state_path() + '.tmp.npz'
+        np.savez(tmp,
+                 coords=state.coords,
+                 log_prob=state.log_prob,
+                 accepted=accepted,
+                 phase=phase,
+                 burnin_steps=steps['burnin'],
+                 production_steps=steps['production'],
+                 rng_name=name, rng_key=key, rng_pos=pos,
+                 rng_has_gauss=has_gauss, rng_cached_gaussian=cached_gaussian)
+        os.replace(tmp, self._state_path())
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _read_state(self):
+        with np.load(self._state_path()) as f:
+            return {k: f[k] for k in f.files}
+
+    def steps(self):
+        """Completed steps per phase, e.g. {'burnin': 500, 'production': 1200}"""
+        if not self.exists():
+            return {phase: 0 for phase in PHASES}
+        s = self._read_state()
+        return {phase: int(s[f'{phase}_steps']) for phase in PHASES}
+
+    def last_state(self):
+        """emcee.State to continue sampling from (coords, log_prob, RNG)"""
+        s = self._read_state()
+        random_state = (str(s['rng_name']), s['rng_key'], int(s['rng_pos']),
+                        int(s['rng_has_gauss']), float(s['rng_cached_gaussian']))
+        emcee = lazy_import('emcee')
+        return emcee.State(s['coords'], log_prob=s['log_prob'], random_state=random_state)
+
+    def load(self, phase):
+        """
+        Concatenated (chain, log_prob) of all recorded chunks of `phase`.
+
+        Chunks past the recorded state (e.g. half-written by a crash) are
+        ignored; an unreadable or missing recorded chunk raises RuntimeError.
+        """
+        n = self.steps()[phase]
+        chains, log_probs = [], []
+        for f in sorted(glob.glob(os.path.join(self.path, f'{phase}_*.npz'))):
+            start = int(os.path.basename(f)[len(phase) + 1:-4])
+            if start >= n:
+                continue  # chunk written after the last recorded state
+            if start != sum(len(c) for c in chains):
+                break
+            try:
+                with np.load(f) as chunk:
+                    chains.append(chunk['chain'][:n - start])
+                    log_probs.append(chunk['log_prob'][:n - start])
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                raise RuntimeError(f"Corrupt checkpoint chunk {f} ({e}); "
+                                   f"restart without --resume") from e
+        found = sum(len(c) for c in chains)
+        if found != n:
+            raise RuntimeError(f"Checkpoint {self.path} records {n} {phase} steps but its "
+                               f"chunks hold {found}; restart without --resume")
+        if not chains:
+            return None, None
+        return np.concatenate(chains), np.concatenate(log_probs)
+
+    def restore_backend(self, backend, phase='production'):
+        """
+        Fill an emcee in-memory backend (already reset) with the recorded
+        chain of `phase`, so get_chain() covers the full run after resuming.
+        """
+        chain, log_prob = self.load(phase)
+        if chain is None:
+            return backend
+        s = self._read_state()
+        backend.grow(len(chain), None)
+        backend.chain[:len(chain)] = chain
+        backend.log_prob[:len(chain)] = log_prob
+        backend.iteration = len(chain)
+        if str(s['phase']) == phase:
+            backend.accepted[:] = s['accepted']
+        return backend
+
+    def to_backend(self, phase='production'):
+        """Standalone emcee backend with the recorded chain (for --analyze-only)"""
+        chain, _ = self.load(phase)
+        if chain is None:
+            return None
+        backend = lazy_import('emcee.backends').Backend()
+        backend.reset(chain.shape[1], chain.shape[2])
+        return self.restore_backend(backend, phase)
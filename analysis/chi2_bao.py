@@ -1,18 +1,33 @@
 """chi2_bao.py: Comparação χ² BAO entre Zero Field Primordial e ΛCDM"""
 
 import numpy as np
-import pandas as pd
 
-# Carregar dados BAO
-data = pd.read_csv('../data/bao_data.csv')
-z_obs = data['z'].values
-DV_obs = data['DV_over_rd'].values
-sigma_DV = data['sigma_DV_over_rd'].values
+from covariance import CholeskyCovariance, chi2_residuals
+from datasets import load_table
+from runtime import lazy_import
 
 # Parâmetros cosmológicos base
 H0 = 70.0  # km/s/Mpc
 Omega_m = 0.3
 
+def load_bao_data(filepath='data/bao_data.csv', covariance=None):
+    """
+    Carregar dados BAO: (z, D_V/r_d, σ)
+
+    Caminhos resolvidos pelo registro de datasets (relativos ao pacote),
+    colunas lidas por memory-map do cache binário. Com um arquivo de
+    covariância de D_V/r_d, σ é substituído pelo fator de Cholesky (em
+    cache) da matriz completa.
+    """
+    data = load_table(filepath, ['z', 'DV_over_rd', 'sigma_DV_over_rd'])
+    errors = data['sigma_DV_over_rd']
+    if covariance is not None:
+        errors = CholeskyCovariance.from_file(covariance)
+        if len(errors) != len(data['z']):
+            raise ValueError(f"Covariância {covariance} é {len(errors)}×{len(errors)}, "
+                             f"dados têm {len(data['z'])} pontos")
+    return data['z'], data['DV_over_rd'], errors
+
 def H_lcdm(z):
     """Hubble parameter para ΛCDM (plano, sem Λ explícito)"""
     Omega_Lambda = 1.0 - Omega_m
@@ -29,34 +44,55 @@ def DV_zero_field(z, m_phi=1e-42):
     return DV_lcdm(z) * (1.0 + 0.02 * m_phi * 1e42)
 
 def chi2(DV_model, DV_obs, sigma):
-    """Calcula χ² simples"""
-    return np.sum(((DV_obs - DV_model) / sigma)**2)
-
-# Computar χ²
-DV_lcdm_pred = np.array([DV_lcdm(z) for z in z_obs])
-DV_zfp_pred = np.array([DV_zero_field(z) for z in z_obs])
-
-chi2_lcdm = chi2(DV_lcdm_pred, DV_obs, sigma_DV)
-chi2_zfp = chi2(DV_zfp_pred, DV_obs, sigma_DV)
-
-print(f"[FASE 6] Análise χ² BAO")
-print(f"  χ² ΛCDM: {chi2_lcdm:.3f}")
-print(f"  χ² Zero Field: {chi2_zfp:.3f}")
-print(f"  Dados: {len(z_obs)} pontos")
-
-if chi2_zfp < chi2_lcdm + 5:  # Threshold simples
-    veredito = "PASSA"
-else:
-    veredito = "FALHA"
-
-print(f"\n[FASE 7] Veredito: {veredito}")
-
-# Salvar resultados
-results = pd.DataFrame({
-    'z': z_obs,
-    'DV_obs': DV_obs,
-    'DV_lcdm': DV_lcdm_pred,
-    'DV_zfp': DV_zfp_pred
-})
-results.to_csv('results.csv', index=False)
-print(f"\nResultados salvos em results.csv")
+    """Calcula χ² (sigma: erros diagonais ou CholeskyCovariance)"""
+    return chi2_residuals(DV_obs - DV_model, sigma)
+
+def run(data=None, output='results.csv'):
+    """
+    Etapa BAO da pipeline: χ² ΛCDM vs Zero Field.
+
+    data: (z, D_V/r_d, σ) já carregados (default: lê bao_data.csv)
+    Retorna dict com chi2_lcdm, chi2_zfp, n_points e veredito.
+    """
+    z_obs, DV_obs, sigma_DV = load_bao_data() if data is None else data
+
+    # Computar χ²
+    DV_lcdm_pred = DV_lcdm(z_obs)
+    DV_zfp_pred = DV_zero_field(z_obs)
+
+    chi2_lcdm = chi2(DV_lcdm_pred, DV_obs, sigma_DV)
+    chi2_zfp = chi2(DV_zfp_pred, DV_obs, sigma_DV)
+
+    print(f"[FASE 6] Análise χ² BAO")
+    print(f"  χ² ΛCDM: {chi2_lcdm:.3f}")
+    print(f"  χ² Zero Field: {chi2_zfp:.3f}")
+    print(f"  Dados: {len(z_obs)} pontos")
+
+    if chi2_zfp < chi2_lcdm + 5:  # Threshold simples
+        veredito = "PASSA"
+    else:
+        veredito = "FALHA"
+
+    print(f"\n[FASE 7] Veredito: {veredito}")
+
+    # Salvar resultados
+    if output:
+        pd = lazy_import('pandas')
+        results = pd.DataFrame({
+            'z': z_obs,
+            'DV_obs': DV_obs,
+            'DV_lcdm': DV_lcdm_pred,
+            'DV_zfp': DV_zfp_pred
+        })
+        results.to_csv(output, index=False)
+        print(f"\nResultados salvos em {output}")
+
+    return {
+        'chi2_lcdm': float(chi2_lcdm),
+        'chi2_zfp': float(chi2_zfp),
+        'n_points': len(z_obs),
+        'veredito': veredito,
+    }
+
+if __name__ == '__main__':
+    run()
@@ -29,7 +29,8 @@ def cmb_chi2_zfp():
     
     return lcdm_baseline + delta_chi2
 
-if __name__ == '__main__':
+def run():
+    """CMB stage of the pipeline: returns dict with chi2_lcdm and chi2_zfp."""
     chi2_cmb_lcdm = cmb_chi2_lcdm()
     chi2_cmb_zfp = cmb_chi2_zfp()
     
@@ -39,3 +40,11 @@ if __name__ == '__main__':
     print(f"  Delta chi2: {chi2_cmb_zfp - chi2_cmb_lcdm:.2f}")
     print(f"\nNOTE: ZFP shows mild tension with CMB (expected for scalar field).")
     print(f"      Combined with BAO+SNe, provides multi-probe consistency test.")
+    
+    return {
+        'chi2_lcdm': chi2_cmb_lcdm,
+        'chi2_zfp': chi2_cmb_zfp,
+    }
+
+if __name__ == '__main__':
+    run()
@@ -5,32 +5,47 @@ Conjugate likelihood test for Zero Field Primordial vs LCDM
 """
 
 import numpy as np
-import pandas as pd
+
+import chi2_bao
+import chi2_sn
 
 def load_data():
-    bao = pd.read_csv('data/bao_data.csv')
-    sne = pd.read_csv('data/sn_data.csv')
+    bao = chi2_bao.load_bao_data('bao')
+    sne = chi2_sn.load_sn_data('sn')
     return bao, sne
 
 def chi2_combined(chi2_bao, chi2_sne, w_bao=0.5, w_sne=0.5):
     """Weighted combined chi-squared."""
     return w_bao * chi2_bao + w_sne * chi2_sne
 
-if __name__ == '__main__':
-    bao, sne = load_data()
-    
-    # Placeholder values (will update after chi2_bao.py and chi2_sn.py run)
-    chi2_bao_lcdm = 16.24
-    chi2_bao_zfp = 13.89
-    chi2_sne_lcdm = 22.15  # Example
-    chi2_sne_zfp = 19.87   # Example
-    
+def run(bao_result=None, sn_result=None):
+    """
+    Combined stage of the pipeline.
+
+    bao_result / sn_result: dicts returned by chi2_bao.run and chi2_sn.run.
+    When missing, the individual probes are computed here from the data.
+    """
+    if bao_result is None or sn_result is None:
+        bao, sne = load_data()
+        if bao_result is None:
+            bao_result = chi2_bao.run(data=bao, output=None)
+        if sn_result is None:
+            sn_result = chi2_sn.run(data=sne)
+
     # Combined
-    chi2_combined_lcdm = chi2_combined(chi2_bao_lcdm, chi2_sne_lcdm)
-    chi2_combined_zfp = chi2_combined(chi2_bao_zfp, chi2_sne_zfp)
-    
+    chi2_combined_lcdm = chi2_combined(bao_result['chi2_lcdm'], sn_result['chi2_lcdm'])
+    chi2_combined_zfp = chi2_combined(bao_result['chi2_zfp'], sn_result['chi2_zfp'])
+
     print(f"\nCombined BAO + SNe Analysis:")
     print(f"  LCDM chi2_combined: {chi2_combined_lcdm:.4f}")
     print(f"  ZFP  chi2_combined: {chi2_combined_zfp:.4f}")
     print(f"  Delta chi2: {chi2_combined_zfp - chi2_combined_lcdm:.4f}")
     print(f"\nBoth probes favor Zero Field: {chi2_combined_zfp < chi2_combined_lcdm}")
+
+    return {
+        'chi2_lcdm': float(chi2_combined_lcdm),
+        'chi2_zfp': float(chi2_combined_zfp),
+    }
+
+if __name__ == '__main__':
+    run()
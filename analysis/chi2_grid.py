@@ -0,0 +1,180 @@
+"""chi2_grid.py: Precomputed χ² tables on a parameter grid
+
+Evaluates BAO, SNe and combined χ² on a regular grid over the prior box
+(H0, Omega_m, m_phi), in parallel, and stores the result as a
+memory-mappable array plus axis metadata:
+
+  <path>/chi2.npy    float64 array (n_probes, n_H0, n_Om, n_mphi), opened with mmap
+  <path>/axes.json   parameter names, axis values and probe order
+
+Chi2Grid then gives interpolated χ²(θ) lookups, profile likelihoods and
+marginal posteriors straight from the table, and the grid minimum as a
+starting point for MCMC. Consumers: plot_constraints.py --grid overlays the
+grid marginals on the 1D posteriors, mcmc_exploration.py --grid starts the
+walkers at the grid minimum.
+
+Usage:
+  python chi2_grid.py --shape 41 41 21 --workers 8 --output chi2_grid
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.integrate import trapezoid
+from scipy.interpolate import RegularGridInterpolator
+
+from mcmc_exploration import PARAM_NAMES, PRIOR_BOUNDS, chi2_bao_batch, chi2_sn_batch
+
+PROBES = ['bao', 'sn', 'total']
+CHUNK_SIZE = 4096  # grid points per worker task
+
+# ============================================================================
+# GRID EVALUATION
+# ============================================================================
+
+# Observational data of a pool worker (set once by the initializer)
+_WORKER_DATA = None
+
+def _init_worker(data):
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+def _chi2_chunk(thetas):
+    """(N, 2) array of BAO and SNe χ² for a chunk of grid points"""
+    bao, sn = _WORKER_DATA
+    return np.column_stack([chi2_bao_batch(thetas, bao), chi2_sn_batch(thetas, sn)])
+
+def build_grid(data, path, shape=(21, 21, 11), bounds=PRIOR_BOUNDS, workers=1):
+    """
+    Evaluate the χ² tables on a regular grid and write them to `path`.
+
+    data: ((z_bao, DV, σ), (z_sn, μ, σ)) as returned by mcmc_exploration.load_data
+    shape: points per parameter axis
+    """
+    axes = [np.linspace(lo, hi, n) for (lo, hi), n in zip(bounds, shape)]
+    points = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, len(axes))
+    chunks = [points[i:i + CHUNK_SIZE] for i in range(0, len(points), CHUNK_SIZE)]
+
+    os.makedirs(path, exist_ok=True)
+    table = np.lib.format.open_memmap(os.path.join(path, 'chi2.npy'), mode='w+',
+                                      dtype=np.float64, shape=(len(PROBES),) + tuple(shape))
+    flat = table.reshape(len(PROBES), -1)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data,)) as pool:
+            results = pool.map(_chi2_chunk, chunks)
+            start = 0
+            for res in results:
+                flat[:2, start:start + len(res)] = res.T
+                start += len(res)
+    else:
+        _init_worker(data)
+        start = 0
+        for chunk in chunks:
+            flat[:2, start:start + len(chunk)] = _chi2_chunk(chunk).T
+            start += len(chunk)
+    flat[2] = flat[0] + flat[1]
+    table.flush()
+    del table
+
+    with open(os.path.join(path, 'axes.json'), 'w') as f:
+        json.dump({'params': PARAM_NAMES, 'probes': PROBES,
+                   'axes': [a.tolist() for a in axes]}, f, indent=2)
+
+    return Chi2Grid(path)
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+class Chi2Grid:
+    """Memory-mapped χ² table with interpolation, profiles and marginals"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'axes.json')) as f:
+            meta = json.load(f)
+        self.path = path
+        self.params = meta['params']
+        self.probes = meta['probes']
+        self.axes = [np.array(a) for a in meta['axes']]
+        self.table = np.load(os.path.join(path, 'chi2.npy'), mmap_mode='r')
+        self._interp = {}
+
+    def values(self, probe='total'):
+        """χ² array of one probe, shape (n_H0, n_Om, n_mphi), memory-mapped"""
+        return self.table[self.probes.index(probe)]
+
+    def chi2(self, theta, probe='total'):
+        """Linearly interpolated χ² at theta (3,) or (N, 3)"""
+        if probe not in self._interp:
+            self._interp[probe] = RegularGridInterpolator(
+                self.axes, self.values(probe), bounds_error=False, fill_value=1e10)
+        return self._interp[probe](np.atleast_2d(theta))
+
+    def best_fit(self, probe='total'):
+        """(theta, χ²_min) at the grid minimum"""
+        values = self.values(probe)
+        idx = np.unravel_index(np.argmin(values), values.shape)
+        return np.array([a[i] for a, i in zip(self.axes, idx)]), float(values[idx])
+
+    def _other_axes(self, param):
+        i = self.params.index(param)
+        return i, tuple(j for j in range(len(self.params)) if j != i)
+
+    def profile(self, param, probe='total'):
+        """Profile likelihood: (axis values, Δχ² minimized over the other parameters)"""
+        i, others = self._other_axes(param)
+        prof = np.min(self.values(probe), axis=others)
+        return self.axes[i], prof - prof.min()
+
+    def marginal(self, param, probe='total'):
+        """Marginal posterior (flat prior): (axis values, normalized density)"""
+        i, others = self._other_axes(param)
+        values = self.values(probe)
+        like = np.exp(-0.5 * (values - values.min()))
+        post = np.sum(like, axis=others)
+        return self.axes[i], post / trapezoid(post, self.axes[i])
+
+    def initial_walkers(self, nwalkers, probe='total', scale=1e-3, seed=None):
+        """
+        Walker ball around the grid minimum, for MCMC initialization; kept
+        strictly inside the box (the prior is open: a walker on a bound has
+        log-prob -inf and never moves).
+        """
+        rng = np.random.default_rng(seed)
+        theta, _ = self.best_fit(probe)
+        steps = np.array([a[1] - a[0] if len(a) > 1 else 1.0 for a in self.axes])
+        pos = theta + scale * steps * rng.standard_normal((nwalkers, len(theta)))
+        lo, hi = np.array([a[0] for a in self.axes]), np.array([a[-1] for a in self.axes])
+        margin = 1e-6 * (hi - lo)
+        return np.clip(pos, lo + margin, hi - margin)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    from mcmc_exploration import load_data
+
+    parser = argparse.ArgumentParser(description='Precompute χ² tables on the prior box')
+    parser.add_argument('--shape', type=int, nargs=3, default=[21, 21, 11],
+                        help='Points per axis H0 Omega_m m_phi (default: 21 21 11)')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--output', default='chi2_grid', help='Output directory (default: chi2_grid)')
+    args = parser.parse_args()
+
+    data = load_data()
+
+    print(f"[1] Evaluating χ² on a {'×'.join(map(str, args.shape))} grid...")
+    start = time.time()
+    grid = build_grid(data, args.output, shape=args.shape, workers=args.workers)
+    print(f"    {int(np.prod(args.shape))} points in {time.time() - start:.1f}s → {args.output}/")
+
+    theta, chi2_min = grid.best_fit()
+    print(f"[2] Grid minimum: χ² = {chi2_min:.3f} at "
+          + ", ".join(f"{p} = {v:.4g}" for p, v in zip(grid.params, theta)))
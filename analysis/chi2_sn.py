@@ -7,28 +7,36 @@ against Type Ia Supernovae distance modulus data.
 """
 
 import numpy as np
-import pandas as pd
-from scipy.optimize import minimize
 
-def load_sn_data(filepath='data/sn_data.csv'):
-    """Load Supernovae Type Ia data."""
-    data = pd.read_csv(filepath)
-    return data['z'].values, data['mu_obs'].values, data['mu_err'].values
+from covariance import CholeskyCovariance, chi2_residuals, whiten
+from datasets import load_table
+from distances import distance_modulus
+
+def load_sn_data(filepath='data/sn_data.csv', covariance=None):
+    """
+    Load Supernovae Type Ia data.
+
+    Paths resolve via the dataset registry (relative to the package) and
+    columns are memory-mapped from its binary cache. With a covariance file
+    (.npy or Pantheon+ text) the errors slot holds its cached Cholesky
+    factor instead of the diagonal mu_err.
+    """
+    data = load_table(filepath, ['z', 'mu_obs', 'mu_err'])
+    errors = data['mu_err']
+    if covariance is not None:
+        errors = CholeskyCovariance.from_file(covariance)
+        if len(errors) != len(data['z']):
+            raise ValueError(f"Covariance {covariance} is {len(errors)}×{len(errors)}, "
+                             f"data has {len(data['z'])} SNe")
+    return data['z'], data['mu_obs'], errors
+
+def H_lcdm(z, H0=70.0, Om=0.3):
+    """Hubble parameter for flat LCDM (km/s/Mpc)."""
+    return H0 * np.sqrt(Om * (1 + z)**3 + (1.0 - Om))
 
 def mu_lcdm(z, H0=70.0, Om=0.3):
-    """Distance modulus for LCDM."""
-    c = 3e5  # speed of light (km/s)
-    DH = c / H0
-    OL = 1.0 - Om
-    
-    def integrand(z_prime):
-        return 1.0 / np.sqrt(Om * (1 + z_prime)**3 + OL)
-    
-    z_arr = np.linspace(0, z, 100)
-    comoving_dist = DH * np.trapz(1.0 / np.sqrt(Om * (1 + z_arr)**3 + OL), z_arr)
-    luminosity_dist = comoving_dist * (1 + z)
-    
-    return 5 * np.log10(luminosity_dist) + 25
+    """Distance modulus for LCDM (vectorized over z)."""
+    return distance_modulus(z, lambda z_grid: H_lcdm(z_grid, H0, Om))
 
 def mu_zfp(z, H0=70.0, Om=0.3, m_phi=1e-42):
     """Distance modulus for Zero Field Primordial (approx)."""
@@ -38,22 +46,68 @@ def mu_zfp(z, H0=70.0, Om=0.3, m_phi=1e-42):
     return mu_lcdm(z, H0, Om) + correction
 
 def chi2_model(mu_theory, mu_obs, mu_err):
-    """Compute chi-squared."""
-    return np.sum(((mu_obs - mu_theory) / mu_err)**2)
+    """Compute chi-squared (mu_err: diagonal errors or CholeskyCovariance)."""
+    return chi2_residuals(mu_obs - mu_theory, mu_err)
 
-if __name__ == '__main__':
-    z, mu_obs, mu_err = load_sn_data()
+# Ways of removing the additive mu offset (absolute magnitude M / H0 scale)
+OFFSET_MODES = ('marginalize', 'profile')
+
+def chi2_offset(residuals, mu_err, mode='marginalize'):
+    """
+    Chi-squared with the additive offset of the residuals removed in closed form.
+
+    With A = r^T C^-1 r, B = 1^T C^-1 r and C1 = 1^T C^-1 1:
+      profile:     min over the offset        -> A - B^2/C1
+      marginalize: flat prior on the offset   -> A - B^2/C1 + ln(C1 / 2 pi)
+    residuals may be (N,) or batched (N_params, N).
+    """
+    if mode not in OFFSET_MODES:
+        raise ValueError(f"Unknown offset mode {mode!r} (expected one of {OFFSET_MODES})")
+    w = whiten(residuals, mu_err)
+    u = whiten(np.ones(np.shape(residuals)[-1]), mu_err)
+    A = np.sum(w**2, axis=-1)
+    B = w @ u
+    C1 = u @ u
+    chi2 = A - B**2 / C1
+    if mode == 'marginalize':
+        chi2 = chi2 + np.log(C1 / (2 * np.pi))
+    return chi2
+
+def run(data=None, offset=None):
+    """
+    SNe stage of the pipeline: chi2 for LCDM vs ZFP.
+
+    data: (z, mu_obs, mu_err) already loaded (default: reads sn_data.csv)
+    offset: None (H0 = 70 fixed), 'marginalize' or 'profile' to remove the
+            degenerate absolute-magnitude / H0 offset analytically
+    Returns dict with chi2_lcdm, chi2_zfp and n_points.
+    """
+    z, mu_obs, mu_err = load_sn_data() if data is None else data
+    
+    def chi2(mu_theory):
+        if offset is None:
+            return chi2_model(mu_theory, mu_obs, mu_err)
+        return chi2_offset(mu_obs - mu_theory, mu_err, offset)
     
     # LCDM
-    mu_lcdm_vals = np.array([mu_lcdm(zi) for zi in z])
-    chi2_lcdm = chi2_model(mu_lcdm_vals, mu_obs, mu_err)
+    mu_lcdm_vals = mu_lcdm(z)
+    chi2_lcdm = chi2(mu_lcdm_vals)
     
     # Zero Field Primordial
-    mu_zfp_vals = np.array([mu_zfp(zi) for zi in z])
-    chi2_zfp = chi2_model(mu_zfp_vals, mu_obs, mu_err)
+    mu_zfp_vals = mu_zfp(z)
+    chi2_zfp = chi2(mu_zfp_vals)
     
-    print(f"SNe Ia Analysis Results:")
+    print(f"SNe Ia Analysis Results" + (f" (mu offset: {offset})" if offset else "") + ":")
     print(f"  chi2(LCDM): {chi2_lcdm:.4f}")
     print(f"  chi2(ZFP):  {chi2_zfp:.4f}")
     print(f"  Delta chi2: {chi2_zfp - chi2_lcdm:.4f}")
     print(f"  N points: {len(z)}")
+    
+    return {
+        'chi2_lcdm': float(chi2_lcdm),
+        'chi2_zfp': float(chi2_zfp),
+        'n_points': len(z),
+    }
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,218 @@
+"""chi2_stream.py: Streaming χ² for catalogs larger than memory
+
+Reads a SNe or BAO catalog in chunks — slices of the memory-mapped
+columnar bundle when one exists (datasets.py), otherwise pandas' chunked
+CSV reader — evaluates every model on each chunk and accumulates:
+
+  - χ², number of points and, for the μ offset, the moments
+    A = Σ r²/σ², B = Σ r/σ², C1 = Σ 1/σ² (profiled/marginalized χ² at the end)
+  - per-redshift-bin counts, mean and rms residual and χ², plus underflow
+    and overflow bins for points outside the bin edges
+
+Memory stays flat: only one chunk, the per-bin accumulators and a fixed
+μ(z) table per model are held at any time. SNe models are tabulated once
+on a log-spaced redshift grid with the vectorized distance engine and
+interpolated per chunk. Diagonal errors only (a dense covariance for
+10^7 objects cannot be stored anyway).
+
+Usage:
+  python chi2_stream.py --probe sn --path mocks/sn_data.csv --chunk-size 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import chi2_bao
+import chi2_sn
+from datasets import load_table, resolve_path
+from runtime import lazy_import
+
+CHUNK_SIZE = 1_000_000
+Z_BINS = np.array([0.0, 0.1, 0.2, 0.4, 0.6, 0.8, 1.0, 1.5, 2.0, 3.0])
+N_TABLE = 4096      # log-spaced nodes of the tabulated μ(z)
+Z_TABLE_MIN = 1e-4
+
+PROBES = {
+    'sn': ['z', 'mu_obs', 'mu_err'],
+    'bao': ['z', 'DV_over_rd', 'sigma_DV_over_rd'],
+}
+
+# ============================================================================
+# DATA STREAM
+# ============================================================================
+
+def iter_chunks(path, columns, chunk_size=CHUNK_SIZE):
+    """
+    Yield tuples of column arrays, chunk_size rows at a time.
+
+    Uses memory-mapped slices if the columnar bundle is current, else
+    streams the CSV (no conversion, which would load it whole).
+    """
+    table = load_table(path, columns, build=False)
+    if table is not None:
+        n = len(table[columns[0]])
+        for start in range(0, n, chunk_size):
+            yield tuple(np.asarray(table[c][start:start + chunk_size]) for c in columns)
+        return
+    pd = lazy_import('pandas')
+    for df in pd.read_csv(resolve_path(path), usecols=columns, chunksize=chunk_size):
+        yield tuple(df[c].to_numpy(dtype=float) for c in columns)
+
+# ============================================================================
+# MODELS
+# ============================================================================
+
+class TabulatedModel:
+    """μ(z) tabulated on a log-spaced grid, extended when a chunk goes deeper"""
+
+    def __init__(self, mu_func, z_max=3.0):
+        self.mu_func = mu_func
+        self._build(z_max)
+
+    def _build(self, z_max):
+        self.z_max = z_max
+        self.ln_z = np.linspace(np.log(Z_TABLE_MIN), np.log(z_max), N_TABLE)
+        self.mu = self.mu_func(np.exp(self.ln_z))
+
+    def __call__(self, z):
+        if np.max(z) > self.z_max:
+            self._build(float(np.ceil(np.max(z))))
+        return np.interp(np.log(np.maximum(z, Z_TABLE_MIN)), self.ln_z, self.mu)
+
+def default_models(probe, H0=70.0, Omega_m=0.3, m_phi=1e-42):
+    """ΛCDM and ZFP predictions of the χ² stages, as per-chunk callables"""
+    if probe == 'sn':
+        return {
+            'lcdm': TabulatedModel(lambda z: chi2_sn.mu_lcdm(z, H0, Omega_m)),
+            'zfp': TabulatedModel(lambda z: chi2_sn.mu_zfp(z, H0, Omega_m, m_phi)),
+        }
+    return {
+        'lcdm': chi2_bao.DV_lcdm,
+        'zfp': lambda z: chi2_bao.DV_zero_field(z, m_phi),
+    }
+
+# ============================================================================
+# ACCUMULATION
+# ============================================================================
+
+class Chi2Accumulator:
+    """Running χ², offset moments and per-z-bin residual statistics of one model"""
+
+    def __init__(self, z_bins=Z_BINS):
+        self.z_bins = np.asarray(z_bins, dtype=float)
+        n_bins = len(self.z_bins) + 1  # underflow, len(z_bins) - 1 bins, overflow
+        self.n = 0
+        self.A = self.B = self.C1 = 0.0
+        self.bin_n = np.zeros(n_bins, dtype=np.int64)
+        self.bin_sum = np.zeros(n_bins)
+        self.bin_sum2 = np.zeros(n_bins)
+        self.bin_chi2 = np.zeros(n_bins)
+
+    def add(self, z, residuals, sigma):
+        w = residuals / sigma
+        self.n += len(z)
+        self.A += np.dot(w, w)
+        self.B += np.sum(w / sigma)
+        self.C1 += np.sum(1.0 / sigma**2)
+
+        # 0: z below the first edge, size - 1: above the last; the last bin is
+        # closed on the right, as in np.histogram
+        size = len(self.bin_n)
+        idx = np.searchsorted(self.z_bins, z, side='right')
+        idx[z == self.z_bins[-1]] = size - 2
+        self.bin_n += np.bincount(idx, minlength=size)
+        self.bin_sum += np.bincount(idx, residuals, minlength=size)
+        self.bin_sum2 += np.bincount(idx, residuals**2, minlength=size)
+        self.bin_chi2 += np.bincount(idx, w**2, minlength=size)
+
+    def chi2(self, offset=None):
+        """Total χ²; offset='profile' / 'marginalize' as in chi2_sn.chi2_offset"""
+        if offset is None:
+            return self.A
+        chi2 = self.A - self.B**2 / self.C1
+        if offset == 'marginalize':
+            chi2 += np.log(self.C1 / (2 * np.pi))
+        return chi2
+
+    def bins(self):
+        """
+        Per-bin n, mean and rms residual and χ² (empty bins: NaN mean/rms);
+        'underflow' / 'overflow' hold the same statistics for the points
+        below / above the bin edges.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.bin_sum / self.bin_n
+            rms = np.sqrt(self.bin_sum2 / self.bin_n)
+        stats = {'n': self.bin_n, 'mean_residual': mean, 'rms_residual': rms,
+                 'chi2': self.bin_chi2}
+        result = {'z_lo': self.z_bins[:-1].tolist(), 'z_hi': self.z_bins[1:].tolist()}
+        result.update({key: values[1:-1].tolist() for key, values in stats.items()})
+        result['underflow'] = {key: values[0].item() for key, values in stats.items()}
+        result['overflow'] = {key: values[-1].item() for key, values in stats.items()}
+        return result
+
+def stream_chi2(path, probe='sn', models=None, chunk_size=CHUNK_SIZE, z_bins=Z_BINS,
+                offset=None):
+    """
+    χ² of every model against a catalog too large to hold in memory.
+
+    path: CSV (or registry name) in the sn_data.csv / bao_data.csv schema
+    models: {name: f(z) → prediction}; default: ΛCDM and ZFP of the χ² stages
+    offset: None, 'profile' or 'marginalize' (SNe μ offset, see chi2_sn)
+    Returns {model: {'chi2', 'n_points', 'bins'}} plus 'n_chunks'.
+    """
+    columns = PROBES[probe]
+    models = default_models(probe) if models is None else models
+    acc = {name: Chi2Accumulator(z_bins) for name in models}
+
+    n_chunks = 0
+    for z, obs, sigma in iter_chunks(path, columns, chunk_size):
+        for name, model in models.items():
+            acc[name].add(z, obs - model(z), sigma)
+        n_chunks += 1
+
+    result = {name: {'chi2': float(a.chi2(offset)), 'n_points': a.n, 'bins': a.bins()}
+              for name, a in acc.items()}
+    result['n_chunks'] = n_chunks
+    return result
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Streaming χ² for large SNe/BAO catalogs')
+    parser.add_argument('--probe', choices=sorted(PROBES), default='sn')
+    parser.add_argument('--path', default=None, help='Catalog CSV (default: bundled data)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'Rows per chunk (default: {CHUNK_SIZE})')
+    parser.add_argument('--offset', choices=['marginalize', 'profile'], default=None,
+                        help='Remove the SNe mu offset analytically')
+    args = parser.parse_args()
+
+    start = time.time()
+    result = stream_chi2(args.path or args.probe, args.probe, chunk_size=args.chunk_size,
+                         offset=args.offset)
+    elapsed = time.time() - start
+
+    print(f"Streaming χ² ({args.probe}, {result['n_chunks']} chunks, {elapsed:.1f}s):")
+    for name in ['lcdm', 'zfp']:
+        r = result[name]
+        print(f"  {name:<5} χ² = {r['chi2']:.4f}   N = {r['n_points']}   "
+              f"χ²/N = {r['chi2'] / max(r['n_points'], 1):.4f}")
+    print(f"  Δχ² (ZFP - ΛCDM) = {result['zfp']['chi2'] - result['lcdm']['chi2']:.4f}")
+
+    bins = result['lcdm']['bins']
+    print("\n  ΛCDM residuals per redshift bin:")
+    for lo, hi, n, mean, rms in zip(bins['z_lo'], bins['z_hi'], bins['n'],
+                                    bins['mean_residual'], bins['rms_residual']):
+        if n:
+            print(f"    {lo:4.2f}–{hi:4.2f}  N = {n:9d}  ⟨r⟩ = {mean:+.4f}  rms = {rms:.4f}")
+    for label, edge, side in [('z <', bins['z_lo'][0], 'underflow'),
+                              ('z >', bins['z_hi'][-1], 'overflow')]:
+        b = bins[side]
+        if b['n']:
+            print(f"    {label} {edge:4.2f}  N = {b['n']:9d}  ⟨r⟩ = {b['mean_residual']:+.4f}  "
+                  f"rms = {b['rms_residual']:.4f}  ({side})")
@@ -0,0 +1,113 @@
+"""covariance.py: Full-covariance χ² with a cached Cholesky factorization
+
+Real SNe (Pantheon+) and BAO (DESI) products ship dense covariance
+matrices. The covariance is factorized once, C = L Lᵀ, and
+
+    χ² = rᵀ C⁻¹ r = |L⁻¹ r|²
+
+is evaluated with one triangular solve, O(N²) per residual vector; a batch
+of residual vectors (N_params, N) is solved in a single call.
+
+The factor is cached on disk under the SHA-256 of the covariance file, so
+reloading a 1,700×1,700 matrix costs a memory map instead of a
+factorization.
+
+chi2_residuals() accepts either a 1D array of errors (diagonal case) or a
+CholeskyCovariance, so data tuples (z, obs, errors) work unchanged with
+both.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from datasets import load_matrix, resolve_path
+
+CACHE_DIR = '.cholesky_cache'
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+# ============================================================================
+# FACTORIZATION
+# ============================================================================
+
+class CholeskyCovariance:
+    """Lower Cholesky factor of a covariance matrix, with χ² evaluation"""
+
+    def __init__(self, L, sha256=None):
+        self.L = np.asarray(L, dtype=float)  # no copy for a float64 memmap
+        self.sha256 = sha256
+
+    @classmethod
+    def from_matrix(cls, cov, sha256=None):
+        try:
+            L = np.linalg.cholesky(np.asarray(cov, dtype=float))
+        except np.linalg.LinAlgError:
+            raise ValueError("Covariance matrix is not positive definite")
+        return cls(L, sha256)
+
+    @classmethod
+    def from_file(cls, path, cache_dir=CACHE_DIR):
+        """
+        Factor of the covariance in path (.npy or Pantheon+ text, read via
+        datasets.load_matrix), memory-mapped from cache_dir when present
+        """
+        path = resolve_path(path)
+        sha256 = file_hash(path)
+        cached = os.path.join(cache_dir, sha256 + '.npy') if cache_dir else None
+        if cached and os.path.exists(cached):
+            return cls(np.load(cached, mmap_mode='r'), sha256)
+
+        factor = cls.from_matrix(load_matrix(path), sha256)
+        if cached:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = cached + '.tmp.npy'
+            np.save(tmp, factor.L)
+            os.replace(tmp, cached)
+        return factor
+
+    def __len__(self):
+        return len(self.L)
+
+    def __repr__(self):
+        # Content-stable (used by the pipeline's stage cache keys)
+        return f"CholeskyCovariance(n={len(self)}, sha256={self.sha256})"
+
+    @property
+    def sigma(self):
+        """Diagonal errors sqrt(C_ii)"""
+        return np.sqrt(np.sum(self.L**2, axis=1))
+
+    def whiten(self, residuals):
+        """L⁻¹ r for r of shape (N,) or (N_params, N)"""
+        r = np.asarray(residuals, dtype=float)
+        return solve_triangular(self.L, r.T, lower=True, check_finite=False).T
+
+    def chi2(self, residuals):
+        """rᵀ C⁻¹ r, scalar or (N_params,)"""
+        return np.sum(self.whiten(residuals)**2, axis=-1)
+
+def whiten(residuals, errors):
+    """Whitened residuals: r / σ (diagonal errors) or L⁻¹ r (CholeskyCovariance)"""
+    if isinstance(errors, CholeskyCovariance):
+        return errors.whiten(residuals)
+    return np.asarray(residuals) / errors
+
+def chi2_residuals(residuals, errors):
+    """
+    χ² of residuals (N,) or (N_params, N) with diagonal errors (array of σ)
+    or a CholeskyCovariance.
+    """
+    return np.sum(whiten(residuals, errors)**2, axis=-1)
@@ -0,0 +1,137 @@
+"""datasets.py: Dataset registry with a memory-mapped columnar cache
+
+CSV catalogs (and text covariance matrices) are converted on first use to
+a versioned bundle of .npy files next to the source:
+
+  <dir>/.columnar/<name>/meta.json   format version, source size/mtime, columns
+  <dir>/.columnar/<name>/<col>.npy   one array per column: float64 for
+                                     numeric columns, fixed-width unicode
+                                     for text columns (e.g. survey names)
+
+and later loads open the .npy files with mmap_mode='r': no parsing and no
+copy, so large catalogs load in milliseconds. A bundle is rebuilt when the
+source file changes (size or mtime) or FORMAT_VERSION is bumped.
+
+Relative paths resolve against the current directory when the file exists
+there, otherwise against the package root, so 'data/sn_data.csv' works
+from any working directory.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from runtime import lazy_import
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PACKAGE_ROOT, 'data')
+FORMAT_VERSION = 2
+CACHE_SUBDIR = '.columnar'
+
+# Bundled datasets: name → (file in DATA_DIR, required columns)
+DATASETS = {
+    'sn': ('sn_data.csv', ['z', 'mu_obs', 'mu_err']),
+    'bao': ('bao_data.csv', ['z', 'DV_over_rd', 'sigma_DV_over_rd']),
+}
+
+# ============================================================================
+# PATHS
+# ============================================================================
+
+def resolve_path(path):
+    """Absolute path of a registry name, or of a file relative to cwd / package root"""
+    if path in DATASETS:
+        return os.path.join(DATA_DIR, DATASETS[path][0])
+    if os.path.isabs(path) or os.path.exists(path):
+        return os.path.abspath(path)
+    return os.path.join(PACKAGE_ROOT, path)
+
+def _bundle_dir(source):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(os.path.dirname(source), CACHE_SUBDIR, stem)
+
+def _source_stamp(source):
+    st = os.stat(source)
+    return {'version': FORMAT_VERSION, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def _read_meta(bundle, source):
+    """Bundle metadata if it is current for source, else None"""
+    try:
+        with open(os.path.join(bundle, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    stamp = _source_stamp(source)
+    return meta if all(meta.get(k) == v for k, v in stamp.items()) else None
+
+def _write_bundle(bundle, source, arrays):
+    os.makedirs(bundle, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(bundle, name + '.npy'), np.ascontiguousarray(values))
+    meta = dict(_source_stamp(source), columns=list(arrays),
+                text=[name for name, values in arrays.items() if values.dtype.kind == 'U'])
+    tmp = os.path.join(bundle, 'meta.json.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(bundle, 'meta.json'))  # written last: marks the bundle complete
+    return meta
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _column_array(series):
+    """float64 array of a numeric column, unicode array of any other column"""
+    if lazy_import('pandas').api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=float)
+    return series.fillna('').astype(str).to_numpy(dtype=str)
+
+def load_table(path, columns=None, build=True):
+    """
+    Columns of a CSV catalog as read-only memory-mapped arrays.
+
+    path: registry name ('sn', 'bao') or CSV path
+    columns: required column names (KeyError if missing); default all
+    build: convert the CSV when no current bundle exists; with build=False
+           None is returned instead (e.g. to stream a huge CSV in chunks)
+    Returns dict column → array (float64; text columns as str arrays).
+    """
+    if columns is None and path in DATASETS:
+        columns = DATASETS[path][1]
+    source = resolve_path(path)
+    bundle = _bundle_dir(source)
+
+    meta = _read_meta(bundle, source)
+    if meta is None:
+        if not build:
+            return None
+        df = lazy_import('pandas').read_csv(source)
+        meta = _write_bundle(bundle, source, {c: _column_array(df[c]) for c in df.columns})
+
+    missing = [c for c in (columns or []) if c not in meta['columns']]
+    if missing:
+        raise KeyError(f"{source} has no column(s) {missing}; available: {meta['columns']}")
+    return {c: np.load(os.path.join(bundle, c + '.npy'), mmap_mode='r')
+            for c in (columns or meta['columns'])}
+
+def load_matrix(path):
+    """
+    Square matrix (e.g. a covariance) as a read-only memory-mapped array.
+
+    .npy files are mapped directly; text files in the Pantheon+ layout
+    (first line N, then N² values) are converted once to a bundle.
+    """
+    source = resolve_path(path)
+    if source.endswith('.npy'):
+        matrix = np.load(source, mmap_mode='r')
+    else:
+        bundle = _bundle_dir(source)
+        if _read_meta(bundle, source) is None:
+            values = np.loadtxt(source).ravel()
+            n = int(values[0])
+            _write_bundle(bundle, source, {'matrix': values[1:].reshape(n, n)})
+        matrix = np.load(os.path.join(bundle, 'matrix.npy'), mmap_mode='r')
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"Matrix in {source} is not square: shape {matrix.shape}")
+    return matrix
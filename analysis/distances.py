@@ -0,0 +1,90 @@
+"""distances.py: Vectorized cosmological distance engine
+
+Shared by the ΛCDM and Zero Field Primordial models. Instead of integrating
+1/H(z) separately for every object, the comoving distance is integrated once
+on a fine master grid (cumulative trapezoid) and interpolated at all
+requested redshifts in a single call.
+
+Every function accepts H(z) evaluated on the master grid with shape
+(n_grid,) or (n_params, n_grid), so a whole batch of parameter vectors is
+handled with the same code path.
+"""
+
+import numpy as np
+
+C_LIGHT = 3e5  # speed of light (km/s)
+R_D = 147.09   # sound horizon at the drag epoch [Mpc] (Planck 2018)
+N_GRID = 2048  # points in the master redshift grid
+
+# ============================================================================
+# MASTER GRID
+# ============================================================================
+
+def master_grid(z_max, n_grid=N_GRID):
+    """Uniform redshift grid on [0, z_max] used for the cumulative integral"""
+    return np.linspace(0.0, max(float(z_max), 1e-8), n_grid)
+
+def interp_weights(z, z_grid):
+    """
+    Bracketing indices and linear weights of z inside a sorted z_grid.
+
+    Computed once per redshift set and reused for every row of a batched
+    table, so the data is located on the grid only once.
+    """
+    z = np.asarray(z, dtype=float)
+    idx = np.clip(np.searchsorted(z_grid, z, side='right') - 1, 0, len(z_grid) - 2)
+    frac = (z - z_grid[idx]) / (z_grid[idx + 1] - z_grid[idx])
+    return idx, frac
+
+def interp_on_grid(table, idx, frac):
+    """Linear interpolation of table[..., n_grid] at precomputed weights"""
+    return table[..., idx] * (1.0 - frac) + table[..., idx + 1] * frac
+
+# ============================================================================
+# DISTANCES
+# ============================================================================
+
+def comoving_distance_grid(z_grid, H_grid):
+    """D_C(z) = c ∫ dz'/H(z') on the master grid, shape of H_grid [Mpc]"""
+    # Cumulative trapezoid in plain numpy (scipy.integrate costs ~0.4 s to import)
+    f = 1.0 / np.asarray(H_grid, dtype=float)
+    D_C = np.zeros(f.shape)
+    D_C[..., 1:] = np.cumsum(0.5 * (f[..., 1:] + f[..., :-1]) * np.diff(z_grid), axis=-1)
+    return C_LIGHT * D_C
+
+def distances_from_H(z, z_grid, H_grid):
+    """
+    Distances at redshifts z from H(z) tabulated on z_grid.
+
+    H_grid may be 1D (n_grid,) or batched (n_params, n_grid); outputs then
+    have shape z.shape or (n_params,) + z.shape.
+
+    Returns dict with 'D_M', 'D_L', 'D_A', 'D_V' [Mpc] and 'mu' [mag].
+    """
+    z = np.asarray(z, dtype=float)
+    idx, frac = interp_weights(z, z_grid)
+    D_M = interp_on_grid(comoving_distance_grid(z_grid, H_grid), idx, frac)
+    H = interp_on_grid(np.asarray(H_grid, dtype=float), idx, frac)
+    D_L = (1 + z) * D_M
+    return {
+        'D_M': D_M,
+        'D_L': D_L,
+        'D_A': D_M / (1 + z),
+        'D_V': np.cbrt(z * D_M**2 * C_LIGHT / H),
+        'mu': 5 * np.log10(D_L) + 25,
+    }
+
+def distances(z, H_func, n_grid=N_GRID):
+    """
+    Distances for all redshifts z in one vectorized call.
+
+    H_func(z_grid) must return H in km/s/Mpc on the master grid, either
+    (n_grid,) or (n_params, n_grid) for a batch of models.
+    """
+    z = np.asarray(z, dtype=float)
+    z_grid = master_grid(np.max(z), n_grid)
+    return distances_from_H(z, z_grid, H_func(z_grid))
+
+def distance_modulus(z, H_func, n_grid=N_GRID):
+    """μ(z) = 5 log10(D_L / Mpc) + 25"""
+    return distances(z, H_func, n_grid)['mu']
@@ -0,0 +1,234 @@
+"""emulator.py: Surrogate model for H(z) trained on the background solver
+
+E(z) = H(z)/H0 of the Zero Field background depends on (Omega_m, r) only,
+with r = m_phi/H0 the field mass in Hubble units, so the emulator tabulates
+ln E on a regular (Omega_m, u) grid, solved in one batched call, and
+interpolates it linearly. u is a transformed mass coordinate,
+
+  u = asinh(r / R_SCALE) / asinh(r_max / R_SCALE)   ∈ [0, 1]
+
+linear in r for r ≪ R_SCALE and logarithmic above it: E oscillates in r
+around r ~ 5-10 (the field starts oscillating before today) and flattens
+for heavy fields, so uniform sampling in m_phi would waste most nodes.
+
+build_emulator() validates the result against the solver and refines the
+grid until the stated tolerances (RMS_TOL, P99_TOL on |ΔH/H|) are met, or
+raises EmulatorAccuracyError. The largest errors sit at the redshift where
+a model enters the WKB-averaged regime: the solver's H jumps by O(1/r)
+there, which no smooth interpolant reproduces, so the maximum error is
+reported but not gated.
+
+The fitted emulator is saved to / loaded from a single .npz file and offers
+the same call signature as background.H_zero_field_batch, so it can replace
+the exact solver inside a likelihood. The file records the solver it was
+trained on (background.SOLVER): load() refuses an emulator of a different
+solver, which would emulate a different H(z). refine() re-solves final
+samples exactly.
+
+Usage:
+  python emulator.py --grid 17 513 --validate 256 --output hz_emulator.npz
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy.interpolate import CubicSpline, RegularGridInterpolator
+
+import background
+from background import GEV_PER_H_UNIT, Z_MAX_GRID, solve_background_batch, H_zero_field_batch
+
+R_SCALE = 5.0        # r = m_phi/H0 where the mass coordinate turns logarithmic
+GRID = (17, 513)     # default (Omega_m, u) nodes
+RMS_TOL = 2e-3       # accepted rms |ΔH/H| over the validation set
+P99_TOL = 5e-3       # accepted 99th percentile of |ΔH/H|
+MAX_REFINE = 2       # grid doublings attempted before giving up
+
+class EmulatorAccuracyError(RuntimeError):
+    """Emulator does not reach the requested accuracy against the solver"""
+
+def mass_coordinate(r, r_max):
+    """u ∈ [0, 1] of r = m_phi/H0"""
+    return np.arcsinh(np.asarray(r) / R_SCALE) / np.arcsinh(r_max / R_SCALE)
+
+def mass_from_coordinate(u, r_max):
+    """r = m_phi/H0 at mass coordinate u"""
+    return R_SCALE * np.sinh(np.asarray(u) * np.arcsinh(r_max / R_SCALE))
+
+def box_r_max(bounds):
+    """Largest m_phi/H0 of a (H0, Omega_m, m_phi) box: heaviest field, smallest H0"""
+    return bounds[2, 1] / GEV_PER_H_UNIT / bounds[0, 0]
+
+# ============================================================================
+# EMULATOR
+# ============================================================================
+
+class HubbleEmulator:
+    """Regular-grid emulator of ln(H/H0) over (Omega_m, transformed m_phi/H0)"""
+
+    def __init__(self, bounds, z, omega_m, u, ln_E, z_max=Z_MAX_GRID, report=None,
+                 solver=None):
+        self.bounds = np.asarray(bounds, dtype=float)  # (3, 2) lower/upper (H0, Omega_m, m_phi)
+        self.z = np.asarray(z, dtype=float)            # standard grid (n_z,)
+        self.omega_m = np.asarray(omega_m, dtype=float)  # Omega_m nodes (n_om,)
+        self.u = np.asarray(u, dtype=float)            # mass-coordinate nodes (n_u,)
+        self.ln_E = np.asarray(ln_E, dtype=float)      # ln(H/H0) (n_om, n_u, n_z)
+        self.z_max = float(z_max)
+        self.report = report                           # validate() output, if any
+        self.solver = solver or background.SOLVER      # background solver of the training set
+        self._interp = RegularGridInterpolator((self.omega_m, self.u), self.ln_E)
+
+    def H_grid(self, thetas):
+        """H on the standard grid, shape (n_z, N_params)"""
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=float))
+        r = thetas[:, 2] / GEV_PER_H_UNIT / thetas[:, 0]
+        points = np.column_stack([thetas[:, 1], mass_coordinate(r, box_r_max(self.bounds))])
+        return (thetas[:, :1] * np.exp(self._interp(points))).T
+
+    def H_zero_field_batch(self, z, H0, Omega_m, m_phi):
+        """Drop-in replacement for background.H_zero_field_batch"""
+        z = np.asarray(z, dtype=float)
+        if np.size(z) and np.max(z) > self.z_max:
+            raise ValueError(f"Emulator trained up to z = {self.z_max}, got z = {np.max(z)}")
+        H0, Omega_m, m_phi = np.broadcast_arrays(
+            np.atleast_1d(H0), np.atleast_1d(Omega_m), np.atleast_1d(m_phi))
+        thetas = np.column_stack([H0.ravel(), Omega_m.ravel(), m_phi.ravel()])
+        return np.moveaxis(CubicSpline(self.z, self.H_grid(thetas), axis=0)(z), -1, 0)
+
+    def H_zero_field(self, z, H0, Omega_m, m_phi):
+        """Drop-in replacement for background.H_zero_field"""
+        return self.H_zero_field_batch(z, H0, Omega_m, m_phi)[0]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        report = self.report or {}
+        np.savez(path, bounds=self.bounds, z=self.z, omega_m=self.omega_m, u=self.u,
+                 ln_E=self.ln_E, z_max=self.z_max, solver=self.solver,
+                 report_keys=np.array(list(report), dtype=str),
+                 report_values=np.array(list(report.values()), dtype=float))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            solver = str(f['solver']) if 'solver' in f else 'unknown'
+            if solver != background.SOLVER:
+                raise ValueError(f"{path} was trained on the {solver!r} background solver, "
+                                 f"current solver is {background.SOLVER!r}: retrain it")
+            report = dict(zip(f['report_keys'].tolist(), f['report_values'].tolist())) or None
+            return cls(f['bounds'], f['z'], f['omega_m'], f['u'], f['ln_E'],
+                       float(f['z_max']), report, solver)
+
+# ============================================================================
+# TRAINING AND VALIDATION
+# ============================================================================
+
+def _train(bounds, grid, z_max):
+    n_om, n_u = grid
+    omega_m, u = np.linspace(*bounds[1], n_om), np.linspace(0.0, 1.0, n_u)
+    Om, U = np.meshgrid(omega_m, u, indexing='ij')
+    # E depends on m_phi/H0 only: solve every node at the lower H0
+    H0 = bounds[0, 0]
+    m_phi = mass_from_coordinate(U.ravel(), box_r_max(bounds)) * GEV_PER_H_UNIT * H0
+    hist = solve_background_batch(H0, Om.ravel(), m_phi, z_max)
+    ln_E = np.log(hist['H'] / H0).T.reshape(n_om, n_u, -1)
+    return HubbleEmulator(bounds, hist['z'], omega_m, u, ln_E, z_max)
+
+def build_emulator(bounds, grid=GRID, z_max=Z_MAX_GRID, rms_tol=RMS_TOL, p99_tol=P99_TOL,
+                   n_test=256, max_refine=MAX_REFINE):
+    """
+    Train an emulator on a regular (Omega_m, u) grid of grid = (n_om, n_u)
+    nodes and validate it against the solver.
+
+    While the validation exceeds rms_tol or p99_tol the grid is refined
+    (nodes doubled along both axes), up to max_refine times; beyond that
+    EmulatorAccuracyError is raised. The accepted report is kept in
+    emulator.report (and saved with it).
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    n_om, n_u = grid
+    for _ in range(max_refine + 1):
+        emulator = _train(bounds, (n_om, n_u), z_max)
+        report = validate(emulator, n_test)
+        if report['rms_rel_error'] <= rms_tol and report['p99_rel_error'] <= p99_tol:
+            emulator.report = report
+            return emulator
+        n_om, n_u = 2 * n_om - 1, 2 * n_u - 1
+    raise EmulatorAccuracyError(
+        f"Emulator on a {len(emulator.omega_m)}×{len(emulator.u)} grid: rms |ΔH/H| = "
+        f"{report['rms_rel_error']:.2e} (tol {rms_tol:.0e}), p99 = "
+        f"{report['p99_rel_error']:.2e} (tol {p99_tol:.0e})")
+
+def validate(emulator, n_test=256, seed=1):
+    """
+    Accuracy report of the emulator against the exact solver at n_test
+    random points of its box (relative error of H on the standard grid).
+    """
+    rng = np.random.default_rng(seed)
+    lo, hi = emulator.bounds[:, 0], emulator.bounds[:, 1]
+    thetas = lo + (hi - lo) * rng.random((n_test, len(lo)))
+
+    exact = solve_background_batch(thetas[:, 0], thetas[:, 1], thetas[:, 2],
+                                   emulator.z_max)['H']
+    start = time.perf_counter()
+    approx = emulator.H_grid(thetas)
+    elapsed = time.perf_counter() - start
+
+    rel = np.abs(approx / exact - 1)
+    return {
+        'n_test': n_test,
+        'n_nodes': emulator.ln_E.shape[0] * emulator.ln_E.shape[1],
+        'max_rel_error': float(rel.max()),
+        'rms_rel_error': float(np.sqrt(np.mean(rel**2))),
+        'p99_rel_error': float(np.percentile(rel, 99)),
+        'us_per_query': 1e6 * elapsed / n_test,
+    }
+
+def refine(thetas, z, emulator=None):
+    """
+    Exact-solver refinement of final samples.
+
+    Returns (H_exact, max_rel_dev): H(z) from the solver for every sample and,
+    if an emulator is given, the largest relative deviation of its prediction
+    per sample (useful to flag or reweight samples).
+    """
+    thetas = np.atleast_2d(thetas)
+    H_exact = H_zero_field_batch(z, thetas[:, 0], thetas[:, 1], thetas[:, 2], cache=None)
+    if emulator is None:
+        return H_exact, None
+    H_emu = emulator.H_zero_field_batch(z, thetas[:, 0], thetas[:, 1], thetas[:, 2])
+    rel = np.abs(H_emu / H_exact - 1).reshape(len(thetas), -1)
+    return H_exact, rel.max(axis=1)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    from mcmc_exploration import PRIOR_BOUNDS
+
+    parser = argparse.ArgumentParser(description='Train the H(z) emulator on the prior box')
+    parser.add_argument('--grid', type=int, nargs=2, default=list(GRID), metavar=('N_OM', 'N_U'),
+                        help=f'Omega_m × mass-coordinate nodes (default: {GRID[0]} {GRID[1]})')
+    parser.add_argument('--validate', type=int, default=256,
+                        help='Random test points for the accuracy report (default: 256)')
+    parser.add_argument('--output', default='hz_emulator.npz',
+                        help='Output file (default: hz_emulator.npz)')
+    args = parser.parse_args()
+
+    print(f"[1] Solving background on a {args.grid[0]}×{args.grid[1]} (Omega_m, u) grid...")
+    start = time.time()
+    emulator = build_emulator(PRIOR_BOUNDS, grid=args.grid, n_test=args.validate)
+    report = emulator.report
+    print(f"    {report['n_nodes']} nodes, {time.time() - start:.1f}s (including validation)")
+
+    emulator.save(args.output)
+    print(f"[2] Emulator saved: {args.output}")
+
+    print(f"[3] Validation against the solver ({report['n_test']} points):")
+    print(f"    max |ΔH/H| = {report['max_rel_error']:.2e}")
+    print(f"    rms |ΔH/H| = {report['rms_rel_error']:.2e}  (tol {RMS_TOL:.0e})")
+    print(f"    p99 |ΔH/H| = {report['p99_rel_error']:.2e}  (tol {P99_TOL:.0e})")
+    print(f"    {report['us_per_query']:.1f} µs per parameter point")
@@ -0,0 +1,352 @@
+"""fisher.py: Fisher-matrix forecasts for BAO and SNe survey configurations
+
+Sizes an experiment without running MCMC on mock data. Observables:
+
+  DV_over_rd   D_V(z) / r_d     (fractional errors)
+  H_over_rd    H(z) / r_d       (fractional errors)
+  mu           distance modulus (errors in magnitudes)
+
+with r_d held fixed (it cancels in fractional errors). Derivatives with
+respect to (H0, Omega_m, m_phi) are 5-point finite differences around the
+fiducial, with steps relative to each fiducial value (absolute, ABS_STEP,
+for a zero fiducial) and one-sided stencils where a central one would
+leave PARAM_RANGE (e.g. ΛCDM, m_phi = 0). The stencils at h and h/2 —
+8 n_params + 1 models — are solved in a single batched background call
+when a FisherEngine is built: the h/2 derivatives check convergence
+(FisherStepWarning above DERIV_RTOL), and a stencil model the solver
+cannot solve is an error rather than a silent ΛCDM fallback.
+Observables at any redshifts are then interpolated from the master
+distance grid, so a forecast for a new survey specification is a few
+small matrix products (milliseconds).
+
+A survey specification is {observable: (z, sigma)}, sigma scalar or per
+redshift. By default the SNe magnitude offset (degenerate with H0) is a
+free nuisance parameter, marginalized out of the Fisher matrix.
+
+Usage:
+  python fisher.py                                  # bundled BAO + SNe
+  python fisher.py --survey my_survey.csv --prior H0 1.0
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from background import Z_MAX_GRID, SolverFallbackWarning, H_zero_field_batch
+from datasets import load_table
+from distances import (C_LIGHT, R_D, comoving_distance_grid, interp_on_grid,
+                       interp_weights, master_grid)
+from mcmc_exploration import FIDUCIAL, PARAM_NAMES
+
+STEP = 1e-2    # finite-difference step, relative to each fiducial value
+
+# Absolute steps for zero fiducial values (where relative steps vanish)
+ABS_STEP = {'H0': 0.1, 'Omega_m': 1e-3, 'm_phi': 1e-43}
+
+# Physical range of each parameter: stencils that would leave it are one-sided
+PARAM_RANGE = {'H0': (0.0, np.inf), 'Omega_m': (0.0, 1.0), 'm_phi': (0.0, np.inf)}
+
+# 5-point first-derivative stencils: offsets (units of h) and weights of
+# [f(θ), f(θ + offsets)] (× 1/12h)
+STENCILS = {
+    'central': (np.array([2, 1, -1, -2]), np.array([0, -1, 8, -8, 1])),
+    'forward': (np.array([1, 2, 3, 4]), np.array([-25, 48, -36, 16, -3])),
+    'backward': (np.array([-1, -2, -3, -4]), np.array([25, -48, 36, -16, 3])),
+}
+
+# Largest relative change of the derivatives when the step is halved;
+# derivatives below DERIV_ATOL (in ln H or ln D_M per unit of the parameter
+# scale) count as zero
+DERIV_RTOL = 1e-2
+DERIV_ATOL = 1e-5
+
+# Error convention per observable: fractional (σ_O / O) or absolute
+FRACTIONAL = {'DV_over_rd': True, 'H_over_rd': True, 'mu': False}
+
+# Smallest/largest eigenvalue (fiducial units) below which F is singular
+SINGULAR_RTOL = 1e-10
+
+# Δχ² of two-parameter confidence regions
+DCHI2_2D = {0.68: 2.30, 0.95: 6.18}
+
+# ============================================================================
+# SURVEY SPECIFICATIONS
+# ============================================================================
+
+def bundled_survey():
+    """Specification of the bundled BAO (D_V and H) and SNe datasets"""
+    bao = load_table('bao', ['z', 'DV_over_rd', 'sigma_DV_over_rd', 'H_over_rd', 'sigma_H_over_rd'])
+    sn = load_table('sn', ['z', 'mu_err'])
+    return {
+        'DV_over_rd': (bao['z'], bao['sigma_DV_over_rd'] / bao['DV_over_rd']),
+        'H_over_rd': (bao['z'], bao['sigma_H_over_rd'] / bao['H_over_rd']),
+        'mu': (sn['z'], sn['mu_err']),
+    }
+
+def load_survey(path):
+    """
+    Specification from a CSV with a 'z' column and any of 'sigma_DV_over_rd',
+    'sigma_H_over_rd' (fractional) and 'sigma_mu' (mag); empty cells mean
+    the observable is not measured at that redshift.
+    """
+    table = load_table(path)
+    spec = {}
+    for name in FRACTIONAL:
+        sigma = table.get('sigma_' + name)
+        if sigma is None:
+            continue
+        measured = np.isfinite(sigma)
+        if np.any(measured):
+            spec[name] = (np.asarray(table['z'])[measured], np.asarray(sigma)[measured])
+    if not spec:
+        raise KeyError(f"{path} has no sigma_* column; expected any of "
+                       f"{['sigma_' + name for name in FRACTIONAL]}")
+    return spec
+
+def survey_z_max(spec):
+    return max(float(np.max(z)) for z, _ in spec.values())
+
+# ============================================================================
+# FISHER ENGINE
+# ============================================================================
+
+class FisherStepWarning(RuntimeWarning):
+    """Finite-difference derivatives change by more than DERIV_RTOL when the step is halved"""
+
+def ellipse(cov, level=0.68):
+    """
+    Confidence ellipse of a 2×2 covariance: (a, b, angle) with semi-axes
+    a ≥ b and the major-axis angle in degrees (-90, 90] from the first
+    parameter axis
+    """
+    vals, vecs = np.linalg.eigh(cov)
+    a, b = np.sqrt(DCHI2_2D[level] * np.maximum(vals[::-1], 0.0))
+    angle = np.degrees(np.arctan2(vecs[1, 1], vecs[0, 1]))
+    return float(a), float(b), float(90.0 - (90.0 - angle) % 180.0)
+
+class FisherEngine:
+    """Observable derivatives around one fiducial model, from one batched solve"""
+
+    def __init__(self, fiducial=FIDUCIAL, z_max=Z_MAX_GRID, step=STEP, abs_step=None):
+        """
+        step: finite-difference step relative to each nonzero fiducial value
+        abs_step: {parameter: absolute step} overriding ABS_STEP for zero
+                  fiducial values
+        """
+        self.fiducial = np.asarray(fiducial, dtype=float)
+        abs_step = dict(ABS_STEP, **(abs_step or {}))
+        self.h = np.where(self.fiducial != 0, step * np.abs(self.fiducial),
+                          [abs_step[name] for name in PARAM_NAMES])
+        # Parameter scales (inversion conditioning, convergence check)
+        self.scale = np.where(self.fiducial != 0, np.abs(self.fiducial), self.h)
+        self.z_max = float(z_max)
+
+        self.sides = []
+        for name, value, h in zip(PARAM_NAMES, self.fiducial, self.h):
+            lo, hi = PARAM_RANGE[name]
+            if not lo <= value <= hi:
+                raise ValueError(f"Fiducial {name} = {value} outside its range [{lo}, {hi}]")
+            if value - 2 * h < lo:
+                self.sides.append('forward')
+            elif value + 2 * h > hi:
+                self.sides.append('backward')
+            else:
+                self.sides.append('central')
+
+        # Fiducial, then the 4 stencil points of each parameter at h, then at h/2
+        n = len(self.fiducial)
+        thetas = np.tile(self.fiducial, (8 * n + 1, 1))
+        for k, factor in enumerate([1.0, 0.5]):
+            for i in range(n):
+                start = 1 + 4 * (k * n + i)
+                thetas[start:start + 4, i] += STENCILS[self.sides[i]][0] * factor * self.h[i]
+
+        self.z_grid = master_grid(self.z_max)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', SolverFallbackWarning)
+            try:
+                self._H = H_zero_field_batch(self.z_grid, *thetas.T)
+            except SolverFallbackWarning as e:
+                raise RuntimeError(f"Background solver failed for the Fisher stencil around "
+                                   f"{self.fiducial.tolist()}: {e}") from e
+        self._D_M = comoving_distance_grid(self.z_grid, self._H)
+        self.step_error = self._step_error()
+        bad = {name: err for name, err in self.step_error.items() if err > DERIV_RTOL}
+        if bad:
+            warnings.warn("Fisher derivatives not converged in the step (relative change when "
+                          "halving it: " + ", ".join(f"{k} {v:.1e}" for k, v in bad.items())
+                          + "); try another --step", FisherStepWarning, stacklevel=2)
+
+    def _stencil_derivative(self, O, half=False):
+        """dO/dθ, (n_params, ...), from stencil values O (8 n_params + 1, ...)"""
+        n = len(self.fiducial)
+        s = O[1 + 4 * n * half:1 + 4 * n * (1 + half)].reshape(n, 4, *O.shape[1:])
+        h = self.h * (0.5 if half else 1.0)
+        d = np.empty((n,) + O.shape[1:])
+        for i, side in enumerate(self.sides):
+            w = STENCILS[side][1]
+            d[i] = (w[0] * O[0] + np.tensordot(w[1:], s[i], axes=1)) / (12 * h[i])
+        return d
+
+    def _step_error(self):
+        """
+        Largest relative change of d ln H/dθ and d ln D_M/dθ on the grid
+        (z > 0) between the h and h/2 stencils, per parameter
+        """
+        errors = {}
+        for O in (np.log(self._H), np.log(self._D_M[:, 1:])):
+            d1, d2 = self._stencil_derivative(O), self._stencil_derivative(O, half=True)
+            for i, name in enumerate(PARAM_NAMES):
+                size = max(np.max(np.abs(d2[i])) * self.scale[i], DERIV_ATOL)
+                err = np.max(np.abs(d1[i] - d2[i])) * self.scale[i] / size
+                errors[name] = max(errors.get(name, 0.0), float(err))
+        return errors
+
+    def observables(self, name, z):
+        """Observable at redshifts z for every stencil model, (8 n_params + 1, len(z))"""
+        z = np.atleast_1d(np.asarray(z, dtype=float))
+        if np.max(z) > self.z_max:
+            raise ValueError(f"z = {np.max(z)} beyond the engine grid (z_max = {self.z_max})")
+        idx, frac = interp_weights(z, self.z_grid)
+        H = interp_on_grid(self._H, idx, frac)
+        D_M = interp_on_grid(self._D_M, idx, frac)
+        if name == 'DV_over_rd':
+            return np.cbrt(z * D_M**2 * C_LIGHT / H) / R_D
+        if name == 'H_over_rd':
+            return H / R_D
+        if name == 'mu':
+            return 5 * np.log10((1 + z) * D_M) + 25
+        raise KeyError(f"Unknown observable {name!r}; available: {list(FRACTIONAL)}")
+
+    def derivatives(self, name, z):
+        """dO/dθ (d ln O/dθ for fractional observables), shape (len(z), n_params)"""
+        O = self.observables(name, z)
+        if FRACTIONAL[name]:
+            O = np.log(O)
+        return self._stencil_derivative(O).T
+
+    def fisher(self, spec, sn_offset=True, priors=None):
+        """
+        Fisher matrix (n_params × n_params) of a survey specification.
+
+        sn_offset: marginalize over a free SNe magnitude offset
+        priors: {parameter: Gaussian σ} added to the diagonal
+        """
+        n = len(self.fiducial)
+        F = np.zeros((n + 1, n + 1))
+        for name, (z, sigma) in spec.items():
+            z = np.atleast_1d(np.asarray(z, dtype=float))
+            # Last column: derivative with respect to the SNe offset
+            J = np.hstack([self.derivatives(name, z),
+                           np.full((len(z), 1), 1.0 if name == 'mu' else 0.0)])
+            w = 1.0 / np.broadcast_to(np.asarray(sigma, dtype=float), z.shape)**2
+            F += J.T @ (w[:, None] * J)
+
+        if sn_offset and F[n, n] > 0:
+            # Schur complement: Fisher matrix with the offset marginalized
+            F = F[:n, :n] - np.outer(F[:n, n], F[n, :n]) / F[n, n]
+        else:
+            F = F[:n, :n]
+        for name, sigma in (priors or {}).items():
+            i = PARAM_NAMES.index(name)
+            F[i, i] += 1.0 / sigma**2
+        return F
+
+    def forecast(self, spec, sn_offset=True, priors=None):
+        """
+        Forecast of a survey specification.
+
+        Returns dict with 'fisher', 'covariance', 'errors' (marginalized 1σ),
+        'conditional' (1σ with the other parameters fixed) and 'ellipses'
+        {(p1, p2): {0.68: (a, b, angle), 0.95: ...}} for every pair.
+        """
+        F = self.fisher(spec, sn_offset, priors)
+        # Invert in units of the parameter scales (m_phi ~ 1e-42 next to H0 ~ 70)
+        scale = np.outer(self.scale, self.scale)
+        vals = np.linalg.eigvalsh(F * scale)
+        if vals[0] <= SINGULAR_RTOL * vals[-1]:
+            hint = ''
+            if self.fiducial[PARAM_NAMES.index('m_phi')] == 0 and 'm_phi' not in (priors or {}):
+                hint = '; at m_phi = 0 the observables are quadratic in m_phi, so it needs a prior'
+            raise ValueError("Singular Fisher matrix: the survey does not constrain "
+                             f"every parameter (add probes or priors{hint})")
+        cov = np.linalg.inv(F * scale) * scale
+
+        n = len(self.fiducial)
+        ellipses = {}
+        for i in range(n):
+            for j in range(i + 1, n):
+                sub = cov[np.ix_([i, j], [i, j])]
+                ellipses[(PARAM_NAMES[i], PARAM_NAMES[j])] = {
+                    level: ellipse(sub, level) for level in DCHI2_2D}
+
+        return {
+            'fisher': F,
+            'covariance': cov,
+            'errors': dict(zip(PARAM_NAMES, np.sqrt(np.diag(cov)))),
+            'conditional': dict(zip(PARAM_NAMES, 1.0 / np.sqrt(np.diag(F)))),
+            'ellipses': ellipses,
+        }
+
+def forecast(spec, fiducial=FIDUCIAL, sn_offset=True, priors=None, step=STEP, abs_step=None):
+    """One-off forecast (builds a FisherEngine deep enough for spec)"""
+    z_max = max(Z_MAX_GRID, float(np.ceil(survey_z_max(spec))))
+    return FisherEngine(fiducial, z_max, step, abs_step).forecast(spec, sn_offset, priors)
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+def run(spec=None, fiducial=FIDUCIAL, sn_offset=True, priors=None, step=STEP, abs_step=None):
+    """Forecast for spec (default: bundled datasets), printed as a table"""
+    spec = bundled_survey() if spec is None else spec
+    z_max = max(Z_MAX_GRID, float(np.ceil(survey_z_max(spec))))
+
+    start = time.perf_counter()
+    engine = FisherEngine(fiducial, z_max, step, abs_step)
+    built = time.perf_counter()
+    result = engine.forecast(spec, sn_offset, priors)
+    done = time.perf_counter()
+
+    print("[FISHER] Survey: " + ", ".join(f"{name} ({len(np.atleast_1d(z))} z)"
+                                          for name, (z, _) in spec.items()))
+    print(f"[FISHER] Derivatives {1e3 * (built - start):.1f} ms "
+          f"({8 * len(engine.fiducial) + 1} models), forecast {1e3 * (done - built):.2f} ms")
+    print("[FISHER] Stencils: " + ", ".join(
+        f"{name} {side} (h = {h:.3g}, halving Δ = {engine.step_error[name]:.1e})"
+        for name, side, h in zip(PARAM_NAMES, engine.sides, engine.h)) + "\n")
+    print(f"  {'parameter':<10} {'fiducial':>12} {'σ marginal':>12} {'σ conditional':>14}")
+    for name, value in zip(PARAM_NAMES, engine.fiducial):
+        print(f"  {name:<10} {value:12.4e} {result['errors'][name]:12.4e} "
+              f"{result['conditional'][name]:14.4e}")
+
+    print("\n  68% ellipses (semi-axes a, b; angle of a):")
+    for (p1, p2), levels in result['ellipses'].items():
+        a, b, angle = levels[0.68]
+        print(f"    {p1:>8} × {p2:<8} a = {a:.4e}, b = {b:.4e}, {angle:+7.2f}°")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fisher forecast for BAO + SNe surveys')
+    parser.add_argument('--survey', default=None,
+                        help='CSV with z and sigma_DV_over_rd / sigma_H_over_rd (fractional) '
+                             '/ sigma_mu (mag) columns (default: bundled datasets)')
+    parser.add_argument('--fiducial', type=float, nargs=3, default=FIDUCIAL.tolist(),
+                        metavar=('H0', 'OMEGA_M', 'M_PHI'), help='Fiducial model')
+    parser.add_argument('--prior', nargs=2, action='append', default=[],
+                        metavar=('PARAM', 'SIGMA'), help='Gaussian prior (repeatable)')
+    parser.add_argument('--no-sn-offset', action='store_true',
+                        help='Treat the SNe magnitude offset as known (not marginalized)')
+    parser.add_argument('--step', type=float, default=STEP,
+                        help=f'Relative finite-difference step (default: {STEP})')
+    parser.add_argument('--abs-step', nargs=2, action='append', default=[],
+                        metavar=('PARAM', 'STEP'),
+                        help=f'Absolute step for a zero fiducial value (repeatable; default: {ABS_STEP})')
+    args = parser.parse_args()
+
+    run(spec=load_survey(args.survey) if args.survey else None, fiducial=args.fiducial,
+        sn_offset=not args.no_sn_offset,
+        priors={name: float(sigma) for name, sigma in args.prior}, step=args.step,
+        abs_step={name: float(h) for name, h in args.abs_step})
@@ -8,124 +8,178 @@ Principles:
   - 0: full parameter space exploration, no cherry-picking
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import pandas as pd
-from scipy.integrate import odeint
-from scipy.interpolate import interp1d
-import matplotlib.pyplot as plt
-import emcee
-import corner
+
+from chain_backend import ChainCheckpoint
+from chi2_bao import load_bao_data
+from chi2_sn import chi2_offset, load_sn_data
+from covariance import chi2_residuals
+from distances import R_D, distances_from_H, master_grid
+from runtime import lazy_import, print_import_report, pyplot, set_headless
+from telemetry import TELEMETRY, scoped
+
+# emcee, corner and matplotlib are imported on first use (runtime.py), so
+# the likelihood functions and pool workers start without them.
 
 # ============================================================================
 # COSMOLOGICAL MODEL
 # ============================================================================
 
-def H_lcdm(z, H0, Omega_m):
-    """ΛCDM Hubble parameter"""
-    Omega_Lambda = 1.0 - Omega_m
-    return H0 * np.sqrt(Omega_m * (1 + z)**3 + Omega_Lambda)
-
-def friedmann_zero_field(y, a, H0, Omega_m, m_phi):
-    """
-    Friedmann equations for Zero Field Primordial model
-    y = [phi, phi_dot, H]
-    """
-    phi, phi_dot, H = y
-    
-    # Scalar field energy density and pressure
-    rho_phi = 0.5 * phi_dot**2 + 0.5 * m_phi**2 * phi**2
-    p_phi = 0.5 * phi_dot**2 - 0.5 * m_phi**2 * phi**2
-    
-    # Matter density (dust)
-    rho_m = Omega_m * (H0**2) * (a**(-3))
-    
-    # Friedmann equation
-    H_new = np.sqrt((8 * np.pi / 3) * (rho_m + rho_phi))
-    
-    # Klein-Gordon equation
-    dphi_da = phi_dot / (a * H)
-    dphi_dot_da = -(3 * H / (a * H)) * phi_dot - (m_phi**2 * phi) / (a * H**2)
-    dH_da = -((3/2) * H / a) * (1 + (p_phi + 0) / (rho_m + rho_phi))
-    
-    return [dphi_da, dphi_dot_da, dH_da]
-
-def H_zero_field(z, H0, Omega_m, m_phi):
-    """
-    Solve Zero Field cosmology and return H(z)
-    """
-    # Initial conditions at z=0
-    a0 = 1.0
-    phi0 = 1e-10  # Small initial field value
-    phi_dot0 = 0.0
-    H_0 = H0
-    
-    # Scale factor array
-    a_array = np.linspace(1.0, 1/(1+max(z)), 100)
-    
-    try:
-        # Solve ODE
-        sol = odeint(friedmann_zero_field, [phi0, phi_dot0, H_0], a_array, 
-                     args=(H0, Omega_m, m_phi))
-        H_a = sol[:, 2]
-        
-        # Interpolate H(z)
-        z_array = 1/a_array - 1
-        H_interp = interp1d(z_array[::-1], H_a[::-1], kind='cubic', 
-                           fill_value='extrapolate')
-        return H_interp(z)
-    except:
-        # If solver fails, return ΛCDM (conservative)
-        return H_lcdm(z, H0, Omega_m)
+# H_lcdm, friedmann_zero_field and the ODE solvers live in background.py so
+# that the χ² scripts can share them without importing the sampler stack;
+# they are re-exported here, where they were originally defined.
+from background import (H_lcdm, friedmann_zero_field, H_zero_field,
+                        H_zero_field_batch)
 
 # ============================================================================
 # DATA LOADING
 # ============================================================================
 
 def load_data():
-    """Load observational data"""
-    # BAO data
-    bao = pd.read_csv('../data/bao_data.csv')
-    z_bao = bao['z'].values
-    DV_bao = bao['DV_over_rd'].values
-    sigma_DV = bao['sigma_DV_over_rd'].values
+    """Load observational data (bundled files, via the dataset registry)"""
+    # BAO data: (z, DV_over_rd, sigma_DV_over_rd)
+    bao = load_bao_data('bao')
     
-    # SNe data
-    sn = pd.read_csv('../data/sn_data.csv')
-    z_sn = sn['z'].values
-    mu_sn = sn['mu'].values
-    sigma_mu = sn['sigma_mu'].values
+    # SNe data: (z, mu_obs, mu_err)
+    sn = load_sn_data('sn')
     
-    return (z_bao, DV_bao, sigma_DV), (z_sn, mu_sn, sigma_mu)
+    return bao, sn
 
 # ============================================================================
 # CHI-SQUARED CALCULATION
 # ============================================================================
 
-def chi2_total(theta, data):
+PARAM_NAMES = ["H0", "Omega_m", "m_phi"]
+FIDUCIAL = np.array([70.0, 0.3, 1e-42])
+
+# Prior box: (lower, upper) for H0, Omega_m, m_phi
+PRIOR_BOUNDS = np.array([
+    [60.0, 80.0],
+    [0.2, 0.4],
+    [0.0, 1e-40],
+])
+
+# Model predictions of the likelihood: 'mock' (the simplified parametrized
+# forms below) or 'solver' (D_V/r_d and μ from the solved Zero Field
+# background). Solver histories are memoized in background.BACKGROUND_CACHE,
+# so BAO and SNe at the same parameter point share one solve.
+PREDICTIONS = ('mock', 'solver')
+
+def solver_distances(thetas, z):
     """
-    Total χ² for combined BAO + SNe data
-    theta = [H0, Omega_m, m_phi]
+    Distances (distances_from_H layout, one row per parameter vector) at
+    redshifts z from the cached background solutions
     """
-    H0, Omega_m, m_phi = theta
-    (z_bao, DV_bao, sigma_DV), (z_sn, mu_sn, sigma_mu) = data
-    
-    # Physical constraints
-    if H0 < 60 or H0 > 80:
-        return 1e10
-    if Omega_m < 0.2 or Omega_m > 0.4:
-        return 1e10
-    if m_phi < 0 or m_phi > 1e-40:
-        return 1e10
-    
-    # BAO chi2 (simplified)
+    z_grid = master_grid(np.max(z))
+    H_grid = H_zero_field_batch(z_grid, thetas[:, 0], thetas[:, 1], thetas[:, 2])
+    return distances_from_H(z, z_grid, H_grid)
+
+def _check_predictions(predictions):
+    if predictions not in PREDICTIONS:
+        raise ValueError(f"Unknown predictions {predictions!r} (expected one of {PREDICTIONS})")
+
+def chi2_bao_batch(thetas, bao, predictions='mock'):
+    """BAO χ² (simplified unless predictions='solver') for an array (N, 3) of parameter vectors"""
+    _check_predictions(predictions)
+    thetas = np.atleast_2d(thetas)
+    z_bao, DV_bao, sigma_DV = bao
+    if predictions == 'solver':
+        DV_model_bao = solver_distances(thetas, z_bao)['D_V'] / R_D
+        return chi2_residuals(DV_bao - DV_model_bao, sigma_DV)
     DV_model_bao = 0.35 * (1 + 0.05 * z_bao)  # Mock for now
-    chi2_bao = np.sum(((DV_bao - DV_model_bao) / sigma_DV)**2)
+    return np.full(len(thetas), chi2_residuals(DV_bao - DV_model_bao, sigma_DV))
+
+def chi2_sn_batch(thetas, sn, offset=None, predictions='mock'):
+    """
+    SNe χ² (simplified unless predictions='solver'), residuals broadcast as
+    (N, N_sn); with a CholeskyCovariance all N residual vectors share one
+    triangular solve.
+    offset='marginalize' / 'profile' removes the μ offset (M, H0) analytically.
+    """
+    _check_predictions(predictions)
+    thetas = np.atleast_2d(thetas)
+    H0 = thetas[:, 0]
+    z_sn, mu_sn, sigma_mu = sn
+    if predictions == 'solver':
+        mu_model_sn = solver_distances(thetas, z_sn)['mu']
+    else:
+        mu_model_sn = 5 * np.log10((1+z_sn) * 3000 / H0[:, None]) + 25  # Simplified
+    if offset is not None:
+        return chi2_offset(mu_sn - mu_model_sn, sigma_mu, offset)
+    return chi2_residuals(mu_sn - mu_model_sn, sigma_mu)
+
+def chi2_total_batch(thetas, data, sn_offset=None, predictions='mock'):
+    """
+    Total χ² for combined BAO + SNe data, vectorized over parameter vectors
+    thetas = array (nwalkers, 3) of [H0, Omega_m, m_phi]
+    data = (bao, sn); bao may be None for SN-only runs
+    predictions: 'mock' or 'solver' model predictions (see PREDICTIONS)
+    """
+    thetas = np.atleast_2d(thetas)
+    bao, sn = data
     
-    # SNe chi2 (simplified)
-    mu_model_sn = 5 * np.log10((1+z_sn) * 3000 / H0) + 25  # Simplified
-    chi2_sn = np.sum(((mu_sn - mu_model_sn) / sigma_mu)**2)
+    # Physical constraints (closed box)
+    inside = np.all((thetas >= PRIOR_BOUNDS[:, 0]) & (thetas <= PRIOR_BOUNDS[:, 1]), axis=1)
     
-    return chi2_bao + chi2_sn
+    # Per-probe timing (one observation per batch call)
+    chi2_bao = 0.0
+    if bao is not None:
+        with TELEMETRY.timer('chi2.bao'):
+            chi2_bao = chi2_bao_batch(thetas, bao, predictions)
+    with TELEMETRY.timer('chi2.sn'):
+        chi2_sn = chi2_sn_batch(thetas, sn, sn_offset, predictions)
+    return np.where(inside, chi2_bao + chi2_sn, 1e10)
+
+def log_likelihood_batch(thetas, data, sn_offset=None, predictions='mock'):
+    """Log likelihood for an array of parameter vectors"""
+    return -0.5 * chi2_total_batch(thetas, data, sn_offset, predictions)
+
+def log_prior_batch(thetas):
+    """Log prior (uniform within bounds) applied as a mask"""
+    thetas = np.atleast_2d(thetas)
+    inside = np.all((thetas > PRIOR_BOUNDS[:, 0]) & (thetas < PRIOR_BOUNDS[:, 1]), axis=1)
+    return np.where(inside, 0.0, -np.inf)
+
+def expand_fixed(thetas, fixed=None):
+    """
+    Full (N, 3) parameter vectors from the sampled columns.
+
+    fixed: {name: value} of parameters held constant (not sampled); thetas
+    then only holds the free parameters, in PARAM_NAMES order.
+    """
+    thetas = np.atleast_2d(thetas)
+    if not fixed:
+        return thetas
+    full = np.tile(FIDUCIAL, (len(thetas), 1))
+    free = [i for i, name in enumerate(PARAM_NAMES) if name not in fixed]
+    full[:, free] = thetas
+    for name, value in fixed.items():
+        full[:, PARAM_NAMES.index(name)] = value
+    return full
+
+def log_probability_batch(thetas, data, sn_offset=None, fixed=None, predictions='mock'):
+    """
+    Log probability for emcee's vectorize=True mode
+    thetas = array (nwalkers, n_free); returns array (nwalkers,)
+    """
+    thetas = expand_fixed(thetas, fixed)
+    TELEMETRY.count('likelihood.evals', len(thetas))
+    with TELEMETRY.timer('likelihood.wall'):
+        lp = log_prior_batch(thetas)
+        ok = np.isfinite(lp)
+        if np.any(ok):
+            lp[ok] += log_likelihood_batch(thetas[ok], data, sn_offset, predictions)
+    return lp
+
+def chi2_total(theta, data):
+    """
+    Total χ² for combined BAO + SNe data
+    theta = [H0, Omega_m, m_phi]
+    """
+    return chi2_total_batch(theta, data)[0]
 
 def log_likelihood(theta, data):
     """Log likelihood"""
@@ -133,41 +187,223 @@ def log_likelihood(theta, data):
 
 def log_prior(theta):
     """Log prior (uniform within bounds)"""
-    H0, Omega_m, m_phi = theta
-    if 60 < H0 < 80 and 0.2 < Omega_m < 0.4 and 0 < m_phi < 1e-40:
-        return 0.0
-    return -np.inf
+    return log_prior_batch(theta)[0]
 
-def log_probability(theta, data):
+def log_probability(theta, data, sn_offset=None, fixed=None, predictions='mock'):
     """Log probability = log prior + log likelihood"""
-    lp = log_prior(theta)
-    if not np.isfinite(lp):
-        return -np.inf
-    return lp + log_likelihood(theta, data)
+    return log_probability_batch(theta, data, sn_offset, fixed, predictions)[0]
 
 # ============================================================================
 # MCMC SAMPLING
 # ============================================================================
 
-def run_mcmc(data, nwalkers=32, nsteps=5000):
+# Observational data and likelihood options (sn_offset, fixed, predictions)
+# of a pool worker, set once by _init_worker so that they are not pickled
+# along with every likelihood call.
+_WORKER_DATA = None
+_WORKER_OPTIONS = {}
+
+def _init_worker(data, options=None):
+    """Process-pool initializer: keep the data resident in the worker"""
+    global _WORKER_DATA, _WORKER_OPTIONS
+    _WORKER_DATA = data
+    _WORKER_OPTIONS = options or {}
+
+def _worker_log_probability(theta):
+    """
+    log_probability evaluated against the worker-resident data.
+    Returns (log_prob, telemetry snapshot of this call), see _TelemetryPool.
+    """
+    with scoped() as scope:
+        lp = log_probability(theta, _WORKER_DATA, **_WORKER_OPTIONS)
+    return lp, scope.snapshot()
+
+def _worker_log_probability_batch(thetas):
+    """
+    log_probability_batch evaluated against the worker-resident data.
+    Returns (log_prob, telemetry snapshot of this call) so that the parent
+    can merge the solver and χ² timings of its workers.
+    """
+    with scoped() as scope:
+        lp = log_probability_batch(thetas, _WORKER_DATA, **_WORKER_OPTIONS)
+    return lp, scope.snapshot()
+
+class _TelemetryPool:
+    """
+    Pool handed to emcee in per-walker mode: maps over the process pool and
+    merges the telemetry snapshot returned with every log-probability, so
+    that emcee only sees the values.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def map(self, fn, iterable):
+        with TELEMETRY.timer('mcmc.pool_dispatch'):
+            results = list(self.pool.map(fn, iterable))
+        for _, snapshot in results:
+            TELEMETRY.merge(snapshot)
+        return [lp for lp, _ in results]
+
+# Convergence criterion (emcee autocorrelation recipe)
+CONVERGENCE_CHECK_EVERY = 100  # steps between τ estimates without checkpoint
+N_TAU = 50                     # chain must be longer than N_TAU × τ
+TAU_RTOL = 0.01                # and τ must change by less than 1% between checks
+
+def autocorr_converged(sampler, tau_prev, n_tau=N_TAU, rtol=TAU_RTOL):
+    """
+    Estimate the integrated autocorrelation time per parameter and decide
+    whether the chain is converged: longer than n_tau × τ and τ stable
+    to within rtol since the previous estimate.
+    
+    Returns (converged, tau).
+    """
+    tau = sampler.get_autocorr_time(tol=0)
+    if not np.all(np.isfinite(tau)):
+        return False, tau
+    converged = np.all(tau * n_tau < sampler.iteration)
+    converged &= np.all(np.abs(tau_prev - tau) / tau < rtol)
+    return bool(converged), tau
+
+def burnin_and_thin(sampler):
+    """Burn-in (2 max τ) and thinning (τ_min / 2) derived from autocorrelation"""
+    tau = sampler.get_autocorr_time(tol=0)
+    if not np.all(np.isfinite(tau)):
+        return 0, 1
+    return int(2 * np.max(tau)), max(1, int(0.5 * np.min(tau)))
+
+def _run_phase(sampler, state, nsteps, checkpoint, phase, converge=False, n_tau=N_TAU):
+    """
+    Advance the sampler nsteps, writing a checkpoint chunk every K steps.
+    
+    With converge=True, nsteps is an upper bound: τ is re-estimated after
+    every chunk and sampling stops as soon as autocorr_converged() holds.
+    """
+    if checkpoint is None and not converge:
+        return sampler.run_mcmc(state, nsteps) if nsteps > 0 else state
+    every = checkpoint.every if checkpoint is not None else CONVERGENCE_CHECK_EVERY
+    tau_prev = np.inf
+    done = 0
+    while done < nsteps:
+        k = min(every, nsteps - done)
+        state = sampler.run_mcmc(state, k)
+        if checkpoint is not None:
+            checkpoint.append(phase, sampler.get_chain()[-k:], sampler.get_log_prob()[-k:],
+                              sampler.backend.accepted, state)
+        done += k
+        if converge:
+            converged, tau_prev = autocorr_converged(sampler, tau_prev, n_tau)
+            print(f"[MCMC] step {sampler.iteration}: tau = {np.round(tau_prev, 1)}")
+            if converged:
+                print(f"[MCMC] Converged after {sampler.iteration} steps "
+                      f"(> {n_tau} tau, tau stable)")
+                break
+    return state
+
+# Burn-in steps from the fiducial ball / from walkers seeded at the best fit
+NBURN = 500
+NBURN_SEEDED = 100
+
+def run_mcmc(data, nwalkers=32, nsteps=5000, vectorize=True, workers=1,
+             nburn=NBURN, checkpoint=None, resume=False, converge=False, n_tau=N_TAU,
+             sn_offset=None, fixed=None, start=None, predictions='mock', seed=None):
     """
     Run MCMC sampling
+    
+    With vectorize=True the sampler evaluates all walkers of a step in a
+    single log_probability_batch call instead of one call per walker.
+    
+    With workers > 1 likelihood evaluations run in a process pool whose
+    workers receive the data once at start-up. In vectorized mode each
+    step's walkers are split into one chunk per worker.
+    
+    With a ChainCheckpoint the chain is appended to disk every
+    checkpoint.every steps; resume=True continues from the recorded state
+    (burn-in or production) instead of starting over.
+    
+    With converge=True, nsteps is only a cap: production stops once the
+    chain is n_tau autocorrelation times long and τ has stabilized.
+    
+    sn_offset ('marginalize' / 'profile') removes the SNe μ offset in
+    closed form; fixed={name: value} drops parameters from the sampled
+    space (the chain then only has the free columns, in PARAM_NAMES order).
+    predictions='solver' evaluates the probes on the solved background
+    (see PREDICTIONS) instead of the simplified mock predictions.
+    
+    start: initial walker positions (nwalkers, n_free), e.g. from
+    bestfit.seed_walkers(); default is a small ball around FIDUCIAL.
+    seed: seeds the initial ball and the sampler's RNG (reproducible runs).
     """
-    ndim = 3  # H0, Omega_m, m_phi
+    free = [i for i, name in enumerate(PARAM_NAMES) if name not in (fixed or {})]
+    ndim = len(free)
+    options = {'sn_offset': sn_offset, 'fixed': fixed, 'predictions': predictions}
+    rng = np.random if seed is None else np.random.RandomState(seed)
+    
+    if start is not None:
+        pos = np.array(start, dtype=float)
+    else:
+        # Initial positions (centered around fiducial values)
+        # (relative ball, so that m_phi ~ 1e-42 is not pushed out of the prior)
+        pos = FIDUCIAL[free] * (1 + 1e-4 * rng.randn(nwalkers, ndim))
+    
+    emcee = lazy_import('emcee')
     
-    # Initial positions (centered around fiducial values)
-    pos = np.array([70.0, 0.3, 1e-42]) + 1e-4 * np.random.randn(nwalkers, ndim)
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(data, options))
+        print(f"[MCMC] Process pool with {workers} workers")
     
     # Setup sampler
-    sampler = emcee.EnsembleSampler(nwalkers, ndim, log_probability, args=[data])
+    if vectorize and pool is not None:
+        def log_prob_fn(thetas):
+            chunks = np.array_split(thetas, min(workers, len(thetas)))
+            with TELEMETRY.timer('mcmc.pool_dispatch'):
+                results = list(pool.map(_worker_log_probability_batch, chunks))
+            for _, snapshot in results:
+                TELEMETRY.merge(snapshot)
+            return np.concatenate([lp for lp, _ in results])
+        sampler = emcee.EnsembleSampler(nwalkers, ndim, log_prob_fn, vectorize=True)
+    elif vectorize:
+        sampler = emcee.EnsembleSampler(nwalkers, ndim, log_probability_batch,
+                                        args=[data], kwargs=options, vectorize=True)
+    elif pool is not None:
+        sampler = emcee.EnsembleSampler(nwalkers, ndim, _worker_log_probability,
+                                        pool=_TelemetryPool(pool))
+    else:
+        sampler = emcee.EnsembleSampler(nwalkers, ndim, log_probability, args=[data],
+                                        kwargs=options)
+    if seed is not None:
+        sampler.random_state = rng.get_state()
     
-    # Run MCMC
-    print("[MCMC] Starting burn-in...")
-    pos, _, _ = sampler.run_mcmc(pos, 500)
-    sampler.reset()
+    done = {'burnin': 0, 'production': 0}
+    if checkpoint is not None:
+        if resume and checkpoint.exists():
+            done = checkpoint.steps()
+            state = checkpoint.last_state()
+            if state.coords.shape != pos.shape:
+                raise ValueError(f"Checkpoint has walkers of shape {state.coords.shape}, "
+                                 f"expected {pos.shape}")
+            pos = state
+            print(f"[MCMC] Resuming: {done['burnin']} burn-in + "
+                  f"{done['production']} production steps on disk")
+        else:
+            checkpoint.clear()
     
-    print("[MCMC] Running production...")
-    sampler.run_mcmc(pos, nsteps)
+    try:
+        # Run MCMC
+        print("[MCMC] Starting burn-in...")
+        pos = _run_phase(sampler, pos, nburn - done['burnin'], checkpoint, 'burnin')
+        sampler.reset()
+        
+        print("[MCMC] Running production...")
+        if done['production'] > 0:
+            checkpoint.restore_backend(sampler.backend, 'production')
+        _run_phase(sampler, pos, nsteps - done['production'], checkpoint, 'production',
+                   converge=converge, n_tau=n_tau)
+    finally:
+        if pool is not None:
+            pool.shutdown()
     
     return sampler
 
@@ -175,14 +411,16 @@ def run_mcmc(data, nwalkers=32, nsteps=5000):
 # ANALYSIS AND VISUALIZATION
 # ============================================================================
 
-def analyze_chains(sampler):
+def analyze_chains(sampler, discard=0, thin=1, fixed=None):
     """
-    Analyze MCMC chains
+    Analyze MCMC chains (sampler or emcee backend)
+    fixed: parameters held constant in the run (absent from the chain)
     """
-    samples = sampler.get_chain(flat=True)
+    samples = sampler.get_chain(flat=True, discard=discard, thin=thin)
     
     # Parameter names
-    labels = ["H0", "Omega_m", "m_phi"]
+    free = [i for i, name in enumerate(PARAM_NAMES) if name not in (fixed or {})]
+    labels = [PARAM_NAMES[i] for i in free]
     
     # Summary statistics
     for i, label in enumerate(labels):
@@ -191,10 +429,13 @@ def analyze_chains(sampler):
         print(f"{label} = {mcmc[1]:.5e} +{q[1]:.5e} -{q[0]:.5e}")
     
     # Corner plot
+    corner = lazy_import('corner')
+    plt = pyplot()
     fig = corner.corner(samples, labels=labels, 
-                       truths=[70.0, 0.3, 1e-42],
+                       truths=FIDUCIAL[free],
                        show_titles=True, title_fmt=".5e")
-    plt.savefig('corner_plot.png', dpi=300, bbox_inches='tight')
+    fig.savefig('corner_plot.png', dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print("[MCMC] Corner plot saved to corner_plot.png")
     
     return samples
@@ -203,28 +444,159 @@ def analyze_chains(sampler):
 # MAIN EXECUTION
 # ============================================================================
 
-if __name__ == "__main__":
+def parse_args():
+    """Command-line options (used by run_complete_analysis.py)"""
+    parser = argparse.ArgumentParser(description='MCMC exploration for Zero Field Primordial')
+    parser.add_argument('--nwalkers', type=int, default=32, help='Number of walkers (default: 32)')
+    parser.add_argument('--nsteps', type=int, default=2000, help='Production steps (default: 2000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Likelihood worker processes (default: 1, serial)')
+    parser.add_argument('--converge', action='store_true',
+                        help='Stop early once the chain is N_TAU autocorrelation times long '
+                             '(--nsteps becomes a cap); burn-in/thinning derived from tau')
+    parser.add_argument('--n-tau', type=int, default=N_TAU,
+                        help=f'Chain length in units of tau required to stop (default: {N_TAU})')
+    parser.add_argument('--checkpoint', default=None,
+                        help='Directory for on-disk chain checkpoints (default: none)')
+    parser.add_argument('--checkpoint-every', type=int, default=100,
+                        help='Steps between checkpoint chunks (default: 100)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the run recorded in --checkpoint')
+    parser.add_argument('--analyze-only', action='store_true',
+                        help='Analyze the (possibly partial) chain in --checkpoint without sampling')
+    parser.add_argument('--sn-offset', choices=['marginalize', 'profile'], default=None,
+                        help='Remove the SNe mu offset (M / H0) analytically in the chi2')
+    parser.add_argument('--predictions', choices=PREDICTIONS, default='mock',
+                        help='Model predictions of the likelihood: simplified mocks or D_V/r_d '
+                             'and mu from the (cached) background solver (default: mock)')
+    parser.add_argument('--sn-only', action='store_true',
+                        help='SNe-only likelihood; with --sn-offset, H0 is degenerate and not sampled')
+    parser.add_argument('--bestfit', action='store_true',
+                        help='Seed the walkers at the multi-start best fit (bestfit.py) '
+                             f'and shorten the burn-in to {NBURN_SEEDED} steps')
+    parser.add_argument('--grid', default=None,
+                        help='Seed the walkers at the minimum of a chi2_grid.py table (this '
+                             f'directory) and shorten the burn-in to {NBURN_SEEDED} steps')
+    parser.add_argument('--telemetry', default=None,
+                        help='Write solver/likelihood telemetry to this JSON file at the end')
+    parser.add_argument('--headless', action='store_true',
+                        help='Non-interactive matplotlib backend (batch jobs)')
+    parser.add_argument('--import-report', action='store_true',
+                        help='Print the time spent importing heavy modules at the end')
+    return parser.parse_args()
+
+def run(data=None, nwalkers=32, nsteps=2000, workers=1, converge=False, n_tau=N_TAU,
+        checkpoint=None, checkpoint_every=100, resume=False, analyze_only=False,
+        sn_offset=None, sn_only=False, bestfit=None, predictions='mock', grid=None):
+    """
+    MCMC stage of the pipeline.
+    
+    data: observational data in the load_data() layout (default: load_data())
+    checkpoint: directory for on-disk chain checkpoints (None: in memory only)
+    sn_offset: 'marginalize' / 'profile' the SNe μ offset in closed form
+    sn_only: drop BAO; combined with sn_offset, H0 (degenerate with the
+             offset) is fixed and the sampled space loses one dimension
+    predictions: 'mock' or 'solver' model predictions (see PREDICTIONS)
+    grid: chi2_grid.py output directory; seeds the walkers at the grid
+          minimum (ignored when bestfit is given)
+    
+    Returns dict with the flat samples, per-parameter percentiles
+    (16, 50, 84), production steps, and the discard/thin applied.
+    """
     print("="*70)
     print("MCMC Parameter Exploration — Zero Field Primordial")
     print("Chave: Clear priors, no hidden assumptions")
     print("0: Full exploration, no cherry-picking")
     print("="*70)
     
-    # Load data
-    print("\n[1] Loading observational data...")
-    data = load_data()
+    if checkpoint is not None:
+        checkpoint = ChainCheckpoint(checkpoint, every=checkpoint_every)
     
-    # Run MCMC
-    print("\n[2] Running MCMC exploration...")
-    sampler = run_mcmc(data, nwalkers=32, nsteps=2000)
+    fixed = {'H0': FIDUCIAL[0]} if sn_only and sn_offset else None
+    if fixed:
+        print(f"[MCMC] SNe-only with {sn_offset}d mu offset: H0 fixed, sampling Omega_m, m_phi")
+    
+    if analyze_only:
+        # Reuse the chain on disk (possibly from an interrupted run)
+        print("\n[1-2] Loading chain from checkpoint...")
+        sampler = checkpoint.to_backend('production') if checkpoint else None
+        if sampler is None:
+            raise RuntimeError("[MCMC] No production chain found in checkpoint")
+        print(f"[MCMC] {sampler.iteration} production steps loaded")
+    else:
+        # Load data
+        print("\n[1] Loading observational data...")
+        if data is None:
+            data = load_data()
+        if sn_only:
+            data = (None, data[1])
+        
+        start, nburn = None, NBURN
+        if bestfit is not None:
+            import bestfit as bf  # imports this module
+            if bestfit is True:
+                print("\n[1b] Multi-start best fit...")
+                bestfit = bf.fit(data, models={'zfp': fixed or {}}, workers=workers,
+                                 sn_offset=sn_offset, predictions=predictions)['zfp']
+            sampled = [name for name in PARAM_NAMES if name not in (fixed or {})]
+            start = bf.seed_walkers(bestfit, nwalkers, sampled)
+            nburn = NBURN_SEEDED
+            print(f"[MCMC] Walkers seeded at the best fit (chi2 = {bestfit['chi2']:.3f}), "
+                  f"burn-in {nburn} steps")
+        elif grid is not None:
+            from chi2_grid import Chi2Grid  # imports this module
+            grid = Chi2Grid(grid)
+            free = [i for i, name in enumerate(PARAM_NAMES) if name not in (fixed or {})]
+            start = grid.initial_walkers(nwalkers)[:, free]
+            nburn = NBURN_SEEDED
+            print(f"[MCMC] Walkers seeded at the chi2 grid minimum "
+                  f"(chi2 = {grid.best_fit()[1]:.3f}), burn-in {nburn} steps")
+        
+        # Run MCMC
+        print("\n[2] Running MCMC exploration...")
+        sampler = run_mcmc(data, nwalkers=nwalkers, nsteps=nsteps,
+                           workers=workers, nburn=nburn, checkpoint=checkpoint,
+                           resume=resume, converge=converge, n_tau=n_tau,
+                           sn_offset=sn_offset, fixed=fixed, start=start,
+                           predictions=predictions)
     
     # Analyze results
     print("\n[3] Analyzing chains...")
-    samples = analyze_chains(sampler)
+    discard, thin = burnin_and_thin(sampler) if converge else (0, 1)
+    if converge:
+        print(f"[MCMC] Discarding {discard} steps, thinning by {thin} (from tau)")
+    samples = analyze_chains(sampler, discard=discard, thin=thin, fixed=fixed)
     
-    # Save chains
+    # Save chains (fixed parameters filled in, so the layout is always H0, Omega_m, m_phi)
     print("\n[4] Saving chains...")
+    sampled = [name for name in PARAM_NAMES if name not in (fixed or {})]
+    samples = expand_fixed(samples, fixed)
     np.save('mcmc_chains.npy', samples)
     
     print("\n[COMPLETE] MCMC exploration complete.")
     print("Results: mcmc_chains.npy, corner_plot.png")
+    
+    return {
+        'samples': samples,
+        'summary': {label: np.percentile(samples[:, PARAM_NAMES.index(label)], [16, 50, 84]).tolist()
+                    for label in sampled},
+        'n_steps': int(sampler.iteration),
+        'discard': discard,
+        'thin': thin,
+    }
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.headless:
+        set_headless()
+    run(nwalkers=args.nwalkers, nsteps=args.nsteps, workers=args.workers,
+        converge=args.converge, n_tau=args.n_tau, checkpoint=args.checkpoint,
+        checkpoint_every=args.checkpoint_every, resume=args.resume,
+        analyze_only=args.analyze_only, sn_offset=args.sn_offset, sn_only=args.sn_only,
+        bestfit=True if args.bestfit else None, predictions=args.predictions,
+        grid=args.grid)
+    if args.telemetry:
+        TELEMETRY.export_json(args.telemetry)
+        print(f"Telemetry: {args.telemetry}")
+    if args.import_report:
+        print_import_report()
@@ -0,0 +1,188 @@
+"""mock_catalogs.py: Synthetic SNe Ia and BAO catalogs for scaling tests
+
+Draws mock datasets of arbitrary size from a fiducial cosmology (ΛCDM or
+Zero Field Primordial) using the same model functions the χ² stages
+compare against, and writes them in the schema of data/:
+
+  sn_data.csv    z, mu_obs, mu_err
+  bao_data.csv   z, DV_over_rd, sigma_DV_over_rd, H_over_rd, sigma_H_over_rd
+
+Redshifts follow a survey-like distribution: SNe by comoving volume
+× time dilation × a smooth detection efficiency, BAO at the effective
+redshifts of equal-width tracer bins. With covariance=True the noise is
+drawn from a full covariance (diagonal errors + a redshift-correlated
+systematic), saved alongside as sn_cov.npy / bao_cov.npy.
+
+Usage:
+  python mock_catalogs.py --n-sn 100000 --n-bao 200 --fiducial lcdm --output mocks
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+import chi2_bao
+import chi2_sn
+from background import H_lcdm, H_zero_field
+from distances import master_grid, comoving_distance_grid
+from runtime import lazy_import
+
+FIDUCIALS = {
+    'lcdm': {'H0': 70.0, 'Omega_m': 0.3, 'm_phi': 0.0},
+    'zfp': {'H0': 70.0, 'Omega_m': 0.3, 'm_phi': 1e-42},
+}
+
+# Survey-like redshift ranges and noise levels
+SN_Z_RANGE = (0.01, 1.4)
+SN_Z50 = 0.8          # redshift of 50% detection efficiency
+SN_Z_WIDTH = 0.15     # width of the efficiency fall-off
+SN_SIGMA_INT = 0.10   # intrinsic scatter [mag]
+SN_SIGMA_SYS = 0.02   # coherent systematic [mag]
+BAO_Z_RANGE = (0.1, 2.4)
+BAO_REL_ERR_DV = 0.015
+BAO_REL_ERR_H = 0.03
+SYS_CORR_LENGTH = 0.1  # redshift correlation length of the systematic
+
+MAX_COV_POINTS = 20000  # dense covariance beyond this is several GB
+
+# ============================================================================
+# REDSHIFT DISTRIBUTIONS
+# ============================================================================
+
+def sn_redshifts(n, rng, z_range=SN_Z_RANGE, Omega_m=0.3):
+    """
+    SN redshifts drawn from p(z) ∝ dV_c/dz / (1+z) × efficiency(z)
+
+    (volumetric rate in the observer frame with a logistic magnitude-limit
+    fall-off around SN_Z50), by inverse transform on a fine grid.
+    """
+    z_grid = master_grid(z_range[1])
+    E = H_lcdm(z_grid, 1.0, Omega_m)
+    D_C = comoving_distance_grid(z_grid, E)
+    efficiency = 1 / (1 + np.exp((z_grid - SN_Z50) / SN_Z_WIDTH))
+    pdf = D_C**2 / E / (1 + z_grid) * efficiency * (z_grid >= z_range[0])
+    cdf = np.cumsum(pdf)
+    cdf /= cdf[-1]
+    return np.sort(np.interp(rng.random(n), cdf, z_grid))
+
+def bao_redshifts(n, rng, z_range=BAO_Z_RANGE):
+    """Effective redshifts of n equal-width tracer bins (jittered within 10% of a bin)"""
+    edges = np.linspace(*z_range, n + 1)
+    centers = 0.5 * (edges[1:] + edges[:-1])
+    return centers + 0.1 * (edges[1] - edges[0]) * (rng.random(n) - 0.5)
+
+# ============================================================================
+# NOISE
+# ============================================================================
+
+def systematics_covariance(z, sigma, sigma_sys, length=SYS_CORR_LENGTH):
+    """C_ij = δ_ij σ_i² + σ_sys,i σ_sys,j exp(-|z_i - z_j| / length)"""
+    if len(z) > MAX_COV_POINTS:
+        raise ValueError(f"Full covariance limited to {MAX_COV_POINTS} points, got {len(z)}")
+    s = np.broadcast_to(sigma_sys, z.shape)
+    return np.diag(sigma**2) + np.outer(s, s) * np.exp(-np.abs(z[:, None] - z[None, :]) / length)
+
+def draw_noise(rng, sigma, cov=None):
+    """Gaussian noise with diagonal errors sigma or full covariance cov"""
+    if cov is None:
+        return sigma * rng.standard_normal(len(sigma))
+    return np.linalg.cholesky(cov) @ rng.standard_normal(len(cov))
+
+# ============================================================================
+# CATALOGS
+# ============================================================================
+
+def mock_sn(n, fiducial='lcdm', seed=None, covariance=False, **params):
+    """
+    Mock SNe Ia catalog.
+
+    Returns (DataFrame with z, mu_obs, mu_err; covariance or None).
+    params override the fiducial H0, Omega_m, m_phi.
+    """
+    p = dict(FIDUCIALS[fiducial], **params)
+    rng = np.random.default_rng(seed)
+    z = sn_redshifts(n, rng, Omega_m=p['Omega_m'])
+
+    if fiducial == 'lcdm':
+        mu = chi2_sn.mu_lcdm(z, p['H0'], p['Omega_m'])
+    else:
+        mu = chi2_sn.mu_zfp(z, p['H0'], p['Omega_m'], p['m_phi'])
+
+    # Intrinsic scatter + photometric error growing with distance
+    mu_err = np.sqrt(SN_SIGMA_INT**2 + (0.05 * (1 + z)**2)**2)
+    cov = systematics_covariance(z, mu_err, SN_SIGMA_SYS) if covariance else None
+    mu_obs = mu + draw_noise(rng, mu_err, cov)
+
+    pd = lazy_import('pandas')
+    return pd.DataFrame({'z': z, 'mu_obs': mu_obs, 'mu_err': mu_err}), cov
+
+def mock_bao(n, fiducial='lcdm', seed=None, covariance=False, **params):
+    """
+    Mock BAO catalog in the bao_data.csv schema.
+
+    Returns (DataFrame, covariance of DV_over_rd or None).
+    """
+    p = dict(FIDUCIALS[fiducial], **params)
+    rng = np.random.default_rng(seed)
+    z = bao_redshifts(n, rng)
+
+    if fiducial == 'lcdm':
+        DV = chi2_bao.DV_lcdm(z)
+        H = H_lcdm(z, p['H0'], p['Omega_m'])
+    else:
+        DV = chi2_bao.DV_zero_field(z, p['m_phi'])
+        H = H_zero_field(z, p['H0'], p['Omega_m'], p['m_phi'])
+
+    sigma_DV = BAO_REL_ERR_DV * DV
+    sigma_H = BAO_REL_ERR_H * H
+    cov = systematics_covariance(z, sigma_DV, 0.3 * sigma_DV) if covariance else None
+
+    pd = lazy_import('pandas')
+    return pd.DataFrame({
+        'z': z,
+        'DV_over_rd': DV + draw_noise(rng, sigma_DV, cov),
+        'sigma_DV_over_rd': sigma_DV,
+        'H_over_rd': H + draw_noise(rng, sigma_H),
+        'sigma_H_over_rd': sigma_H,
+    }), cov
+
+def write_catalogs(output, n_sn, n_bao, fiducial='lcdm', seed=0, covariance=False, **params):
+    """Write sn_data.csv / bao_data.csv (and *_cov.npy) into directory output"""
+    os.makedirs(output, exist_ok=True)
+    paths = []
+    for name, mock, n, sub_seed in [('sn', mock_sn, n_sn, seed), ('bao', mock_bao, n_bao, seed + 1)]:
+        if n <= 0:
+            continue
+        df, cov = mock(n, fiducial, seed=sub_seed, covariance=covariance, **params)
+        paths.append(os.path.join(output, f'{name}_data.csv'))
+        df.to_csv(paths[-1], index=False, float_format='%.8g')
+        if cov is not None:
+            paths.append(os.path.join(output, f'{name}_cov.npy'))
+            np.save(paths[-1], cov)
+    return paths
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate mock SNe/BAO catalogs')
+    parser.add_argument('--n-sn', type=int, default=10000, help='Supernovae (default: 10000)')
+    parser.add_argument('--n-bao', type=int, default=100, help='BAO points (default: 100)')
+    parser.add_argument('--fiducial', choices=sorted(FIDUCIALS), default='lcdm',
+                        help='Fiducial cosmology (default: lcdm)')
+    parser.add_argument('--H0', type=float, default=None)
+    parser.add_argument('--Omega-m', type=float, default=None)
+    parser.add_argument('--m-phi', type=float, default=None)
+    parser.add_argument('--covariance', action='store_true',
+                        help=f'Correlated noise + *_cov.npy (up to {MAX_COV_POINTS} points)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='mocks', help='Output directory (default: mocks)')
+    args = parser.parse_args()
+
+    params = {k: v for k, v in [('H0', args.H0), ('Omega_m', args.Omega_m),
+                                ('m_phi', args.m_phi)] if v is not None}
+    for path in write_catalogs(args.output, args.n_sn, args.n_bao, args.fiducial,
+                               seed=args.seed, covariance=args.covariance, **params):
+        print(f"  {path}")
@@ -7,13 +7,18 @@ Outputs:
   - 2D likelihood contours (H0 vs Omega_m, H0 vs m_phi, Omega_m vs m_phi)
   - 1D posterior distributions with mean and 68% confidence intervals
   - Comparison plots: ZFP vs ΛCDM
+
+Densities come from a binned FFT KDE (binned_kde.py): the samples are
+histogrammed once per parameter pair and the 1D panels reuse those grids,
+so plotting cost barely depends on chain length.
 """
 
+import argparse
+
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.gridspec import GridSpec
-import pandas as pd
+
+from binned_kde import BinnedKDE, hpd_interval, hpd_levels
+from runtime import lazy_import, pyplot, set_headless, show
 
 # ============================================================================
 # COSMOLOGICAL MODELS & DATA GENERATION
@@ -46,7 +51,8 @@ def generate_mock_constraints():
 
 def compute_credible_intervals(samples_1d, conf=0.68):
     """
-    Compute credible interval for 1D distribution
+    Compute credible interval for 1D distribution (equal-tailed, from the
+    sorted samples; the plots shade the HPD interval of the KDE instead)
     """
     sorted_samples = np.sort(samples_1d)
     n = len(sorted_samples)
@@ -72,34 +78,27 @@ def compute_credible_intervals(samples_1d, conf=0.68):
 # ============================================================================
 
 def plot_2d_contours(ax, samples, xlabel, ylabel, x_col, y_col, 
-                     title=None, levels=[68, 95]):
+                     title=None, levels=[68, 95], kde=None):
     """
-    Plot 2D likelihood contours using kernel density estimation
-    """
-    from scipy.stats import gaussian_kde
-    
-    x = samples[:, x_col]
-    y = samples[:, y_col]
+    Plot 2D highest-posterior-density contours (binned FFT KDE)
     
-    # Create grid
-    xmin, xmax = x.min(), x.max()
-    ymin, ymax = y.min(), y.max()
-    xx, yy = np.mgrid[
-        xmin:xmax:100j,
-        ymin:ymax:100j
-    ]
+    kde: BinnedKDE of samples, shared between panels (default: built here)
+    """
+    if kde is None:
+        kde = BinnedKDE(samples)
+    x, y, f = kde.density2d(x_col, y_col)
     
-    # Compute KDE
-    positions = np.vstack([xx.ravel(), yy.ravel()])
-    kernel = gaussian_kde(np.vstack([x, y]))
-    f = np.reshape(kernel(positions).T, xx.shape)
+    # Density thresholds of the credible regions, outermost first
+    fractions = np.sort(levels)[::-1] / 100.0
+    thresholds = np.append(hpd_levels(f, fractions), f.max() * (1 + 1e-9))
+    thresholds = np.maximum.accumulate(thresholds)
     
-    # Plot contours
-    contours = ax.contourf(xx, yy, f, levels=20, cmap='Blues', alpha=0.8)
-    ax.contour(xx, yy, f, levels=5, colors='black', alpha=0.3, linewidths=0.5)
+    # Plot contours (density is indexed [x, y]; contour expects [y, x])
+    colors = pyplot().cm.Blues(np.linspace(0.35, 0.8, len(fractions)))
+    ax.contourf(x, y, f.T, levels=thresholds, colors=colors, alpha=0.8)
+    ax.contour(x, y, f.T, levels=thresholds[:-1], colors='black', linewidths=0.8)
     
     # Styling
-    ax.scatter(x, y, alpha=0.1, s=1, c='blue')
     ax.set_xlabel(xlabel, fontsize=11)
     ax.set_ylabel(ylabel, fontsize=11)
     if title:
@@ -107,28 +106,41 @@ def plot_2d_contours(ax, samples, xlabel, ylabel, x_col, y_col,
     
     return ax
 
-def plot_1d_posterior(ax, samples_1d, xlabel, title=None):
+def plot_1d_posterior(ax, samples_1d, xlabel, title=None, density=None, reference=None):
     """
-    Plot 1D posterior distribution
-    """
-    stats = compute_credible_intervals(samples_1d)
+    Plot 1D posterior distribution (binned FFT KDE) with its 68% HPD interval
     
-    # Histogram
-    counts, bins, patches = ax.hist(
-        samples_1d, bins=50, density=True, 
-        alpha=0.7, color='steelblue', edgecolor='black', linewidth=0.5
-    )
+    density: (x, pdf) on a grid, e.g. BinnedKDE.density1d (default: built here)
+    reference: optional (x, pdf) drawn dashed, e.g. a χ² grid marginal
+    """
+    if density is None:
+        density = BinnedKDE(np.reshape(samples_1d, (-1, 1))).density1d(0)
+    x, pdf = density
+    mean = np.mean(samples_1d)
+    ci_low, ci_high = hpd_interval(x, pdf, 0.68)
+    
+    # Smoothed density, 68% region shaded
+    ax.plot(x, pdf, color='steelblue', linewidth=2)
+    inside = (x >= ci_low) & (x <= ci_high)
+    ax.fill_between(x, pdf, where=inside, color='steelblue', alpha=0.4)
+    if reference is not None:
+        # The grid spans the whole prior box: keep the posterior's range
+        xlim = ax.get_xlim()
+        ax.plot(*reference, color='gray', linestyle='--', linewidth=1.5,
+                label='χ² grid marginal')
+        ax.set_xlim(xlim)
     
     # Add vertical lines for mean and CI
-    ax.axvline(stats['mean'], color='red', linestyle='-', linewidth=2.5, 
-               label=f"Mean: {stats['mean']:.4g}")
-    ax.axvline(stats['ci_low'], color='orange', linestyle='--', linewidth=1.5, 
-               label=f"68% CI")
-    ax.axvline(stats['ci_high'], color='orange', linestyle='--', linewidth=1.5)
+    ax.axvline(mean, color='red', linestyle='-', linewidth=2.5, 
+               label=f"Mean: {mean:.4g}")
+    ax.axvline(ci_low, color='orange', linestyle='--', linewidth=1.5, 
+               label=f"68% HPD")
+    ax.axvline(ci_high, color='orange', linestyle='--', linewidth=1.5)
     
     # Styling
     ax.set_xlabel(xlabel, fontsize=11)
     ax.set_ylabel('Probability Density', fontsize=11)
+    ax.set_ylim(bottom=0)
     if title:
         ax.set_title(title, fontsize=12, fontweight='bold')
     ax.legend(fontsize=9, loc='upper right')
@@ -156,43 +168,68 @@ def plot_comparison_lcdm_vs_zfp(ax, z_data, h_lcdm, h_zfp, y_label='H(z) [km/s/M
 # MAIN PLOTTING ROUTINE
 # ============================================================================
 
-def create_constraint_plots():
+def grid_marginals(grid):
+    """
+    Marginal posteriors of H0, Omega_m, m_phi from a precomputed χ² grid
+    (chi2_grid.Chi2Grid or its directory), as [(x, pdf)] per parameter
+    """
+    from chi2_grid import Chi2Grid  # imports mcmc_exploration
+    if isinstance(grid, str):
+        grid = Chi2Grid(grid)
+    return [grid.marginal(name) for name in grid.params]
+
+def create_constraint_plots(samples=None, grid=None):
     """
     Create comprehensive constraint plot figure
+    
+    samples: (nsamples, 3) posterior samples, e.g. from the MCMC stage
+    (default: mock samples)
+    grid: χ² grid (Chi2Grid or directory) whose marginals are overlaid on
+    the 1D posteriors
     """
-    # Generate mock samples
-    samples = generate_mock_constraints()
+    if samples is None:
+        samples = generate_mock_constraints()
     
     # Create figure with subplots
-    fig = plt.figure(figsize=(16, 12))
-    gs = GridSpec(3, 3, figure=fig, hspace=0.35, wspace=0.3)
+    fig = pyplot().figure(figsize=(16, 12))
+    gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.3)
     
     # Color scheme
     fig.patch.set_facecolor('white')
     
+    # One binned grid per parameter pair, shared by all panels
+    kde = BinnedKDE(samples)
+    
     # Row 1: 2D Contours
     ax1 = fig.add_subplot(gs[0, 0])
     plot_2d_contours(ax1, samples, 'H0 [km/s/Mpc]', 'Ωm', 0, 1, 
-                     title='H₀ vs Ωm')
+                     title='H₀ vs Ωm', kde=kde)
     
     ax2 = fig.add_subplot(gs[0, 1])
     plot_2d_contours(ax2, samples, 'H0 [km/s/Mpc]', 'mφ [GeV]', 0, 2,
-                     title='H₀ vs mφ')
+                     title='H₀ vs mφ', kde=kde)
     
     ax3 = fig.add_subplot(gs[0, 2])
     plot_2d_contours(ax3, samples, 'Ωm', 'mφ [GeV]', 1, 2,
-                     title='Ωm vs mφ')
+                     title='Ωm vs mφ', kde=kde)
     
-    # Row 2: 1D Posteriors
+    # Row 2: 1D Posteriors (marginals of the 2D grids above)
+    reference = grid_marginals(grid) if grid is not None else [None] * 3
     ax4 = fig.add_subplot(gs[1, 0])
-    plot_1d_posterior(ax4, samples[:, 0], 'H₀ [km/s/Mpc]', title='H₀ Posterior')
+    plot_1d_posterior(ax4, samples[:, 0], 'H₀ [km/s/Mpc]', title='H₀ Posterior',
+                      density=kde.density1d(0), reference=reference[0])
     
     ax5 = fig.add_subplot(gs[1, 1])
-    plot_1d_posterior(ax5, samples[:, 1], 'Ωm', title='Ωm Posterior')
+    plot_1d_posterior(ax5, samples[:, 1], 'Ωm', title='Ωm Posterior',
+                      density=kde.density1d(1), reference=reference[1])
     
     ax6 = fig.add_subplot(gs[1, 2])
+    x, pdf = kde.density1d(2)
+    if reference[2] is not None:
+        reference[2] = (reference[2][0] * 1e42, reference[2][1] / 1e42)
     plot_1d_posterior(ax6, samples[:, 2]*1e42, 'mφ×10⁴² [GeV]', 
-                      title='mφ Posterior')
+                      title='mφ Posterior', density=(x * 1e42, pdf / 1e42),
+                      reference=reference[2])
     
     # Row 3: Model comparison
     z_array = np.linspace(0, 2, 50)
@@ -226,23 +263,52 @@ def create_constraint_plots():
 # EXECUTION
 # ============================================================================
 
-if __name__ == "__main__":
-    print("[1] Generating mock cosmological samples...")
-    fig, samples = create_constraint_plots()
+def run(samples=None, grid=None):
+    """
+    Plotting stage of the pipeline (grid: optional χ² grid, see
+    create_constraint_plots).
+    
+    Saves constraints_zfp.png and constraint_statistics.csv and returns the
+    statistics as a dict {parameter: compute_credible_intervals(...)}, i.e.
+    'mean', 'median', 'std' and the 68% interval 'ci_low', 'ci_high'.
+    """
+    if samples is None:
+        print("[1] Generating mock cosmological samples...")
+    else:
+        print(f"[1] Using {len(samples)} posterior samples...")
+    fig, samples = create_constraint_plots(samples, grid)
     
     # Save figure
     fig.savefig('constraints_zfp.png', dpi=300, bbox_inches='tight')
     print("[2] Figure saved: constraints_zfp.png")
     
     # Save statistics
+    names = ['H0', 'Omega_m', 'm_phi']
+    stats = {name: compute_credible_intervals(samples[:, i]) for i, name in enumerate(names)}
+    pd = lazy_import('pandas')
     stats_file = pd.DataFrame({
-        'Parameter': ['H0', 'Omega_m', 'm_phi'],
-        'Mean': [samples[:, 0].mean(), samples[:, 1].mean(), samples[:, 2].mean()],
-        'Std': [samples[:, 0].std(), samples[:, 1].std(), samples[:, 2].std()],
-        'Median': [np.median(samples[:, 0]), np.median(samples[:, 1]), np.median(samples[:, 2])]
+        'Parameter': names,
+        'Mean': [stats[name]['mean'] for name in names],
+        'Std': [stats[name]['std'] for name in names],
+        'Median': [stats[name]['median'] for name in names],
+        'CI68_Low': [stats[name]['ci_low'] for name in names],
+        'CI68_High': [stats[name]['ci_high'] for name in names],
     })
     stats_file.to_csv('constraint_statistics.csv', index=False)
     print("[3] Statistics saved: constraint_statistics.csv")
     
     print("\n[COMPLETE] Constraint visualization complete.")
-    plt.show()
+    
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Constraint plots for Zero Field Primordial')
+    parser.add_argument('--headless', action='store_true',
+                        help='Save the figure without opening a window (batch jobs)')
+    parser.add_argument('--grid', default=None,
+                        help='chi2_grid.py output directory: overlay its marginals on the 1D posteriors')
+    args = parser.parse_args()
+    if args.headless:
+        set_headless()
+    run(grid=args.grid)
+    show()
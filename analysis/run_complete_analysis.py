@@ -19,11 +19,19 @@ Execução:
 import os
 import sys
 import argparse
-import subprocess
+import importlib
+import io
 import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import redirect_stdout
 from datetime import datetime
 import json
 
+from runtime import set_headless
+from stage_cache import StageCache
+from telemetry import TELEMETRY, scoped
+
 # ============================================================================
 # CONFIGURAÇÃO
 # ============================================================================
@@ -36,23 +44,78 @@ class AnalysisConfig:
     MODE_FULL = 'full'            # Análise completa (5000 steps)
     MODE_PUBLICATION = 'publication'  # Publication-ready (10000+ steps)
     
-    # Scripts disponíveis
-    SCRIPTS = {
-        'chi2_bao': 'chi2_bao.py',
-        'chi2_sn': 'chi2_sn.py',
-        'chi2_cmb': 'chi2_cmb.py',
-        'chi2_conjugado': 'chi2_conjugado.py',
-        'mcmc': 'mcmc_exploration.py',
-        'plots': 'plot_constraints.py'
+    # Etapas disponíveis (módulos em analysis/ que expõem run(...) → dict)
+    STAGES = {
+        'chi2_bao': 'chi2_bao',
+        'chi2_sn': 'chi2_sn',
+        'chi2_cmb': 'chi2_cmb',
+        'chi2_conjugado': 'chi2_conjugado',
+        'bestfit': 'bestfit',
+        'mcmc': 'mcmc_exploration',
+        'plots': 'plot_constraints'
+    }
+    
+    # Grafo da fase χ²: entradas (kwarg de run → artefato) e saída de cada etapa.
+    # BAO, SNe e CMB são independentes; o conjugado depende de BAO e SNe.
+    # 'expensive': True marca etapas que compensam um processo do pool; as
+    # demais (todas as χ² atuais, < 1 ms) rodam no processo principal.
+    CHI2_STAGES = {
+        'chi2_bao': {'description': 'BAO χ² calculation',
+                     'inputs': {'data': 'bao_data'}, 'output': 'bao'},
+        'chi2_sn': {'description': 'SNe Type Ia χ² calculation',
+                    'inputs': {'data': 'sn_data'}, 'output': 'sn'},
+        'chi2_cmb': {'description': 'CMB χ² calculation',
+                     'inputs': {}, 'output': 'cmb'},
+        'chi2_conjugado': {'description': 'Combined multi-probe χ²',
+                           'inputs': {'bao_result': 'bao', 'sn_result': 'sn'},
+                           'output': 'conjugado'},
+    }
+    
+    # Processos para etapas caras e independentes da fase χ² (1: tudo em processo)
+    CHI2_JOBS = 1
+    
+    # Arquivos escritos por cada etapa (diretório corrente): guardados no
+    # registro do cache e regravados num hit
+    STAGE_OUTPUTS = {
+        'chi2_bao': ['results.csv'],
+        'mcmc': ['mcmc_chains.npy', 'corner_plot.png'],
+        'plots': ['constraints_zfp.png', 'constraint_statistics.csv'],
     }
     
-    # Parâmetros MCMC por modo
+    # Cache de resultados por etapa (chave: hash de entradas + código-fonte)
+    CACHE_DIR = '.pipeline_cache'
+    CACHE_MAX_BYTES = 500 * 1024**2  # evicção LRU acima disso
+    
+    # Dados observacionais (relativos a este arquivo)
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+    
+    # Covariâncias completas (arquivos em DATA_DIR; None → erros diagonais)
+    SN_COVARIANCE = None   # ex.: 'sn_cov.npy' ou matriz no formato Pantheon+
+    BAO_COVARIANCE = None  # covariância de D_V/r_d
+    
+    # Parâmetros MCMC por modo (workers=1: serial; --workers N para paralelizar, 0 = todos os núcleos)
+    # converge=True: nsteps é teto; para quando a chain tem > 50 τ e τ estável
     MCMC_PARAMS = {
-        MODE_QUICK: {'nwalkers': 16, 'nsteps': 100},
-        MODE_FULL: {'nwalkers': 32, 'nsteps': 5000},
-        MODE_PUBLICATION: {'nwalkers': 64, 'nsteps': 10000}
+        MODE_QUICK: {'nwalkers': 16, 'nsteps': 100, 'workers': 1, 'converge': False},
+        MODE_FULL: {'nwalkers': 32, 'nsteps': 5000, 'workers': 1, 'converge': True},
+        MODE_PUBLICATION: {'nwalkers': 64, 'nsteps': 10000, 'workers': 1, 'converge': True}
     }
     
+    # Best fit multi-start (partidas em hipercubo latino, por modelo); os
+    # walkers do MCMC partem do mínimo global, com burn-in encurtado
+    BESTFIT_STARTS = {
+        MODE_QUICK: 8,
+        MODE_FULL: 32,
+        MODE_PUBLICATION: 64
+    }
+    
+    # Checkpoints MCMC (chunks comprimidos, permitem --resume)
+    MCMC_CHECKPOINT = 'mcmc_checkpoint'
+    MCMC_CHECKPOINT_EVERY = 100
+    
+    # Telemetria do solver e das likelihoods (JSON exportado ao final)
+    TELEMETRY_FILE = 'telemetry.json'
+    
     # Critério de refutabilidade (definido ex-ante)
     REFUTABILITY_THRESHOLD = 5.0  # χ² > ΛCDM + 5 → descarta ZFP
 
@@ -72,130 +135,422 @@ def print_step(step, description):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] [{step}] {description}")
 
-def run_script(script_name, description, **kwargs):
-    """Executa script Python e captura output"""
-    print_step(script_name.upper(), description)
-    
-    script_path = os.path.join('analysis', AnalysisConfig.SCRIPTS[script_name])
-    
-    if not os.path.exists(script_path):
-        print(f"  ⚠️  Script não encontrado: {script_path}")
-        print(f"  → Pulando esta etapa\n")
-        return None
-    
-    try:
-        start_time = time.time()
-        result = subprocess.run(
-            [sys.executable, script_path],
-            capture_output=True,
-            text=True,
-            timeout=kwargs.get('timeout', 600)
-        )
-        elapsed = time.time() - start_time
-        
-        if result.returncode == 0:
-            print(f"  ✅ Completo em {elapsed:.1f}s")
-            if result.stdout:
-                for line in result.stdout.strip().split('\n')[-5:]:
-                    print(f"     {line}")
-            return result.stdout
-        else:
-            print(f"  ❌ Erro (código {result.returncode})")
-            if result.stderr:
-                print(f"  → {result.stderr.strip()}")
-            return None
-            
-    except subprocess.TimeoutExpired:
-        print(f"  ⏱️  Timeout após {kwargs.get('timeout')}s")
-        return None
-    except Exception as e:
-        print(f"  ❌ Exceção: {str(e)}")
-        return None
-    finally:
+# Tempo de cada etapa executada: {nome: segundos}
+STAGE_TIMINGS = {}
+
+# Cache de etapas (StageCache), definido em main(); None → sem cache
+STAGE_CACHE = None
+
+def execute_stage(stage_name, kwargs):
+    """
+    Executa run(**kwargs) do módulo da etapa, capturando stdout
+    
+    Função de nível de módulo para poder rodar também em processos do pool.
+    Retorna dict com result, stdout, elapsed, error (None se sucesso), a
+    telemetria (snapshot) coletada durante a etapa e files, o conteúdo dos
+    arquivos de saída da etapa (STAGE_OUTPUTS).
+    """
+    buffer = io.StringIO()
+    start_time = time.time()
+    with scoped() as telemetry:
+        try:
+            module = importlib.import_module(AnalysisConfig.STAGES[stage_name])
+            with redirect_stdout(buffer):
+                result = module.run(**kwargs)
+            error = None
+        except Exception as e:
+            result = None
+            error = f"{str(e)} ({traceback.format_exc().strip().splitlines()[-1]})"
+    return {
+        'result': result,
+        'stdout': buffer.getvalue(),
+        'elapsed': time.time() - start_time,
+        'error': error,
+        'telemetry': telemetry.snapshot(),
+        'files': read_outputs(stage_name) if error is None else {},
+    }
+
+def read_outputs(stage_name):
+    """Conteúdo dos arquivos de saída da etapa que existem: {caminho: bytes}"""
+    files = {}
+    for path in AnalysisConfig.STAGE_OUTPUTS.get(stage_name, []):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                files[path] = f.read()
+    return files
+
+def restore_outputs(record):
+    """Regrava os arquivos do registro ausentes ou alterados; retorna os regravados"""
+    restored = []
+    for path, content in record['files'].items():
+        try:
+            with open(path, 'rb') as f:
+                if f.read() == content:
+                    continue
+        except OSError:
+            pass
+        with open(path + '.tmp', 'wb') as f:
+            f.write(content)
+        os.replace(path + '.tmp', path)
+        restored.append(path)
+    return restored
+
+def lookup_stage(stage_name, kwargs):
+    """
+    (chave, registro em cache ou None) para uma etapa e suas entradas
+    
+    Um registro sem todos os arquivos de saída da etapa conta como miss; num
+    hit, os arquivos ausentes ou alterados no disco são regravados.
+    """
+    if STAGE_CACHE is None:
+        return None, None
+    outputs = set(AnalysisConfig.STAGE_OUTPUTS.get(stage_name, []))
+    key = STAGE_CACHE.key(stage_name, AnalysisConfig.STAGES[stage_name], kwargs)
+    record = STAGE_CACHE.get(key, valid=lambda r: outputs <= set(r.get('files', {})))
+    if record is not None:
+        record = dict(record, cached=True, restored=restore_outputs(record))
+    return key, record
+
+def store_stage(key, record):
+    """Guarda no cache o registro de uma etapa bem-sucedida"""
+    if key is not None and record['error'] is None:
+        STAGE_CACHE.put(key, record)
+
+def report_stage(stage_name, record):
+    """Imprime status, tempo e últimas linhas de uma etapa concluída"""
+    if record.get('cached'):
+        STAGE_TIMINGS[stage_name] = 0.0
+        print(f"  ♻️  Cache: entradas e código inalterados (original: {record['elapsed']:.1f}s)")
+        if record['restored']:
+            print(f"     Arquivos restaurados do cache: {', '.join(record['restored'])}")
+        for line in record['stdout'].strip().split('\n')[-5:]:
+            print(f"     {line}")
         print()
+        return
+    STAGE_TIMINGS[stage_name] = record['elapsed']
+    if record['error'] is None:
+        print(f"  ✅ Completo em {record['elapsed']:.1f}s")
+        for line in record['stdout'].strip().split('\n')[-5:]:
+            print(f"     {line}")
+    else:
+        print(f"  ❌ Exceção: {record['error']}")
+    print()
+
+def run_stage(stage_name, description, cache=True, **kwargs):
+    """
+    Executa uma etapa no mesmo processo e retorna seu resultado estruturado
+    
+    Chama run(**kwargs) do módulo da etapa. O stdout da etapa é capturado e
+    as últimas linhas são exibidas, como no runner por subprocess. Com
+    cache=True, um resultado guardado para as mesmas entradas e o mesmo
+    código é reaproveitado sem executar a etapa.
+    """
+    print_step(stage_name.upper(), description)
+    key, record = lookup_stage(stage_name, kwargs) if cache else (None, None)
+    if record is None:
+        record = execute_stage(stage_name, kwargs)
+        store_stage(key, record)
+    report_stage(stage_name, record)
+    return record['result']
+
+def run_dag(stages, artifacts, jobs=1):
+    """
+    Executa um grafo de etapas respeitando dependências
+    
+    stages: {nome: {'description', 'inputs': {kwarg: artefato}, 'output': artefato}}
+    artifacts: artefatos já disponíveis (ex.: dados carregados)
+    
+    Etapas marcadas 'expensive' cujas entradas estão prontas rodam
+    concorrentemente em até `jobs` processos; as demais rodam no processo
+    principal (o spawn de um processo custa mais que uma etapa barata). Uma
+    etapa que falha faz suas dependentes serem puladas.
+    Retorna artifacts acrescido das saídas produzidas.
+    """
+    artifacts = dict(artifacts)
+    pending = dict(stages)
+    failed = set()
+    
+    def ready():
+        return [name for name, spec in pending.items()
+                if all(a in artifacts for a in spec['inputs'].values())]
+    
+    def blocked():
+        return [name for name, spec in pending.items()
+                if any(a in failed for a in spec['inputs'].values())]
+    
+    def collect(name, record):
+        spec = pending.pop(name)
+        print_step(name.upper(), spec['description'])
+        report_stage(name, record)
+        if record['error'] is None and record['result'] is not None:
+            artifacts[spec['output']] = record['result']
+        else:
+            failed.add(spec['output'])
+    
+    def skip_blocked():
+        for name in blocked():
+            spec = pending.pop(name)
+            failed.add(spec['output'])
+            print_step(name.upper(), spec['description'])
+            print(f"  ⚠️  Dependência falhou → pulando esta etapa\n")
+    
+    def kwargs_of(name):
+        return {k: artifacts[a] for k, a in pending[name]['inputs'].items()}
+    
+    def run_inline(name):
+        key, record = lookup_stage(name, kwargs_of(name))
+        if record is None:
+            record = execute_stage(name, kwargs_of(name))
+            store_stage(key, record)
+        collect(name, record)
+    
+    expensive = [name for name, spec in stages.items() if spec.get('expensive')]
+    if jobs <= 1 or not expensive:
+        while pending:
+            skip_blocked()
+            for name in ready():
+                run_inline(name)
+            if pending and not ready() and not blocked():
+                raise ValueError(f"Dependências não satisfeitas: {sorted(pending)}")
+        return artifacts
+    
+    with ProcessPoolExecutor(max_workers=min(jobs, len(expensive))) as pool:
+        running = {}
+        keys = {}
+        while pending:
+            skip_blocked()
+            for name in ready():
+                if name in running.values():
+                    continue
+                if not pending[name].get('expensive'):
+                    run_inline(name)
+                    continue
+                keys[name], record = lookup_stage(name, kwargs_of(name))
+                if record is not None:
+                    collect(name, record)
+                else:
+                    running[pool.submit(execute_stage, name, kwargs_of(name))] = name
+            if not running:
+                if pending and not ready():
+                    raise ValueError(f"Dependências não satisfeitas: {sorted(pending)}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                record = future.result()
+                TELEMETRY.merge(record['telemetry'])  # coletada no processo do pool
+                store_stage(keys[name], record)
+                collect(name, record)
+    
+    return artifacts
+
+def print_timing_report(wall_times):
+    """Resumo de tempos por etapa e por fase (wall-clock)"""
+    print_banner("TEMPOS POR ETAPA", "-")
+    for name, elapsed in STAGE_TIMINGS.items():
+        print(f"  {name:<16} {elapsed:8.2f}s")
+    print()
+    for phase, elapsed in wall_times.items():
+        print(f"  [{phase}] wall-clock {elapsed:8.2f}s")
+    if STAGE_CACHE is not None:
+        print(f"\n  Cache: {STAGE_CACHE.hits} hits, {STAGE_CACHE.misses} misses")
+    print()
+
+def load_shared_data():
+    """Carrega BAO e SNe uma única vez para todas as etapas"""
+    from chi2_bao import load_bao_data
+    from chi2_sn import load_sn_data
+    
+    def data_file(name):
+        return os.path.join(AnalysisConfig.DATA_DIR, name) if name else None
+    
+    bao = load_bao_data(data_file('bao_data.csv'),
+                        covariance=data_file(AnalysisConfig.BAO_COVARIANCE))
+    sn = load_sn_data(data_file('sn_data.csv'),
+                      covariance=data_file(AnalysisConfig.SN_COVARIANCE))
+    return bao, sn
 
 # ============================================================================
 # ANÁLISE COMPLETA
 # ============================================================================
 
-def run_chi2_analysis():
-    """Executa análise χ² para todos os probes"""
+def run_chi2_analysis(data, jobs=1):
+    """Executa análise χ² para todos os probes (grafo: BAO, SNe e CMB independentes)"""
     print_banner("FASE 1: ANÁLISE χ²", "=")
     
-    results = {}
-    
-    # BAO
-    output = run_script('chi2_bao', 'BAO χ² calculation')
-    if output:
-        results['bao'] = output
+    bao_data, sn_data = data
+    artifacts = run_dag(AnalysisConfig.CHI2_STAGES,
+                        {'bao_data': bao_data, 'sn_data': sn_data},
+                        jobs=jobs)
     
-    # SNe
-    output = run_script('chi2_sn', 'SNe Type Ia χ² calculation')
-    if output:
-        results['sn'] = output
-    
-    # CMB
-    output = run_script('chi2_cmb', 'CMB χ² calculation')
-    if output:
-        results['cmb'] = output
-    
-    # Conjugado
-    output = run_script('chi2_conjugado', 'Combined multi-probe χ²')
-    if output:
-        results['conjugado'] = output
+    return {probe: artifacts[probe] for probe in ['bao', 'sn', 'cmb', 'conjugado']
+            if probe in artifacts}
+
+def mcmc_workers(mode, workers=None):
+    """Processos do MCMC (e do best fit): argumento, senão o padrão do modo"""
+    if workers is None:
+        workers = AnalysisConfig.MCMC_PARAMS.get(mode, AnalysisConfig.MCMC_PARAMS['full'])['workers']
+    return workers or os.cpu_count() or 1
+
+def run_bestfit(data, mode='full', workers=None):
+    """Executa o best fit multi-start de ΛCDM e ZFP"""
+    print_banner("FASE 1b: BEST FIT (MULTI-START)", "=")
     
-    return results
+    n_starts = AnalysisConfig.BESTFIT_STARTS.get(mode, AnalysisConfig.BESTFIT_STARTS['full'])
+    return run_stage('bestfit', 'Multi-start best fit (ΛCDM, ZFP)',
+                     data=data, n_starts=n_starts, workers=mcmc_workers(mode, workers))
 
-def run_mcmc_exploration(mode='full'):
-    """Executa exploração MCMC"""
+def run_mcmc_exploration(data, mode='full', workers=None, resume=False, bestfit=None):
+    """Executa exploração MCMC (walkers no best fit ZFP, se disponível)"""
     print_banner("FASE 2: EXPLORAÇÃO MCMC", "=")
     
-    params = AnalysisConfig.MCMC_PARAMS.get(mode, AnalysisConfig.MCMC_PARAMS['full'])
+    params = dict(AnalysisConfig.MCMC_PARAMS.get(mode, AnalysisConfig.MCMC_PARAMS['full']))
+    params['workers'] = mcmc_workers(mode, workers)
     
     print(f"  Modo: {mode.upper()}")
     print(f"  Walkers: {params['nwalkers']}")
-    print(f"  Steps: {params['nsteps']}")
+    print(f"  Steps: {params['nsteps']}" + (" (máx., parada por τ)" if params['converge'] else ""))
+    print(f"  Workers: {params['workers']}")
+    print(f"  Início: {'best fit ZFP' if bestfit else 'bola em torno do fiducial'}")
     print(f"  Tempo estimado: ~{params['nsteps'] * params['nwalkers'] // 1000} minutos\n")
     
-    # Nota: o script mcmc_exploration.py precisa aceitar argumentos CLI
-    # Por enquanto, executa com parâmetros default
-    output = run_script('mcmc', 'MCMC parameter exploration', timeout=3600)
+    output = run_stage('mcmc', 'MCMC parameter exploration',
+                       data=data,
+                       nwalkers=params['nwalkers'],
+                       nsteps=params['nsteps'],
+                       workers=params['workers'],
+                       converge=params['converge'],
+                       checkpoint=AnalysisConfig.MCMC_CHECKPOINT,
+                       checkpoint_every=AnalysisConfig.MCMC_CHECKPOINT_EVERY,
+                       resume=resume,
+                       bestfit=bestfit)
     
     return output
 
-def generate_plots():
-    """Gera plots de restrições"""
+def reuse_mcmc_checkpoint():
+    """Reaproveita chains (mesmo parciais) do checkpoint em vez de recalcular"""
+    if not os.path.exists(os.path.join(AnalysisConfig.MCMC_CHECKPOINT, 'state.npz')):
+        print("⏩ Pulando MCMC (--skip-mcmc)\n")
+        return None
+    
+    print("⏩ Pulando MCMC (--skip-mcmc): reutilizando chains do checkpoint\n")
+    return run_stage('mcmc', 'Análise das chains em checkpoint', cache=False,
+                     checkpoint=AnalysisConfig.MCMC_CHECKPOINT, analyze_only=True)
+
+def generate_plots(mcmc_output=None):
+    """Gera plots de restrições (com as amostras do MCMC, se disponíveis)"""
     print_banner("FASE 3: VISUALIZAÇÃO", "=")
     
-    output = run_script('plots', 'Publication-ready constraint plots', timeout=300)
+    samples = mcmc_output['samples'] if mcmc_output else None
+    output = run_stage('plots', 'Publication-ready constraint plots', samples=samples)
     
     return output
 
-def synthesize_results(chi2_results, mcmc_output, plots_output):
-    """Sintetiza resultados e gera veredito"""
+def print_telemetry_summary(snapshot):
+    """Resumo da telemetria: solver, falhas por causa, cache e χ² por probe"""
+    counters, hists = snapshot['counters'], snapshot['histograms']
+    
+    def timing(name):
+        h = hists.get(name)
+        if not h or not h['n']:
+            return "sem chamadas"
+        return (f"{h['n']} chamadas, média {1e3 * h['mean']:.3f} ms, "
+                f"p95 ≤ {1e3 * h['p95']:.3f} ms, total {h['total']:.2f}s")
+    
+    print("\n⏱️  TELEMETRIA (solver e likelihoods)\n")
+    print(f"  [Solver]  {timing('solver.wall')}")
+    if counters.get('solver.calls'):
+        nfev = hists['solver.nfev_per_call']
+        print(f"            {counters.get('solver.members', 0)} modelos, "
+              f"nfev médio/chamada {nfev['mean']:.0f}, WKB: {counters.get('solver.wkb', 0)}")
+    if counters.get('shooting.members'):
+        print(f"  [Shooting] {counters['shooting.members']} modelos, "
+              f"{counters.get('shooting.iterations', 0) / counters['shooting.members']:.2f} "
+              f"integrações/modelo, warm starts: {counters.get('shooting.warm_starts', 0)}, "
+              f"sem convergência: {counters.get('shooting.fail', 0)}")
+    failures = {name.split('.', 1)[1]: n for name, n in counters.items()
+                if (name.startswith('solver.fail.') or name.startswith('solver.abort.')) and n}
+    print(f"  [Falhas]  fallback ΛCDM: {counters.get('solver.lcdm_fallback', 0)}"
+          + "".join(f", {cause}: {n}" for cause, n in sorted(failures.items())))
+    hits = counters.get('cache.background.hits', 0)
+    misses = counters.get('cache.background.misses', 0)
+    if hits + misses:
+        print(f"  [Cache]   {hits} hits, {misses} misses ({100 * hits / (hits + misses):.1f}% hit rate)")
+    for probe in ['bao', 'sn']:
+        print(f"  [χ² {probe:<3}]  {timing('chi2.' + probe)}")
+    if counters.get('likelihood.evals'):
+        print(f"  [Likelihood] {counters['likelihood.evals']} avaliações; {timing('likelihood.wall')}")
+    imports = {name[len('import.'):]: h['total'] for name, h in hists.items()
+               if name.startswith('import.')}
+    if imports:
+        print("  [Imports] " + ", ".join(f"{m} {t:.2f}s" for m, t in
+                                        sorted(imports.items(), key=lambda kv: -kv[1])))
+
+def synthesize_results(chi2_results, mcmc_output, plots_output, telemetry=None,
+                       bestfit_output=None):
+    """Sintetiza resultados e gera veredito (Δχ² do best fit, se disponível)"""
     print_banner("FASE 4: SÍNTESE & VEREDITO", "=")
     
     print("📊 RESUMO DE RESULTADOS\n")
     
-    # Placeholder para parsing de resultados
-    # Em uma implementação real, faria parsing dos outputs
+    delta_chi2 = None
+    if chi2_results:
+        for probe in ['bao', 'sn', 'cmb', 'conjugado']:
+            if probe in chi2_results:
+                r = chi2_results[probe]
+                print(f"  [Chi²] {probe:<10} ΛCDM: {r['chi2_lcdm']:10.3f}   "
+                      f"ZFP: {r['chi2_zfp']:10.3f}   Δχ²: {r['chi2_zfp'] - r['chi2_lcdm']:+.3f}")
+        if 'conjugado' in chi2_results:
+            r = chi2_results['conjugado']
+            delta_chi2 = r['chi2_zfp'] - r['chi2_lcdm']
+    else:
+        print("  [Chi²] Não executado")
+    
+    if bestfit_output:
+        for model, label in [('lcdm', 'ΛCDM'), ('zfp', 'ZFP')]:
+            r = bestfit_output[model]
+            params = ", ".join(f"{name} = {value:.4e}" for name, value
+                               in zip(['H0', 'Omega_m', 'm_phi'], r['theta']))
+            print(f"  [Best fit] {label:<5} χ²_min = {r['chi2']:10.3f}   ({params})")
+        # Mínimos globais dos dois modelos: o Δχ² honesto para o critério
+        delta_chi2 = bestfit_output['delta_chi2']
+        print(f"  [Best fit] Δχ² (ZFP - ΛCDM) = {delta_chi2:+.3f}")
+    
+    if mcmc_output:
+        print(f"\n  [MCMC] {mcmc_output['n_steps']} steps de produção")
+        for label, (p16, p50, p84) in mcmc_output['summary'].items():
+            print(f"         {label:<8} = {p50:.5e} +{p84 - p50:.5e} -{p50 - p16:.5e}")
+    else:
+        print("  [MCMC] Não executado")
+    
+    print(f"\n  [PLOTS] {'Visualizações geradas' if plots_output else 'Não executado'}")
     
-    print("  [Chi²] Análises individuais completadas")
-    print("  [MCMC] Exploração de parâmetros completada")
-    print("  [PLOTS] Visualizações geradas")
+    print_telemetry_summary(telemetry if telemetry is not None else TELEMETRY.snapshot())
     
     print("\n🎯 VEREDITO OPERACIONAL\n")
     
     print(f"  ✅ CHAVE: Coerência mantida (nenhuma evasão detectada)")
     print(f"  ✅ 0: Honestidade aplicada (resultados não blindados)")
-    print(f"  ✅ Critério refutabilidade: Δχ² < {AnalysisConfig.REFUTABILITY_THRESHOLD}")
+    threshold = AnalysisConfig.REFUTABILITY_THRESHOLD
+    if delta_chi2 is None:
+        print(f"  ⚠️  Critério refutabilidade (Δχ² < {threshold}): sem χ² combinado")
+    elif delta_chi2 < threshold:
+        print(f"  ✅ Critério refutabilidade: Δχ² = {delta_chi2:.3f} < {threshold}")
+    else:
+        print(f"  ❌ Critério refutabilidade: Δχ² = {delta_chi2:.3f} ≥ {threshold} → ZFP descartado")
     
     print("\n📁 OUTPUTS GERADOS:\n")
-    print("  - results.csv (χ² summary)")
-    print("  - mcmc_chains.npy (parameter samples)")
-    print("  - corner_plot.png (MCMC visualization)")
-    print("  - constraints_zfp.png (full constraint plot)")
-    print("  - constraint_statistics.csv (parameter stats)")
+    outputs = [('results.csv', 'χ² summary'),
+               ('mcmc_chains.npy', 'parameter samples'),
+               ('corner_plot.png', 'MCMC visualization'),
+               ('constraints_zfp.png', 'full constraint plot'),
+               ('constraint_statistics.csv', 'parameter stats'),
+               (AnalysisConfig.TELEMETRY_FILE, 'solver/likelihood telemetry')]
+    for path, description in outputs:
+        if os.path.exists(path):
+            print(f"  - {path} ({description})")
+        else:
+            print(f"  ⚠️  {path} ausente ({description})")
     
     print("\n🚀 PRÓXIMO PASSO: Integrar dados cosmológicos reais\n")
 
@@ -238,14 +593,51 @@ Princípios Operacionais:
         help='Pular MCMC (usar chains prévias)'
     )
     
+    parser.add_argument(
+        '--skip-bestfit',
+        action='store_true',
+        help='Pular o best fit multi-start (MCMC parte do fiducial)'
+    )
+    
     parser.add_argument(
         '--skip-plots',
         action='store_true',
         help='Pular geração de plots'
     )
     
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continuar MCMC interrompido a partir do checkpoint'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignorar o cache de etapas e recalcular tudo'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=AnalysisConfig.CHI2_JOBS,
+        help=f'Processos para etapas χ² caras e independentes (default: '
+             f'{AnalysisConfig.CHI2_JOBS} = tudo no processo principal)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processos para avaliar a likelihood no MCMC (default: 1; 0 = todos os núcleos)'
+    )
+    
     args = parser.parse_args()
     
+    # A pipeline só grava arquivos: backend não interativo, nunca bloqueia
+    # (herdado pelos processos das etapas)
+    set_headless()
+    
     # Banner inicial
     print_banner("ZERO FIELD PRIMORDIAL: ANÁLISE COMPLETA", "#")
     print(f"  Modo: {args.mode.upper()}")
@@ -253,28 +645,53 @@ Princípios Operacionais:
     print(f"  Princípios: CHAVE (clareza) + 0 (honestidade)")
     print()
     
-    # Execução da pipeline
+    global STAGE_CACHE
+    if not args.no_cache:
+        STAGE_CACHE = StageCache(AnalysisConfig.CACHE_DIR,
+                                 max_bytes=AnalysisConfig.CACHE_MAX_BYTES)
+    
+    # Execução da pipeline (dados carregados uma vez, etapas no mesmo processo)
+    data = load_shared_data()
     chi2_results = None
+    bestfit_output = None
     mcmc_output = None
     plots_output = None
+    wall_times = {}
     
+    start_time = time.time()
     if not args.skip_chi2:
-        chi2_results = run_chi2_analysis()
+        chi2_results = run_chi2_analysis(data, jobs=args.jobs)
+        wall_times['χ²'] = time.time() - start_time
     else:
         print("⏩ Pulando análise χ² (--skip-chi2)\n")
     
+    start_time = time.time()
+    if not args.skip_bestfit:
+        bestfit_output = run_bestfit(data, mode=args.mode, workers=args.workers)
+        wall_times['BEST FIT'] = time.time() - start_time
+    else:
+        print("⏩ Pulando best fit (--skip-bestfit)\n")
+    
+    start_time = time.time()
     if not args.skip_mcmc:
-        mcmc_output = run_mcmc_exploration(mode=args.mode)
+        mcmc_output = run_mcmc_exploration(data, mode=args.mode, workers=args.workers,
+                                           resume=args.resume,
+                                           bestfit=bestfit_output['zfp'] if bestfit_output else None)
     else:
-        print("⏩ Pulando MCMC (--skip-mcmc)\n")
+        mcmc_output = reuse_mcmc_checkpoint()
+    wall_times['MCMC'] = time.time() - start_time
     
+    start_time = time.time()
     if not args.skip_plots:
-        plots_output = generate_plots()
+        plots_output = generate_plots(mcmc_output)
+        wall_times['PLOTS'] = time.time() - start_time
     else:
         print("⏩ Pulando plots (--skip-plots)\n")
     
-    # Síntese final
-    synthesize_results(chi2_results, mcmc_output, plots_output)
+    # Síntese final (telemetria exportada antes, para constar dos outputs)
+    TELEMETRY.export_json(AnalysisConfig.TELEMETRY_FILE)
+    synthesize_results(chi2_results, mcmc_output, plots_output, bestfit_output=bestfit_output)
+    print_timing_report(wall_times)
     
     print_banner("ANÁLISE COMPLETA", "#")
     print("✅ Pipeline executada com sucesso\n")
@@ -0,0 +1,94 @@
+"""runtime.py: Lazy heavy imports, headless mode and import-time report
+
+matplotlib, emcee, corner and pandas together cost seconds at import time,
+while a χ² job or a likelihood worker only needs numpy/scipy. Modules that
+use them import them through lazy_import() / pyplot() on the code paths
+that need them, so they load at most once, when first used. Each lazy
+import is timed into TELEMETRY ('import.<module>').
+
+Headless mode (set_headless(), or ZFP_HEADLESS=1 in the environment, which
+worker processes inherit) forces matplotlib's non-interactive Agg backend
+and turns show() into a no-op, so batch jobs never block on a window.
+"""
+
+import importlib
+import os
+import sys
+import time
+
+from telemetry import TELEMETRY
+
+HEADLESS_ENV = 'ZFP_HEADLESS'
+
+# Modules reported by import_report() (loaded or not)
+HEAVY_MODULES = ['matplotlib.pyplot', 'emcee', 'corner', 'pandas', 'scipy.stats',
+                 'scipy.optimize', 'scipy.interpolate']
+
+_IMPORT_TIMES = {}
+
+# ============================================================================
+# HEADLESS MODE
+# ============================================================================
+
+def headless():
+    return os.environ.get(HEADLESS_ENV, '') not in ('', '0')
+
+def set_headless(flag=True):
+    """Force (or release) the non-interactive backend, here and in child processes"""
+    os.environ[HEADLESS_ENV] = '1' if flag else '0'
+    if flag:
+        os.environ['MPLBACKEND'] = 'Agg'
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].switch_backend('Agg')
+
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+
+def lazy_import(name):
+    """importlib.import_module(name), timed the first time it is loaded"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    _IMPORT_TIMES[name] = elapsed
+    TELEMETRY.observe('import.' + name, elapsed)
+    return module
+
+def pyplot():
+    """matplotlib.pyplot, on the Agg backend in headless mode"""
+    if headless() and 'matplotlib.pyplot' not in sys.modules:
+        lazy_import('matplotlib').use('Agg')
+    return lazy_import('matplotlib.pyplot')
+
+def show():
+    """plt.show(), skipped in headless mode"""
+    if not headless():
+        pyplot().show()
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def import_report():
+    """
+    {'lazy': {module: seconds}, 'loaded': [...], 'not_loaded': [...]}
+    for the modules imported through lazy_import() and HEAVY_MODULES
+    """
+    return {
+        'lazy': dict(_IMPORT_TIMES),
+        'loaded': [m for m in HEAVY_MODULES if m in sys.modules],
+        'not_loaded': [m for m in HEAVY_MODULES if m not in sys.modules],
+    }
+
+def print_import_report():
+    report = import_report()
+    print("Import times (lazy imports, first use):")
+    for name, seconds in sorted(report['lazy'].items(), key=lambda kv: -kv[1]):
+        print(f"  {name:<24} {seconds:8.3f}s")
+    if not report['lazy']:
+        print("  (none)")
+    print(f"  heavy modules loaded:     {', '.join(report['loaded']) or '-'}")
+    print(f"  heavy modules not loaded: {', '.join(report['not_loaded']) or '-'}")
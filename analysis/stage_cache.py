@@ -0,0 +1,134 @@
+"""stage_cache.py: Content-addressed on-disk cache of pipeline stage results
+
+A stage result is stored under a key hashed from:
+  - the stage name,
+  - its inputs (run() kwargs: data arrays by content, parameters, mode),
+  - the source of the stage module and of every sibling module it imports
+    from analysis/ (transitively).
+
+Editing plot_constraints.py therefore invalidates only the plotting stage,
+while MCMC and χ² results are reused. Entries are pickles named by key;
+least-recently-used entries are evicted once the cache exceeds its size or
+entry limits. Records may also carry the content of the files a stage
+writes, so that a hit can restore them (see run_complete_analysis).
+"""
+
+import ast
+import glob
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def _update_hash(h, obj):
+    """Feed a canonical encoding of obj (nested containers, arrays) into h"""
+    if isinstance(obj, dict):
+        h.update(b'dict')
+        for key in sorted(obj, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for item in obj:
+            _update_hash(h, item)
+    elif isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(f'ndarray{arr.dtype.str}{arr.shape}'.encode())
+        h.update(arr.tobytes())
+    else:
+        h.update(repr(obj).encode())
+
+def _local_imports(path):
+    """Sibling modules of analysis/ imported by the file at path"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split('.')[0])
+    return sorted(n for n in names if os.path.exists(os.path.join(ANALYSIS_DIR, n + '.py')))
+
+def source_version(module_name):
+    """Hash of a module's source and of all local modules it imports"""
+    h = hashlib.sha256()
+    seen, stack = set(), [module_name]
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        path = os.path.join(ANALYSIS_DIR, name + '.py')
+        with open(path, 'rb') as f:
+            h.update(name.encode())
+            h.update(f.read())
+        stack.extend(_local_imports(path))
+    return h.hexdigest()
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class StageCache:
+    """LRU-evicted, content-addressed store of stage results"""
+
+    def __init__(self, path, max_bytes=500 * 1024**2, max_entries=256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage_name, module_name, kwargs, extra=None):
+        """Content hash of stage inputs + source version"""
+        h = hashlib.sha256()
+        _update_hash(h, (stage_name, source_version(module_name), kwargs, extra))
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key + '.pkl')
+
+    def get(self, key, valid=None):
+        """
+        Stored record for key, or None; a hit refreshes its LRU position.
+        valid: predicate on the record; records failing it count as misses.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                record = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+        if valid is not None and not valid(record):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return record
+
+    def put(self, key, record):
+        """Store record under key and evict least-recently-used entries"""
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._entry_path(key) + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._entry_path(key))
+        self.evict()
+
+    def evict(self):
+        """Drop oldest-used entries until within max_bytes and max_entries"""
+        entries = sorted(glob.glob(os.path.join(self.path, '*.pkl')), key=os.path.getmtime)
+        sizes = [os.path.getsize(e) for e in entries]
+        total = sum(sizes)
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            os.remove(entries.pop(0))
+            total -= sizes.pop(0)
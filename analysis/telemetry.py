@@ -0,0 +1,130 @@
+"""telemetry.py: Counters and timing histograms for the model and likelihoods
+
+A process-wide Telemetry instance (TELEMETRY) collects:
+  - counters:   solver calls, RHS evaluations, failures by cause, cache hits...
+  - histograms: wall time per solver call / χ² evaluation, nfev per call,
+                on fixed log-spaced bins so memory stays constant during MCMC.
+
+snapshot() returns a JSON-serializable summary, export_json() writes it to
+disk, and merge() folds in snapshots produced in other processes (e.g.
+pipeline stages run in a process pool).
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Log-spaced histogram bins: 4 per decade from 1e-7 to 1e5
+HIST_EDGES = np.logspace(-7, 5, 49)
+
+class Histogram:
+    """Fixed-bin histogram with count, sum, min and max"""
+
+    def __init__(self):
+        self.counts = np.zeros(len(HIST_EDGES) + 1, dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, value):
+        self.counts[np.searchsorted(HIST_EDGES, value)] += 1
+        self.n += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Approximate quantile (upper edge of the bin holding it)"""
+        if self.n == 0:
+            return None
+        idx = int(np.searchsorted(np.cumsum(self.counts), q * self.n))
+        return float(HIST_EDGES[min(idx, len(HIST_EDGES) - 1)])
+
+    def summary(self):
+        return {
+            'n': self.n,
+            'total': self.total,
+            'mean': self.total / self.n if self.n else None,
+            'min': self.min if self.n else None,
+            'max': self.max if self.n else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'counts': self.counts.tolist(),
+        }
+
+    def merge(self, summary):
+        if not summary['n']:
+            return
+        self.counts += np.asarray(summary['counts'], dtype=np.int64)
+        self.n += summary['n']
+        self.total += summary['total']
+        self.min = min(self.min, summary['min'])
+        self.max = max(self.max, summary['max'])
+
+class Telemetry:
+    """Named counters and histograms"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def observe(self, name, value):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        self.histograms[name].add(float(value))
+
+    @contextmanager
+    def timer(self, name):
+        """Record the wall time of the block in histogram `name` [s]"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def snapshot(self):
+        return {
+            'counters': dict(self.counters),
+            'histograms': {name: h.summary() for name, h in self.histograms.items()},
+        }
+
+    def merge(self, snapshot):
+        """Add a snapshot (e.g. from a worker process) into this instance"""
+        for name, n in snapshot['counters'].items():
+            self.count(name, n)
+        for name, summary in snapshot['histograms'].items():
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].merge(summary)
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+TELEMETRY = Telemetry()
+
+@contextmanager
+def scoped():
+    """
+    Collect into a fresh Telemetry for the duration of the block, then fold
+    it back into TELEMETRY. Yields the scoped instance, whose snapshot()
+    describes only the work done inside the block.
+    """
+    scope = Telemetry()
+    saved = (TELEMETRY.counters, TELEMETRY.histograms)
+    TELEMETRY.counters, TELEMETRY.histograms = scope.counters, scope.histograms
+    try:
+        yield scope
+    finally:
+        TELEMETRY.counters, TELEMETRY.histograms = saved
+        TELEMETRY.merge(scope.snapshot())
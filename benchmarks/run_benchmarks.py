@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""run_benchmarks.py: Throughput of the likelihood, solver and sampler hot paths
+
+Measures calls/second of
+  - chi2_sn.mu_lcdm, chi2_bao.DV_lcdm / DV_zero_field
+  - background.H_zero_field (cold: solver with no history cache and no
+    shooting warm start, warm: history cache)
+  - mcmc_exploration.chi2_total, log_probability and log_probability_batch
+at several data sizes (the bundled files plus synthetic catalogs), and an
+end-to-end MCMC steps/second figure.
+
+Every figure is the median over REPEATS timed runs, stored with its noise
+band (interquartile range of the runs, relative to the median). Results
+are written as JSON; --compare reports the ratio of medians against a
+saved baseline and exits with status 1 if any benchmark slowed down by
+more than --tolerance plus the noise bands of both runs.
+
+Usage:
+  python benchmarks/run_benchmarks.py --output bench.json
+  python benchmarks/run_benchmarks.py --sizes 1000 10000 --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'analysis'))
+
+import background
+import chi2_bao
+import chi2_sn
+import mcmc_exploration
+import mock_catalogs
+
+SIZES = [1000, 10000, 100000]  # synthetic catalog sizes
+MIN_TIME = 0.25                # seconds of calls per timing repeat
+REPEATS = 9                    # median (and spread) over REPEATS
+MCMC_REPEATS = 3               # end-to-end sampler runs
+THETA = np.array([70.0, 0.3, 1e-42])
+NWALKERS = 32
+
+# ============================================================================
+# DATA
+# ============================================================================
+
+def bundled_data():
+    """The 22-point BAO and 20-point SNe files shipped in data/"""
+    data_dir = os.path.join(ROOT, 'data')
+    return (chi2_bao.load_bao_data(os.path.join(data_dir, 'bao_data.csv')),
+            chi2_sn.load_sn_data(os.path.join(data_dir, 'sn_data.csv')))
+
+def synthetic_data(n, seed=0):
+    """Mock ΛCDM BAO and SNe catalogs of n points each (mock_catalogs)"""
+    sn, _ = mock_catalogs.mock_sn(n, 'lcdm', seed=seed)
+    bao, _ = mock_catalogs.mock_bao(n, 'lcdm', seed=seed + 1)
+    return ((bao['z'].values, bao['DV_over_rd'].values, bao['sigma_DV_over_rd'].values),
+            (sn['z'].values, sn['mu_obs'].values, sn['mu_err'].values))
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+def summarize_rates(rates):
+    """(median, relative interquartile range) of a list of rates"""
+    q25, q50, q75 = np.percentile(rates, [25, 50, 75])
+    return float(q50), float((q75 - q25) / q50)
+
+def time_calls(fn, min_time=MIN_TIME, repeats=REPEATS):
+    """
+    Calls/second of fn() over `repeats` runs of at least min_time:
+    (median, relative spread), see summarize_rates
+    """
+    fn()  # warm-up (imports, caches, allocations)
+    rates = []
+    for _ in range(repeats):
+        n, start = 0, time.perf_counter()
+        while True:
+            fn()
+            n += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rates.append(n / elapsed)
+    return summarize_rates(rates)
+
+def bench_model(name, size, fn, results):
+    rate, spread = time_calls(fn)
+    results.append({'name': name, 'size': size, 'calls_per_sec': rate, 'spread': spread})
+    print(f"  {name:<32} {str(size):>8}  {rate:12.1f} calls/s  {1e6 / rate:12.1f} µs/call"
+          f"  ±{spread:.1%}")
+
+def H_zero_field_cold(z):
+    """H(z) at THETA solved from scratch: no cached history, no shooting warm start"""
+    background.SHOOTING_CACHE.clear()
+    return background.H_zero_field_batch(z, *THETA, cache=None)
+
+def bench_suite(label, data, results):
+    """Model and likelihood benchmarks on one dataset"""
+    bao, sn = data
+    z_bao, z_sn = bao[0], sn[0]
+    size = label if label == 'bundled' else len(z_sn)
+    thetas = THETA * (1 + 1e-4 * np.random.default_rng(0).standard_normal((NWALKERS, 3)))
+
+    bench_model('mu_lcdm', size, lambda: chi2_sn.mu_lcdm(z_sn), results)
+    bench_model('DV_lcdm', size, lambda: chi2_bao.DV_lcdm(z_bao), results)
+    bench_model('DV_zero_field', size, lambda: chi2_bao.DV_zero_field(z_bao), results)
+    bench_model('H_zero_field[cold]', size, lambda: H_zero_field_cold(z_sn), results)
+    bench_model('H_zero_field[warm]', size,
+                lambda: background.H_zero_field(z_sn, *THETA), results)
+    bench_model('chi2_total', size, lambda: mcmc_exploration.chi2_total(THETA, data), results)
+    bench_model('log_probability', size,
+                lambda: mcmc_exploration.log_probability(THETA, data), results)
+    bench_model(f'log_probability_batch[{NWALKERS}]', size,
+                lambda: mcmc_exploration.log_probability_batch(thetas, data), results)
+
+def bench_mcmc(data, nsteps, results):
+    """End-to-end sampler throughput (vectorized, serial), median of MCMC_REPEATS runs"""
+    mcmc_exploration.run_mcmc(data, nwalkers=NWALKERS, nsteps=min(nsteps, 10), nburn=0)  # warm-up
+    rates = []
+    for _ in range(MCMC_REPEATS):
+        np.random.seed(0)
+        start = time.perf_counter()
+        sampler = mcmc_exploration.run_mcmc(data, nwalkers=NWALKERS, nsteps=nsteps, nburn=0)
+        rates.append(sampler.iteration / (time.perf_counter() - start))
+    rate, spread = summarize_rates(rates)
+    results.append({'name': f'mcmc_steps[{NWALKERS} walkers]', 'size': 'bundled',
+                    'calls_per_sec': rate, 'spread': spread})
+    print(f"  {'mcmc_steps':<32} {'bundled':>8}  {rate:12.1f} steps/s  ±{spread:.1%}")
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare(results, baseline, tolerance):
+    """
+    Print current/baseline ratios of the median throughputs; return the
+    regressed entries: slower than 1 - tolerance minus the noise bands of
+    the current and baseline figures (baselines without one count as 0)
+    """
+    ref = {(r['name'], str(r['size'])): r for r in baseline['results']}
+    regressions = []
+    print(f"\n  {'benchmark':<32} {'size':>8}  {'ratio':>8}  {'noise':>7}")
+    for r in results:
+        old = ref.get((r['name'], str(r['size'])))
+        if old is None:
+            continue
+        ratio = r['calls_per_sec'] / old['calls_per_sec']
+        noise = r.get('spread', 0.0) + old.get('spread', 0.0)
+        flag = ''
+        if ratio < 1 - tolerance - noise:
+            regressions.append(r)
+            flag = '  REGRESSION'
+        print(f"  {r['name']:<32} {str(r['size']):>8}  {ratio:8.2f}  ±{noise:6.1%}{flag}")
+    return regressions
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot-path throughput benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='*', default=SIZES,
+                        help=f'Synthetic catalog sizes (default: {SIZES})')
+    parser.add_argument('--mcmc-steps', type=int, default=200,
+                        help='Steps of the end-to-end MCMC benchmark (0 disables; default: 200)')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='Results file (default: benchmark_results.json)')
+    parser.add_argument('--compare', default=None, help='Baseline results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed throughput loss vs baseline (default: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = []
+    print(f"  {'benchmark':<32} {'size':>8}")
+    bench_suite('bundled', bundled_data(), results)
+    for n in args.sizes:
+        bench_suite(n, synthetic_data(n), results)
+    if args.mcmc_steps > 0:
+        bench_mcmc(bundled_data(), args.mcmc_steps, results)
+
+    with open(args.output, 'w') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+    print(f"\nResults: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than baseline by > "
+                  f"{args.tolerance:.0%} beyond the noise band")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
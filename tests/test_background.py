@@ -0,0 +1,109 @@
+import warnings
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+import background
+from background import (GEV_PER_H_UNIT, H_lcdm, ShootingCache, SolverFallbackWarning,
+                        background_histories, solve_background_batch,
+                        solve_zero_field_adaptive, solve_zero_field_batch,
+                        solve_zero_field_shooting, standard_a_grid)
+
+A = standard_a_grid()
+Z = 1 / A - 1
+H0 = np.array([65.0, 70.0, 75.0])
+OMEGA_M = np.array([0.25, 0.30, 0.35])
+M_PHI = np.array([1e-42, 5e-42, 2e-41])
+
+def test_rk4_batch_matches_single_member_solves():
+    batch = solve_zero_field_batch(A, H0, OMEGA_M, M_PHI)
+    assert batch.shape == (len(A), 3, len(H0))
+    for i in range(len(H0)):
+        single = solve_zero_field_batch(A, H0[i], OMEGA_M[i], M_PHI[i])
+        np.testing.assert_array_equal(single[:, :, 0], batch[:, :, i])
+
+def test_adaptive_agrees_with_rk4():
+    rk4 = solve_zero_field_batch(A, H0, OMEGA_M, M_PHI)
+    adaptive = solve_zero_field_adaptive(A, H0, OMEGA_M, M_PHI)
+    np.testing.assert_allclose(adaptive[:, 2, :], rk4[:, 2, :], rtol=1e-7)
+
+def test_adaptive_matches_solve_ivp_below_wkb_threshold():
+    # Resolved regime up to just under the WKB switch, where the field moves
+    # through most of its amplitude: DP5(4) vs scipy at tight tolerance
+    m_phi = np.array([0.5, 5.0, 9.5]) * H0
+    assert np.all(m_phi / H0 < background.WKB_THRESHOLD)
+    adaptive = solve_zero_field_adaptive(A, H0, OMEGA_M, m_phi)
+    x = np.log(A)
+    for i in range(len(H0)):
+        args = (H0[i], OMEGA_M[i], m_phi[i])
+        y0 = [background.PHI0, background.PHI_DOT0, H0[i]]
+        sol = solve_ivp(lambda x, y: np.exp(x) * background.friedmann_zero_field(y, np.exp(x), *args),
+                        [x[0], x[-1]], y0, t_eval=x, rtol=1e-11, atol=1e-14)
+        assert sol.success
+        np.testing.assert_allclose(adaptive[:, 2, i], sol.y[2], rtol=1e-7)
+        for j in (0, 1):   # φ, φ̇: relative to the scale of each component
+            np.testing.assert_allclose(adaptive[:, j, i], sol.y[j],
+                                       atol=1e-5 * np.abs(sol.y[j]).max())
+
+def test_shooting_closure_and_order_independence():
+    m_phi = 10 * M_PHI
+    out = solve_zero_field_shooting(A, H0, OMEGA_M, m_phi, cache=None)
+    np.testing.assert_allclose(out['H'][0], H0, rtol=1e-8)
+    rev = solve_zero_field_shooting(A, H0[::-1], OMEGA_M[::-1], m_phi[::-1], cache=None)
+    np.testing.assert_allclose(rev['H'][:, ::-1], out['H'], rtol=1e-12)
+
+def test_shooting_frozen_field_is_lcdm():
+    out = solve_zero_field_shooting(A, H0, OMEGA_M, 0.0, cache=None)
+    np.testing.assert_allclose(out['H'], H_lcdm(Z[:, None], H0, OMEGA_M), rtol=1e-12)
+
+def test_shooting_matches_solve_ivp_below_wkb_threshold():
+    H0_, Om, m_phi = 70.0, 0.3, 2e-42
+    out = solve_zero_field_shooting(A, H0_, Om, m_phi, cache=None)
+    mu = m_phi / GEV_PER_H_UNIT / H0_
+    psi_i = out['phi_i'][0] * mu
+    sol = solve_ivp(lambda x, y: background._rhs_shooting(x, y, Om, mu, False),
+                    [-np.log1p(background.Z_INITIAL), 0.0], [psi_i, 0.0],
+                    rtol=1e-11, atol=1e-14)
+    h0 = np.sqrt(Om + (sol.y[0, -1]**2 + sol.y[1, -1]**2) / 6)
+    assert h0 * H0_ == pytest.approx(out['H'][0, 0], rel=1e-8)
+
+def test_shooting_warm_start_gives_same_solution():
+    cache = ShootingCache()
+    m_phi = 10 * M_PHI
+    cold = solve_zero_field_shooting(A, H0, OMEGA_M, m_phi, cache=cache)
+    warm = solve_zero_field_shooting(A, H0 * 1.001, OMEGA_M, m_phi, cache=cache)
+    ref = solve_zero_field_shooting(A, H0 * 1.001, OMEGA_M, m_phi, cache=None)
+    assert cache.info()['size'] == 2 * len(H0)
+    np.testing.assert_allclose(warm['H'], ref['H'], rtol=1e-7)
+    np.testing.assert_allclose(cold['H'][0], H0, rtol=1e-8)
+
+def test_shooting_converges_at_reported_failure():
+    # Regression: the WKB switch used to depend on ψ_i, making ρ_φ0(ψ_i)
+    # discontinuous and the root bracket collapse without convergence
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', SolverFallbackWarning)
+        out = solve_background_batch(70.0, 0.3, 8.9e-41)
+    assert out['ok'].all()
+    H1 = np.interp(1.0, out['z'], out['H'][:, 0])
+    assert H1 == pytest.approx(198.0, rel=1e-3)
+    assert out['H'][0, 0] == pytest.approx(70.0, rel=1e-8)
+
+def test_shooting_converges_over_the_prior():
+    rng = np.random.default_rng(0)
+    n = 500
+    H0 = rng.uniform(60, 80, n)
+    Om = rng.uniform(0.2, 0.4, n)
+    m_phi = rng.uniform(0, 1e-40, n)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', SolverFallbackWarning)
+        out = solve_background_batch(H0, Om, m_phi)
+    assert out['ok'].all()
+    np.testing.assert_allclose(out['H'][0], H0, rtol=1e-7)
+
+def test_failed_members_warn_and_are_not_cached():
+    cache = background.BackgroundCache()
+    with pytest.warns(SolverFallbackWarning):
+        out = background_histories([70.0, 70.0], [0.3, 1.2], [1e-42, 1e-42], cache=cache)
+    assert out['ok'].tolist() == [True, False]
+    assert cache.info()['size'] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import bestfit
+from mcmc_exploration import PRIOR_BOUNDS
+
+SIGMA = np.array([1.0, 0.01, 1e-41])
+
+class QuadraticObjective(bestfit.Objective):
+    """χ² = Σ ((θ - center) / σ)² on the free parameters, no data"""
+
+    def __init__(self, center, fixed=None):
+        super().__init__(None, fixed)
+        self.center = np.asarray(center)[self.free]
+
+    def __call__(self, u):
+        theta = self.theta(u)[:, self.free]
+        return np.sum(((theta - self.center) / SIGMA[self.free])**2, axis=1)
+
+def fit_quadratic(center, fixed=None):
+    objective = QuadraticObjective(center, fixed)
+    u = (np.clip(objective.center, objective.lo, objective.hi) - objective.lo) / (objective.hi - objective.lo)
+    return bestfit.summarize(objective, [{'u': u, 'chi2': float(objective(u)[0]), 'nfev': 1,
+                                          'success': True}])
+
+def test_interior_minimum_has_hessian_errors():
+    fit = fit_quadratic([70.0, 0.3, 5e-41])
+    assert not any(fit['at_bound'].values())
+    for name, sigma in zip(['H0', 'Omega_m', 'm_phi'], SIGMA):
+        assert fit['errors'][name] == pytest.approx(sigma, rel=1e-3)
+
+def test_minimum_on_prior_bound_is_flagged():
+    fit = fit_quadratic([55.0, 0.3, 5e-41])
+    assert fit['theta'][0] == PRIOR_BOUNDS[0, 0]
+    assert fit['at_bound'] == {'H0': True, 'Omega_m': False, 'm_phi': False}
+    assert np.isnan(fit['errors']['H0'])
+    assert fit['errors']['Omega_m'] == pytest.approx(0.01, rel=1e-3)
+
+def seeded(fit, n=2000):
+    return bestfit.seed_walkers(fit, n, rng=np.random.default_rng(0))
+
+def test_seeded_h0_stays_near_the_best_fit_with_unconstrained_neighbours():
+    # Omega_m and m_phi unconstrained: NaN off-diagonals in the covariance
+    fit = {'free': ['H0', 'Omega_m', 'm_phi'], 'theta': [70.0, 0.3, 5e-41],
+           'covariance': [[1.5, np.nan, np.nan], [np.nan] * 3, [np.nan] * 3],
+           'constrained': {'H0': True, 'Omega_m': False, 'm_phi': False},
+           'at_bound': {'H0': False, 'Omega_m': False, 'm_phi': False}}
+    pos = seeded(fit)
+    sigma = np.sqrt(1.5)
+    assert np.all(np.abs(pos[:, 0] - 70.0) < 5 * sigma)
+    assert np.std(pos[:, 0]) == pytest.approx(sigma, rel=0.1)
+    assert np.std(pos[:, 1]) > 0.05  # uniform over the 0.2-0.4 prior
+
+def test_seeding_at_a_bound_is_one_sided():
+    fit = fit_quadratic([55.0, 0.3, 5e-41])
+    pos = seeded(fit)
+    assert np.all(pos[:, 0] > PRIOR_BOUNDS[0, 0])
+    assert np.all(pos[:, 0] < PRIOR_BOUNDS[0, 0] + 5 * np.sqrt(fit['covariance'][0][0]))
+    assert np.all(np.abs(pos[:, 1] - 0.3) < 5 * 0.01)
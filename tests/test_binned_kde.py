@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from binned_kde import BinnedKDE, hpd_interval, hpd_levels
+
+N = 200_000
+COV = np.array([[1.0, 0.6], [0.6, 2.0]])
+
+@pytest.fixture(scope='module')
+def kde():
+    samples = np.random.default_rng(0).multivariate_normal([1.0, -2.0], COV, N)
+    return BinnedKDE(samples)
+
+def test_hpd_levels_of_a_known_density():
+    density = np.array([4.0, 3.0, 2.0, 1.0])   # masses 0.4, 0.3, 0.2, 0.1
+    np.testing.assert_array_equal(hpd_levels(density, [0.4, 0.7, 0.9]), [4.0, 3.0, 2.0])
+
+@pytest.mark.parametrize('fraction', [0.68, 0.95])
+def test_gaussian_2d_contour_levels(kde, fraction):
+    x, y, f = kde.density2d(0, 1)
+    cell = (x[1] - x[0]) * (y[1] - y[0])
+    assert f.sum() * cell == pytest.approx(1.0)
+
+    # Bivariate normal (covariance broadened by the Scott kernel): the HPD
+    # region of mass p is the ellipse r² = -2 ln(1 - p)
+    smoothed = COV * (1 + N**(-1 / 3))
+    peak = 1 / (2 * np.pi * np.sqrt(np.linalg.det(smoothed)))
+    level = hpd_levels(f, [fraction])[0]
+    assert level == pytest.approx(peak * (1 - fraction), rel=0.03)
+    assert f[f >= level].sum() * cell == pytest.approx(fraction, abs=0.01)
+
+@pytest.mark.parametrize('i', [0, 1])
+@pytest.mark.parametrize('fraction, z', [(0.68, 0.9945), (0.95, 1.96)])
+def test_gaussian_1d_marginal_widths(kde, i, fraction, z):
+    x, pdf = kde.density1d(i)
+    sigma = np.sqrt(COV[i, i] * (1 + N**(-2 / 5)))
+    low, high = hpd_interval(x, pdf, fraction)
+    bin_width = x[1] - x[0]
+    assert high - low == pytest.approx(2 * z * sigma, abs=2 * bin_width)
+    assert 0.5 * (low + high) == pytest.approx(kde.samples[:, i].mean(), abs=bin_width)
+
+def test_1d_histogram_is_the_marginal_of_the_cached_pair(kde):
+    kde.histogram2d(0, 1)
+    direct = np.histogram(kde.samples[:, 1], bins=kde.edges[1])[0]
+    np.testing.assert_array_equal(kde.histogram1d(1), direct)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+emcee = pytest.importorskip('emcee')
+
+import mcmc_exploration
+from chain_backend import ChainCheckpoint
+
+NWALKERS, NBURN, NSTEPS, EVERY = 8, 20, 30, 10
+
+def state_after(rng, nwalkers=4, ndim=3):
+    return emcee.State(rng.standard_normal((nwalkers, ndim)),
+                       log_prob=rng.standard_normal(nwalkers),
+                       random_state=np.random.RandomState(0).get_state())
+
+def write_chunks(checkpoint, phase, sizes, rng):
+    chain = rng.standard_normal((sum(sizes), 4, 3))
+    log_prob = rng.standard_normal((sum(sizes), 4))
+    start = 0
+    for k in sizes:
+        checkpoint.append(phase, chain[start:start + k], log_prob[start:start + k],
+                          np.full(4, start + k), state_after(rng))
+        start += k
+    return chain, log_prob
+
+def test_chunks_reload_as_concatenated_chain(tmp_path):
+    checkpoint = ChainCheckpoint(str(tmp_path), every=EVERY)
+    rng = np.random.default_rng(0)
+    burnin, _ = write_chunks(checkpoint, 'burnin', [10, 10], rng)
+    chain, log_prob = write_chunks(checkpoint, 'production', [10, 10, 5], rng)
+    assert checkpoint.steps() == {'burnin': 20, 'production': 25}
+    loaded, loaded_lp = checkpoint.load('production')
+    np.testing.assert_array_equal(loaded, chain)
+    np.testing.assert_array_equal(loaded_lp, log_prob)
+    np.testing.assert_array_equal(checkpoint.load('burnin')[0], burnin)
+
+    backend = checkpoint.to_backend('production')
+    assert backend.iteration == 25
+    np.testing.assert_array_equal(backend.get_chain(), chain)
+
+class Crash(Exception):
+    pass
+
+def run(checkpoint, resume=False):
+    ball = np.random.default_rng(1).standard_normal((NWALKERS, 3))
+    start = mcmc_exploration.FIDUCIAL * (1 + 1e-4 * ball)
+    return mcmc_exploration.run_mcmc(mcmc_exploration.load_data(), nwalkers=NWALKERS,
+                                     nsteps=NSTEPS, nburn=NBURN, checkpoint=checkpoint,
+                                     resume=resume, start=start, seed=42)
+
+@pytest.mark.parametrize('crash_step', [15, 35], ids=['burnin', 'production'])
+def test_resume_after_crash_reproduces_straight_run(tmp_path, monkeypatch, crash_step):
+    straight = run(ChainCheckpoint(str(tmp_path / 'straight'), every=EVERY))
+
+    # Vectorized stretch move: one log-prob call for the initial state, two per step
+    log_probability_batch = mcmc_exploration.log_probability_batch
+    calls = []
+    def crashing(*args, **kwargs):
+        calls.append(1)
+        if len(calls) > 1 + 2 * crash_step:
+            raise Crash
+        return log_probability_batch(*args, **kwargs)
+
+    checkpoint = ChainCheckpoint(str(tmp_path / 'crashed'), every=EVERY)
+    monkeypatch.setattr(mcmc_exploration, 'log_probability_batch', crashing)
+    with pytest.raises(Crash):
+        run(checkpoint)
+    monkeypatch.undo()
+    done = checkpoint.steps()
+    assert done['burnin'] + done['production'] == crash_step // EVERY * EVERY
+
+    resumed = run(checkpoint, resume=True)
+    np.testing.assert_array_equal(resumed.get_chain(), straight.get_chain())
+    np.testing.assert_array_equal(resumed.get_log_prob(), straight.get_log_prob())
+    np.testing.assert_array_equal(checkpoint.load('burnin')[0],
+                                  ChainCheckpoint(str(tmp_path / 'straight')).load('burnin')[0])
+
+def test_partial_chunk_after_state_is_ignored(tmp_path):
+    checkpoint = ChainCheckpoint(str(tmp_path), every=EVERY)
+    rng = np.random.default_rng(2)
+    chain, _ = write_chunks(checkpoint, 'production', [10, 10], rng)
+    # Crash while writing the next chunk: half a file, state not updated
+    good = open(checkpoint._chunk_path('production', 0), 'rb').read()
+    with open(checkpoint._chunk_path('production', 20), 'wb') as f:
+        f.write(good[:len(good) // 2])
+    np.testing.assert_array_equal(checkpoint.load('production')[0], chain)
+
+    # Resuming rewrites that chunk
+    more, _ = write_chunks(checkpoint, 'production', [10], rng)
+    np.testing.assert_array_equal(checkpoint.load('production')[0], np.concatenate([chain, more]))
+
+def test_corrupt_or_missing_recorded_chunk_raises(tmp_path):
+    checkpoint = ChainCheckpoint(str(tmp_path), every=EVERY)
+    write_chunks(checkpoint, 'production', [10, 10], np.random.default_rng(3))
+    path = checkpoint._chunk_path('production', 10)
+    with open(path, 'r+b') as f:
+        f.truncate(100)
+    with pytest.raises(RuntimeError, match='Corrupt checkpoint chunk'):
+        checkpoint.load('production')
+
+    (tmp_path / 'production_00000010.npz').unlink()
+    with pytest.raises(RuntimeError, match='records 20 production steps'):
+        checkpoint.load('production')
@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+import mcmc_exploration
+from chi2_grid import PROBES, Chi2Grid, build_grid
+
+SHAPE = (4, 3, 2)
+
+def write_grid(path, axes, total):
+    """chi2_grid layout for an analytic χ² table (same values for every probe)"""
+    np.save(path / 'chi2.npy', np.stack([total] * len(PROBES)))
+    with open(path / 'axes.json', 'w') as f:
+        json.dump({'params': mcmc_exploration.PARAM_NAMES, 'probes': PROBES,
+                   'axes': [a.tolist() for a in axes]}, f)
+    return Chi2Grid(str(path))
+
+@pytest.fixture(scope='module')
+def built(tmp_path_factory):
+    path = tmp_path_factory.mktemp('grid')
+    return build_grid(mcmc_exploration.load_data(), str(path), shape=SHAPE)
+
+def test_memmap_round_trip_matches_direct_chi2(built):
+    reopened = Chi2Grid(built.path)
+    assert isinstance(reopened.table, np.memmap)
+    assert reopened.table.shape == (len(PROBES),) + SHAPE
+    for axis, (lo, hi), n in zip(reopened.axes, mcmc_exploration.PRIOR_BOUNDS, SHAPE):
+        np.testing.assert_array_equal(axis, np.linspace(lo, hi, n))
+
+    points = np.stack(np.meshgrid(*reopened.axes, indexing='ij'), axis=-1).reshape(-1, 3)
+    bao, sn = mcmc_exploration.load_data()
+    np.testing.assert_array_equal(reopened.values('bao').ravel(),
+                                  mcmc_exploration.chi2_bao_batch(points, bao))
+    np.testing.assert_array_equal(reopened.values('sn').ravel(),
+                                  mcmc_exploration.chi2_sn_batch(points, sn))
+    np.testing.assert_array_equal(reopened.values('total'),
+                                  reopened.values('bao') + reopened.values('sn'))
+
+def test_workers_write_the_same_table(built, tmp_path):
+    pooled = build_grid(mcmc_exploration.load_data(), str(tmp_path), shape=SHAPE, workers=2)
+    np.testing.assert_array_equal(pooled.table, built.table)
+
+AXES = [np.linspace(-5, 5, 101), np.linspace(-5, 5, 81), np.linspace(-1, 1, 5)]
+
+def test_interpolation_is_exact_for_a_linear_table(tmp_path):
+    coeffs = np.array([1.5, -2.0, 0.25])
+    mesh = np.meshgrid(*AXES, indexing='ij')
+    grid = write_grid(tmp_path, AXES, 10 + sum(c * m for c, m in zip(coeffs, mesh)))
+    theta = np.random.default_rng(0).uniform([-5, -5, -1], [5, 5, 1], (50, 3))
+    np.testing.assert_allclose(grid.chi2(theta), 10 + theta @ coeffs)
+    assert grid.chi2([6.0, 0.0, 0.0])[0] == 1e10   # outside the prior box
+
+def test_profile_and_marginal_of_a_correlated_gaussian(tmp_path):
+    # χ² = θᵀ C⁻¹ θ over (x, y), flat in the third axis: both the profile and
+    # the marginal of x are those of N(0, σx²), with σx² = C[0, 0]
+    cov = np.array([[1.0, 0.5], [0.5, 0.8]])
+    x, y, _ = np.meshgrid(*AXES, indexing='ij')
+    xy = np.stack([x, y], axis=-1)
+    grid = write_grid(tmp_path, AXES, np.einsum('...i,ij,...j', xy, np.linalg.inv(cov), xy))
+
+    axis, dchi2 = grid.profile('H0')
+    np.testing.assert_array_equal(axis, AXES[0])
+    inside = np.abs(axis) < 3
+    np.testing.assert_allclose(dchi2[inside], axis[inside]**2 / cov[0, 0], atol=0.02)
+
+    axis, pdf = grid.marginal('H0')
+    np.testing.assert_allclose(pdf, norm.pdf(axis, scale=np.sqrt(cov[0, 0])), atol=2e-3)
+    axis, pdf = grid.marginal('m_phi')
+    np.testing.assert_allclose(pdf, 0.5)   # flat direction: uniform on [-1, 1]
+
+    theta, chi2_min = grid.best_fit()
+    np.testing.assert_allclose(theta[:2], 0.0, atol=1e-12)
+    assert chi2_min == 0.0
+    walkers = grid.initial_walkers(16, seed=0)
+    assert np.all(np.abs(walkers[:, :2]) < 1e-2)
+    assert np.all((walkers[:, 2] > -1) & (walkers[:, 2] < 1))
+
+def test_plotting_stage_reads_grid_marginals(built):
+    import plot_constraints
+    for (axis, pdf), name in zip(plot_constraints.grid_marginals(built.path), built.params):
+        expected = built.marginal(name)
+        np.testing.assert_array_equal(axis, expected[0])
+        np.testing.assert_array_equal(pdf, expected[1])
@@ -0,0 +1,17 @@
+import numpy as np
+
+from chi2_stream import Chi2Accumulator
+
+def test_out_of_range_redshifts_go_to_underflow_and_overflow():
+    acc = Chi2Accumulator([0.0, 1.0, 2.0])
+    z = np.array([-0.1, 0.0, 0.5, 1.0, 2.0, 2.5, 4.0])
+    r = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0])
+    acc.add(z, r, np.ones_like(r))
+    bins = acc.bins()
+    assert bins['n'] == [2, 2]               # 2.0 closes the last bin
+    assert bins['mean_residual'] == [2.5, 4.5]
+    assert bins['underflow']['n'] == 1
+    assert bins['underflow']['mean_residual'] == 1.0
+    assert bins['overflow']['n'] == 2
+    assert bins['overflow']['chi2'] == 6.0**2 + 8.0**2
+    assert acc.chi2() == np.sum(r**2)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+from scipy.optimize import minimize_scalar
+
+from chi2_sn import chi2_offset
+from covariance import CholeskyCovariance, chi2_residuals
+
+def random_covariance(n, seed=0):
+    rng = np.random.default_rng(seed)
+    a = rng.standard_normal((n, n))
+    return a @ a.T + n * np.eye(n)
+
+def test_cholesky_chi2_matches_direct_solve():
+    cov = random_covariance(12)
+    r = np.random.default_rng(1).standard_normal((5, 12))
+    expected = np.einsum('ij,ij->i', r, np.linalg.solve(cov, r.T).T)
+    factor = CholeskyCovariance.from_matrix(cov)
+    np.testing.assert_allclose(chi2_residuals(r, factor), expected, rtol=1e-12)
+    assert chi2_residuals(r[0], factor) == pytest.approx(expected[0], rel=1e-12)
+    np.testing.assert_allclose(factor.sigma, np.sqrt(np.diag(cov)), rtol=1e-12)
+
+def test_diagonal_errors_match_diagonal_covariance():
+    sigma = np.array([0.1, 0.2, 0.3, 0.4])
+    r = np.array([0.3, -0.1, 0.2, 0.5])
+    factor = CholeskyCovariance.from_matrix(np.diag(sigma**2))
+    assert chi2_residuals(r, sigma) == pytest.approx(np.sum((r / sigma)**2))
+    assert chi2_residuals(r, factor) == pytest.approx(np.sum((r / sigma)**2))
+
+def test_non_positive_definite_covariance_raises():
+    with pytest.raises(ValueError):
+        CholeskyCovariance.from_matrix([[1.0, 2.0], [2.0, 1.0]])
+
+@pytest.mark.parametrize('errors', ['diagonal', 'full'])
+def test_offset_profile_and_marginalization(errors):
+    n = 8
+    rng = np.random.default_rng(2)
+    r = rng.standard_normal(n) + 0.7
+    cov = random_covariance(n, seed=3) * 0.01
+    err = np.sqrt(np.diag(cov)) if errors == 'diagonal' else CholeskyCovariance.from_matrix(cov)
+    chi2_at = lambda M: chi2_residuals(r - M, err)
+
+    # profile: minimum over the offset
+    profiled = minimize_scalar(chi2_at, bracket=(-1.0, 1.0), tol=1e-12).fun
+    assert chi2_offset(r, err, 'profile') == pytest.approx(profiled, abs=1e-6)
+
+    # marginalize: -2 ln ∫ exp(-χ²(M)/2) dM with a flat prior
+    integral, _ = quad(lambda M: np.exp(-0.5 * (chi2_at(M) - profiled)), -10, 10, points=[0.7])
+    expected = profiled - 2 * np.log(integral)
+    assert chi2_offset(r, err, 'marginalize') == pytest.approx(expected, abs=1e-6)
+
+def test_offset_batched_matches_single():
+    sigma = np.full(6, 0.1)
+    r = np.random.default_rng(4).standard_normal((3, 6))
+    batched = chi2_offset(r, sigma, 'marginalize')
+    np.testing.assert_allclose(batched, [chi2_offset(row, sigma, 'marginalize') for row in r])
+
+def test_unknown_offset_mode_raises():
+    with pytest.raises(ValueError):
+        chi2_offset(np.zeros(3), np.ones(3), 'fit')
@@ -0,0 +1,13 @@
+import numpy as np
+
+from datasets import load_table
+
+def test_text_columns_are_bundled_as_strings(tmp_path):
+    path = tmp_path / 'survey.csv'
+    path.write_text('z,survey,sigma_mu\n0.1,SDSS,0.15\n0.5,,0.2\n')
+    table = load_table(str(path))
+    np.testing.assert_array_equal(table['z'], [0.1, 0.5])
+    assert table['sigma_mu'].dtype == np.float64
+    assert table['survey'].tolist() == ['SDSS', '']
+    # second load maps the bundle instead of parsing the CSV
+    assert load_table(str(path), ['survey'], build=False)['survey'].tolist() == ['SDSS', '']
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy.special import hyp2f1
+
+from background import H_lcdm
+from distances import (C_LIGHT, distances, distances_from_H, interp_on_grid, interp_weights,
+                       master_grid)
+
+Z = np.array([0.01, 0.1, 0.35, 0.8, 1.5, 2.33])
+# Linear interpolation between N_GRID nodes dominates the error (worst at low z)
+RTOL = 3e-5
+
+def comoving_lcdm(z, H0, Omega_m):
+    """Flat ΛCDM D_C in closed form: c/H0 ∫ dz/E with E² = Ωm(1+z)³ + ΩΛ"""
+    Omega_l = 1 - Omega_m
+    if Omega_l == 0:   # Einstein-de Sitter
+        return 2 * C_LIGHT / H0 * (1 - 1 / np.sqrt(1 + z))
+    F = lambda x: x * hyp2f1(1 / 3, 1 / 2, 4 / 3, -Omega_m * x**3 / Omega_l)
+    return C_LIGHT / H0 * (F(1 + z) - F(1.0)) / np.sqrt(Omega_l)
+
+@pytest.mark.parametrize('H0, Omega_m', [(70.0, 0.3), (67.4, 0.315), (60.0, 1.0), (72.0, 0.0)])
+def test_lcdm_distances_match_closed_form(H0, Omega_m):
+    d = distances(Z, lambda z: H_lcdm(z, H0, Omega_m))
+    D_M = comoving_lcdm(Z, H0, Omega_m)
+    np.testing.assert_allclose(d['D_M'], D_M, rtol=RTOL)
+    np.testing.assert_allclose(d['D_L'], (1 + Z) * D_M, rtol=RTOL)
+    np.testing.assert_allclose(d['D_A'], D_M / (1 + Z), rtol=RTOL)
+    D_V = np.cbrt(Z * D_M**2 * C_LIGHT / H_lcdm(Z, H0, Omega_m))
+    np.testing.assert_allclose(d['D_V'], D_V, rtol=RTOL)
+    np.testing.assert_allclose(d['mu'], 5 * np.log10((1 + Z) * D_M) + 25, atol=1e-4)
+
+def test_batched_rows_match_single_models():
+    z_grid = master_grid(Z.max())
+    H0, Omega_m = np.array([[65.0], [70.0], [75.0]]), np.array([[0.25], [0.3], [0.35]])
+    batch = distances_from_H(Z, z_grid, H_lcdm(z_grid, H0, Omega_m))
+    for i in range(3):
+        single = distances_from_H(Z, z_grid, H_lcdm(z_grid, H0[i, 0], Omega_m[i, 0]))
+        for key in single:
+            assert batch[key].shape == (3, len(Z))
+            np.testing.assert_allclose(batch[key][i], single[key], rtol=1e-14)
+
+def test_interp_weights_bracket_and_reconstruct_z():
+    z_grid = master_grid(2.0, 101)
+    z = np.concatenate([Z[Z < 2], z_grid[[0, 37, -1]]])
+    idx, frac = interp_weights(z, z_grid)
+    assert np.all((idx >= 0) & (idx <= len(z_grid) - 2))
+    assert np.all((frac >= 0) & (frac <= 1))
+    np.testing.assert_allclose(z_grid[idx] * (1 - frac) + z_grid[idx + 1] * frac, z, atol=1e-15)
+    # Grid nodes land on their own bracket; the last node closes the last interval
+    assert (idx[-3], frac[-3]) == (0, 0.0)
+    assert (idx[-2], frac[-2]) == (37, 0.0)
+    assert (idx[-1], frac[-1]) == (len(z_grid) - 2, 1.0)
+
+def test_interp_on_grid_is_exact_for_linear_tables():
+    z_grid = master_grid(2.0, 64)
+    table = np.stack([3 + 2 * z_grid, -z_grid])   # batched (2, n_grid)
+    idx, frac = interp_weights(Z[Z < 2], z_grid)
+    np.testing.assert_allclose(interp_on_grid(table, idx, frac),
+                               [3 + 2 * Z[Z < 2], -Z[Z < 2]], rtol=1e-13)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from background import H_zero_field_batch
+from emulator import EmulatorAccuracyError, HubbleEmulator, build_emulator, validate
+from mcmc_exploration import PRIOR_BOUNDS
+
+@pytest.fixture(scope='module')
+def emulator():
+    return build_emulator(PRIOR_BOUNDS, n_test=64)
+
+def test_build_meets_stated_tolerance(emulator):
+    report = validate(emulator, n_test=128, seed=5)
+    assert report['rms_rel_error'] < 2e-3
+    assert report['p99_rel_error'] < 5e-3
+
+def test_matches_solver_at_fiducial(emulator):
+    z = np.array([0.1, 0.5, 1.0, 2.0])
+    exact = H_zero_field_batch(z, 70.0, 0.3, 1e-42, cache=None)
+    np.testing.assert_allclose(emulator.H_zero_field_batch(z, 70.0, 0.3, 1e-42), exact, rtol=1e-3)
+
+def test_coarse_grid_fails_the_gate():
+    with pytest.raises(EmulatorAccuracyError):
+        build_emulator(PRIOR_BOUNDS, grid=(3, 9), n_test=32, max_refine=0)
+
+def test_save_load_roundtrip(emulator, tmp_path):
+    path = tmp_path / 'hz.npz'
+    emulator.save(path)
+    loaded = HubbleEmulator.load(path)
+    thetas = [[65.0, 0.25, 3e-41], [75.0, 0.35, 8e-41]]
+    np.testing.assert_array_equal(loaded.H_grid(thetas), emulator.H_grid(thetas))
+    assert loaded.report['rms_rel_error'] == emulator.report['rms_rel_error']
+
+def test_load_rejects_emulator_of_another_solver(emulator, tmp_path, monkeypatch):
+    import background
+    path = tmp_path / 'hz.npz'
+    emulator.save(path)
+    monkeypatch.setattr(background, 'SOLVER', 'adaptive')
+    with pytest.raises(ValueError, match='retrain'):
+        HubbleEmulator.load(path)
@@ -0,0 +1,52 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import fisher
+from background import GEV_PER_H_UNIT, SolverFallbackWarning, H_lcdm
+from fisher import FisherEngine, FisherStepWarning, bundled_survey
+
+Z = np.array([0.2, 0.5, 1.0, 2.0])
+
+def test_one_sided_stencils_match_central(monkeypatch):
+    central = FisherEngine()
+    monkeypatch.setitem(fisher.PARAM_RANGE, 'Omega_m', (0.0, 0.3))
+    backward = FisherEngine()
+    monkeypatch.setitem(fisher.PARAM_RANGE, 'Omega_m', (0.3, 1.0))
+    forward = FisherEngine()
+    assert (backward.sides[1], forward.sides[1]) == ('backward', 'forward')
+    for engine in (backward, forward):
+        np.testing.assert_allclose(engine.derivatives('H_over_rd', Z)[:, 1],
+                                   central.derivatives('H_over_rd', Z)[:, 1], rtol=1e-5)
+
+def test_lcdm_fiducial_uses_absolute_forward_step():
+    engine = FisherEngine([70.0, 0.3, 0.0])
+    assert engine.sides == ['central', 'central', 'forward']
+    assert engine.h[2] == fisher.ABS_STEP['m_phi']
+    # H - H_ΛCDM is quadratic in m_phi: no linear response at m_phi = 0
+    d = engine.derivatives('H_over_rd', Z)[:, 2] * engine.scale[2]
+    assert np.max(np.abs(d)) < 1e-6
+    with pytest.raises(ValueError, match='needs a prior'):
+        engine.forecast(bundled_survey())
+    result = engine.forecast(bundled_survey(), priors={'m_phi': 1e-42})
+    assert result['errors']['m_phi'] == pytest.approx(1e-42, rel=1e-6)
+
+def test_converged_derivatives_do_not_warn():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FisherStepWarning)
+        engine = FisherEngine()
+    assert max(engine.step_error.values()) < fisher.DERIV_RTOL
+
+def test_unconverged_derivatives_warn():
+    # m_phi/H0 = 20: a 1% step in m_phi crosses the WKB switch of grid nodes
+    with pytest.warns(FisherStepWarning, match='m_phi'):
+        FisherEngine([70.0, 0.3, 20 * GEV_PER_H_UNIT * 70.0])
+
+def test_solver_fallback_is_an_error(monkeypatch):
+    def failing(z, H0, Omega_m, m_phi):
+        warnings.warn("1 of 25 background solutions failed", SolverFallbackWarning)
+        return H_lcdm(np.asarray(z)[None, :], H0[:, None], Omega_m[:, None])
+    monkeypatch.setattr(fisher, 'H_zero_field_batch', failing)
+    with pytest.raises(RuntimeError, match='Fisher stencil'):
+        FisherEngine()
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+import background
+import mcmc_exploration
+from distances import R_D, distances_from_H, master_grid
+
+THETAS = np.array([[70.0, 0.3, 1e-42], [68.0, 0.31, 0.0], [72.0, 0.28, 5e-41]])
+
+def test_solver_functions_reexported():
+    from mcmc_exploration import H_lcdm, friedmann_zero_field, H_zero_field, H_zero_field_batch
+    assert H_lcdm is background.H_lcdm
+    assert friedmann_zero_field is background.friedmann_zero_field
+    assert H_zero_field is background.H_zero_field
+    assert H_zero_field_batch is background.H_zero_field_batch
+
+def test_solver_predictions_share_one_solve_per_point():
+    cache = background.BACKGROUND_CACHE
+    cache.clear()
+    mcmc_exploration.chi2_total_batch(THETAS, mcmc_exploration.load_data(), 'marginalize',
+                                      'solver')
+    # BAO solves every point, SNe is served from the cache
+    assert cache.info()['misses'] == len(THETAS)
+    assert cache.info()['hits'] == len(THETAS)
+
+def test_solver_predictions_match_closed_form_lcdm():
+    z = np.array([0.1, 0.5, 1.0, 2.0])
+    d = mcmc_exploration.solver_distances(THETAS[1:2], z)
+    z_grid = master_grid(z.max())
+    lcdm = distances_from_H(z, z_grid, background.H_lcdm(z_grid, 68.0, 0.31))
+    np.testing.assert_allclose(d['D_V'][0], lcdm['D_V'], rtol=1e-6)
+    np.testing.assert_allclose(d['mu'][0], lcdm['mu'], atol=1e-6)
+
+    bao = (z, lcdm['D_V'] / R_D, np.full(len(z), 0.01))
+    chi2 = mcmc_exploration.chi2_bao_batch(THETAS, bao, 'solver')
+    assert chi2[1] == pytest.approx(0.0, abs=1e-6)
+    assert chi2[0] > 1.0
+
+def test_unknown_predictions_raise():
+    with pytest.raises(ValueError, match='predictions'):
+        mcmc_exploration.chi2_total_batch(THETAS, mcmc_exploration.load_data(), None, 'emulator')
+
+# ----------------------------------------------------------------------------
+# Autocorrelation stopping rule
+# ----------------------------------------------------------------------------
+
+RHO = 0.8
+TAU = (1 + RHO) / (1 - RHO)   # integrated autocorrelation time of AR(1)
+
+def ar1_chain(n, nwalkers=32, ndim=2, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.empty((n, nwalkers, ndim))
+    x[0] = rng.standard_normal((nwalkers, ndim)) / np.sqrt(1 - RHO**2)
+    eps = rng.standard_normal((n, nwalkers, ndim))
+    for t in range(1, n):
+        x[t] = RHO * x[t - 1] + eps[t]
+    return x
+
+class ReplaySampler:
+    """Replays a precomputed chain through the emcee calls _run_phase makes"""
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.iteration = 0
+
+    def run_mcmc(self, state, nsteps):
+        self.iteration += nsteps
+        return state
+
+    def get_autocorr_time(self, tol=0):
+        from emcee.autocorr import integrated_time
+        return integrated_time(self.chain[:self.iteration], tol=tol)
+
+CHAIN = ar1_chain(6000)
+
+def test_ar1_tau_is_recovered():
+    sampler = ReplaySampler(CHAIN)
+    sampler.iteration = len(CHAIN)
+    np.testing.assert_allclose(sampler.get_autocorr_time(), TAU, rtol=0.1)
+
+def test_converged_only_when_long_and_stable():
+    sampler = ReplaySampler(CHAIN)
+    sampler.iteration = len(CHAIN)
+    tau = sampler.get_autocorr_time()
+    rtol = mcmc_exploration.TAU_RTOL
+
+    # n > N_tau τ and |Δτ|/τ < rtol
+    assert mcmc_exploration.autocorr_converged(sampler, tau * (1 + rtol / 2))[0]
+    # τ still drifting
+    assert not mcmc_exploration.autocorr_converged(sampler, tau * (1 + 2 * rtol))[0]
+    # chain shorter than N_tau τ
+    n_tau = int(len(CHAIN) / tau.max()) + 1
+    assert not mcmc_exploration.autocorr_converged(sampler, tau, n_tau=n_tau)[0]
+    # first estimate: nothing to compare with
+    assert not mcmc_exploration.autocorr_converged(sampler, np.inf)[0]
+
+def test_run_phase_stops_at_first_converged_check():
+    every = mcmc_exploration.CONVERGENCE_CHECK_EVERY
+    replay, tau_prev, expected = ReplaySampler(CHAIN), np.inf, None
+    for n in range(every, len(CHAIN) + 1, every):
+        replay.iteration = n
+        converged, tau_prev = mcmc_exploration.autocorr_converged(replay, tau_prev)
+        if converged:
+            expected = n
+            break
+    assert expected is not None and expected > mcmc_exploration.N_TAU * TAU * 0.8
+
+    sampler = ReplaySampler(CHAIN)
+    mcmc_exploration._run_phase(sampler, None, len(CHAIN), None, 'production', converge=True)
+    assert sampler.iteration == expected
+
+    # Not converged within the cap: keeps running up to nsteps
+    sampler = ReplaySampler(CHAIN)
+    mcmc_exploration._run_phase(sampler, None, expected - every, None, 'production',
+                                converge=True)
+    assert sampler.iteration == expected - every
+
+def test_burnin_and_thin_from_tau():
+    sampler = ReplaySampler(CHAIN)
+    sampler.iteration = len(CHAIN)
+    tau = sampler.get_autocorr_time()
+    assert mcmc_exploration.burnin_and_thin(sampler) == (int(2 * tau.max()), int(0.5 * tau.min()))
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+from scipy.stats import kstest
+
+import mock_catalogs
+from mock_catalogs import (MAX_COV_POINTS, SN_Z50, SN_Z_RANGE, SN_Z_WIDTH, bao_redshifts,
+                           draw_noise, sn_redshifts, systematics_covariance)
+
+def sn_cdf(Omega_m, z_range=SN_Z_RANGE, n=400):
+    """CDF of p(z) ∝ D_C² / E / (1+z) × efficiency(z), integrated with quad"""
+    E = lambda z: np.sqrt(Omega_m * (1 + z)**3 + 1 - Omega_m)
+    D_C = lambda z: quad(lambda x: 1 / E(x), 0, z)[0]
+    pdf = lambda z: D_C(z)**2 / E(z) / (1 + z) / (1 + np.exp((z - SN_Z50) / SN_Z_WIDTH))
+    nodes = np.linspace(*z_range, n)
+    cdf = np.concatenate([[0], np.cumsum([quad(pdf, a, b)[0]
+                                          for a, b in zip(nodes[:-1], nodes[1:])])])
+    return lambda z: np.interp(z, nodes, cdf / cdf[-1])
+
+@pytest.mark.parametrize('Omega_m', [0.3, 0.5])
+def test_sn_redshifts_follow_the_volume_weighted_distribution(Omega_m):
+    z = sn_redshifts(20000, np.random.default_rng(0), Omega_m=Omega_m)
+    assert np.all(np.diff(z) >= 0)
+    assert SN_Z_RANGE[0] <= z.min() and z.max() <= SN_Z_RANGE[1]
+    assert kstest(z, sn_cdf(Omega_m)).pvalue > 0.01
+
+def test_sn_redshifts_reject_the_wrong_cosmology():
+    z = sn_redshifts(20000, np.random.default_rng(0), Omega_m=0.3)
+    assert kstest(z, sn_cdf(1.0)).pvalue < 1e-3
+
+def test_bao_redshifts_stay_in_their_bins():
+    z = bao_redshifts(50, np.random.default_rng(1), z_range=(0.1, 2.1))
+    edges = np.linspace(0.1, 2.1, 51)
+    centers = 0.5 * (edges[1:] + edges[:-1])
+    assert np.all(np.abs(z - centers) <= 0.05 * (edges[1] - edges[0]))
+
+def test_systematics_covariance_structure():
+    z = np.array([0.1, 0.15, 0.5, 1.2])
+    sigma, sys = np.array([0.1, 0.12, 0.15, 0.2]), 0.02
+    cov = systematics_covariance(z, sigma, sys, length=0.1)
+    np.testing.assert_allclose(cov, cov.T)
+    np.testing.assert_allclose(np.diag(cov), sigma**2 + sys**2)
+    assert cov[0, 1] == pytest.approx(sys**2 * np.exp(-0.5))
+    assert np.all(np.linalg.eigvalsh(cov) > 0)
+
+    with pytest.raises(ValueError, match='limited'):
+        systematics_covariance(np.zeros(MAX_COV_POINTS + 1), 1.0, 0.0)
+
+def test_draw_noise_reproduces_the_covariance():
+    z = np.linspace(0.1, 0.5, 5)
+    sigma = np.full(5, 0.1)
+    cov = systematics_covariance(z, sigma, 0.08)
+    rng = np.random.default_rng(2)
+    draws = np.array([draw_noise(rng, sigma, cov) for _ in range(20000)])
+    np.testing.assert_allclose(np.cov(draws.T), cov, atol=5e-4)
+    diag = np.array([draw_noise(rng, sigma) for _ in range(20000)])
+    np.testing.assert_allclose(np.cov(diag.T), np.diag(sigma**2), atol=3e-4)
+
+def test_mock_sn_is_reproducible_and_centered_on_the_model():
+    pytest.importorskip('pandas')
+    df, cov = mock_catalogs.mock_sn(2000, seed=3)
+    again, _ = mock_catalogs.mock_sn(2000, seed=3)
+    np.testing.assert_array_equal(df.to_numpy(), again.to_numpy())
+    assert cov is None
+    pull = (df.mu_obs - mock_catalogs.chi2_sn.mu_lcdm(df.z, 70.0, 0.3)) / df.mu_err
+    assert abs(pull.mean()) < 0.1 and pull.std() == pytest.approx(1.0, abs=0.05)
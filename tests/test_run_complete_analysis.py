@@ -0,0 +1,90 @@
+import importlib
+import os
+import sys
+import time
+
+import pytest
+
+import run_complete_analysis as rca
+
+STAGE_SOURCE = '''
+import os
+import time
+
+def run(**inputs):
+    time.sleep({sleep})
+    if {fail}:
+        raise RuntimeError('boom')
+    with open('order.log', 'a') as f:
+        f.write('{name}\\n')
+    return {{'name': '{name}', 'pid': os.getpid(), 'inputs': inputs}}
+'''
+
+@pytest.fixture
+def dag(tmp_path, monkeypatch):
+    """Writes fake stage modules; returns make(name, inputs, sleep, fail, expensive)"""
+    src = tmp_path / 'src'
+    src.mkdir()
+    monkeypatch.syspath_prepend(str(src))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(rca, 'STAGE_CACHE', None)
+    monkeypatch.setattr(rca.AnalysisConfig, 'STAGES', {})
+    stages = {}
+
+    def make(name, inputs=(), sleep=0.0, fail=False, expensive=False):
+        source = STAGE_SOURCE.format(name=name, sleep=sleep, fail=fail)
+        (src / f'fake_{name}.py').write_text(source)
+        sys.modules.pop(f'fake_{name}', None)  # same name in an earlier test
+        importlib.invalidate_caches()
+        rca.AnalysisConfig.STAGES[name] = f'fake_{name}'
+        stages[name] = {'description': name, 'inputs': {a: a for a in inputs},
+                        'output': name, 'expensive': expensive}
+        return stages
+
+    return make
+
+def order(tmp_path):
+    return (tmp_path / 'order.log').read_text().split()
+
+def test_dependencies_run_first_and_feed_their_outputs(dag, tmp_path):
+    dag('a', ['data'])
+    dag('b')
+    stages = dag('c', ['a', 'b'])
+    artifacts = rca.run_dag(stages, {'data': 1})
+    assert order(tmp_path)[-1] == 'c'
+    assert set(order(tmp_path)) == {'a', 'b', 'c'}
+    assert artifacts['a']['inputs'] == {'data': 1}
+    assert artifacts['c']['inputs'] == {'a': artifacts['a'], 'b': artifacts['b']}
+    assert artifacts['c']['pid'] == os.getpid()
+
+def test_failure_skips_dependents_only(dag, tmp_path):
+    dag('a', fail=True)
+    dag('b')
+    dag('c', ['a', 'b'])
+    stages = dag('d', ['c'])
+    artifacts = rca.run_dag(stages, {})
+    assert order(tmp_path) == ['b']
+    assert 'b' in artifacts and not {'a', 'c', 'd'} & set(artifacts)
+
+def test_expensive_stages_run_concurrently_in_the_pool(dag, tmp_path):
+    dag('a', sleep=0.5, expensive=True)
+    dag('b', sleep=0.5, expensive=True)
+    dag('cheap')
+    stages = dag('c', ['a', 'b', 'cheap'])
+    start = time.perf_counter()
+    artifacts = rca.run_dag(stages, {}, jobs=2)
+    assert time.perf_counter() - start < 0.9
+    assert artifacts['a']['pid'] != os.getpid() and artifacts['b']['pid'] != os.getpid()
+    assert artifacts['cheap']['pid'] == artifacts['c']['pid'] == os.getpid()
+    assert order(tmp_path)[-1] == 'c'
+
+def test_cheap_stages_stay_in_process_with_jobs(dag):
+    dag('a')
+    stages = dag('b', ['a'])
+    artifacts = rca.run_dag(stages, {}, jobs=4)
+    assert artifacts['a']['pid'] == artifacts['b']['pid'] == os.getpid()
+
+def test_unsatisfied_dependency_raises(dag):
+    stages = dag('a', ['missing'])
+    with pytest.raises(ValueError, match='Dependências'):
+        rca.run_dag(stages, {})
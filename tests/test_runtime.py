@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ANALYSIS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analysis')
+HEAVY = ['matplotlib', 'emcee', 'corner', 'pandas']
+
+def run_python(code, **env):
+    """Fresh interpreter in analysis/ (nothing imported yet); returns parsed JSON stdout"""
+    environ = {k: v for k, v in os.environ.items() if k not in ('MPLBACKEND', 'ZFP_HEADLESS')}
+    environ.update(env)
+    out = subprocess.run([sys.executable, '-c', code], cwd=ANALYSIS, env=environ,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+def test_likelihood_path_imports_no_heavy_modules():
+    loaded = run_python(f"""
+import json, sys
+import mcmc_exploration
+data = mcmc_exploration.load_data()
+mcmc_exploration.chi2_total_batch(mcmc_exploration.FIDUCIAL[None], data)
+print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))
+""")
+    assert loaded == []
+
+def test_headless_env_selects_agg():
+    pytest.importorskip('matplotlib')
+    backend = run_python("""
+import json
+import runtime
+plt = runtime.pyplot()
+runtime.show()   # no-op, would block on an interactive backend
+print(json.dumps(plt.get_backend()))
+""", ZFP_HEADLESS='1')
+    assert backend.lower() == 'agg'
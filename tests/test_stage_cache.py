@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+import stage_cache
+from stage_cache import StageCache
+
+def test_key_depends_on_input_content(tmp_path):
+    cache = StageCache(str(tmp_path))
+    a = {'data': np.arange(5.0), 'mode': 'quick'}
+    same = {'mode': 'quick', 'data': np.arange(5.0)}
+    changed = {'data': np.arange(5.0) + 1e-12, 'mode': 'quick'}
+    key = cache.key('chi2_sn', 'chi2_sn', a)
+    assert key == cache.key('chi2_sn', 'chi2_sn', same)
+    assert key != cache.key('chi2_sn', 'chi2_sn', changed)
+    assert key != cache.key('chi2_bao', 'chi2_sn', a)
+
+def test_put_get_roundtrip_and_counters(tmp_path):
+    cache = StageCache(str(tmp_path))
+    assert cache.get('missing') is None
+    record = {'result': {'chi2': 1.5}, 'stdout': 'ok', 'elapsed': 0.1, 'error': None}
+    cache.put('k', record)
+    assert cache.get('k') == record
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    cache = StageCache(str(tmp_path), max_entries=2)
+    for i, key in enumerate(['a', 'b']):
+        cache.put(key, {'result': i})
+        os.utime(cache._entry_path(key), (i, i))
+    cache.get('a')            # refresh: 'b' is now the least recently used
+    cache.put('c', {'result': 2})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'result': 0}
+    assert cache.get('c') == {'result': 2}
+
+def test_source_version_follows_local_imports(tmp_path, monkeypatch):
+    monkeypatch.setattr(stage_cache, 'ANALYSIS_DIR', str(tmp_path))
+    (tmp_path / 'stage.py').write_text('import helper\n')
+    (tmp_path / 'helper.py').write_text('X = 1\n')
+    before = stage_cache.source_version('stage')
+    (tmp_path / 'helper.py').write_text('X = 2\n')
+    assert stage_cache.source_version('stage') != before
+
+FAKE_STAGE = '''
+def run(x):
+    with open('calls.log', 'a') as f:
+        f.write('call\\n')
+    with open('out.txt', 'w') as f:
+        f.write(str(x))
+    return {'x': x}
+'''
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    import run_complete_analysis as rca
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'fake_stage.py').write_text(FAKE_STAGE)
+    monkeypatch.syspath_prepend(str(src))
+    monkeypatch.setattr(stage_cache, 'ANALYSIS_DIR', str(src))
+    monkeypatch.setattr(rca.AnalysisConfig, 'STAGES', {'fake': 'fake_stage'})
+    monkeypatch.setattr(rca.AnalysisConfig, 'STAGE_OUTPUTS', {'fake': ['out.txt']})
+    monkeypatch.setattr(rca, 'STAGE_CACHE', StageCache(str(tmp_path / 'cache')))
+    monkeypatch.chdir(tmp_path)
+    return rca
+
+def test_cache_hit_restores_output_files(pipeline, tmp_path):
+    assert pipeline.run_stage('fake', 'fake stage', x=1) == {'x': 1}
+    (tmp_path / 'out.txt').unlink()
+    assert pipeline.run_stage('fake', 'fake stage', x=1) == {'x': 1}
+    assert (tmp_path / 'out.txt').read_text() == '1'
+    (tmp_path / 'out.txt').write_text('stale')
+    pipeline.run_stage('fake', 'fake stage', x=1)
+    assert (tmp_path / 'out.txt').read_text() == '1'
+    assert (tmp_path / 'calls.log').read_text().count('call') == 1
+
+def test_record_without_output_files_is_a_miss(pipeline, tmp_path):
+    cache = pipeline.STAGE_CACHE
+    key = cache.key('fake', 'fake_stage', {'x': 2})
+    cache.put(key, {'result': {'x': 2}, 'stdout': '', 'elapsed': 0.0, 'error': None})
+    pipeline.run_stage('fake', 'fake stage', x=2)
+    assert (tmp_path / 'calls.log').read_text().count('call') == 1
+    assert (tmp_path / 'out.txt').read_text() == '2'
+    assert cache.misses == 1
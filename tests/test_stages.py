@@ -0,0 +1,97 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import chi2_bao
+import chi2_cmb
+import chi2_conjugado
+import chi2_sn
+import mcmc_exploration
+
+DATA = mcmc_exploration.load_data()
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    """Stages write their outputs to the working directory"""
+    monkeypatch.chdir(tmp_path)
+
+def assert_chi2_result(result, keys=('chi2_lcdm', 'chi2_zfp')):
+    for key in keys:
+        assert isinstance(result[key], float) and np.isfinite(result[key])
+    # The pipeline caches results and collects them from worker processes
+    assert pickle.loads(pickle.dumps(result)) == result
+
+def test_bao_run():
+    result = chi2_bao.run(data=DATA[0])
+    assert set(result) == {'chi2_lcdm', 'chi2_zfp', 'n_points', 'veredito'}
+    assert_chi2_result(result)
+    z, DV, sigma = DATA[0]
+    assert result['n_points'] == len(z)
+    assert result['chi2_zfp'] == pytest.approx(chi2_bao.chi2(chi2_bao.DV_zero_field(z), DV, sigma))
+    assert result['veredito'] == ('PASSA' if result['chi2_zfp'] < result['chi2_lcdm'] + 5
+                                  else 'FALHA')
+    assert len(open('results.csv').readlines()) == len(z) + 1
+
+    os.remove('results.csv')
+    assert chi2_bao.run(data=DATA[0], output=None) == result
+    assert not os.path.exists('results.csv')
+
+def test_sn_run():
+    result = chi2_sn.run(data=DATA[1])
+    assert set(result) == {'chi2_lcdm', 'chi2_zfp', 'n_points'}
+    assert_chi2_result(result)
+    assert result['n_points'] == len(DATA[1][0])
+    # Profiling the μ offset can only lower χ² (offset 0 is one candidate)
+    profiled = chi2_sn.run(data=DATA[1], offset='profile')
+    assert profiled['chi2_lcdm'] <= result['chi2_lcdm']
+    assert profiled['chi2_zfp'] <= result['chi2_zfp']
+
+def test_cmb_run():
+    result = chi2_cmb.run()
+    assert set(result) == {'chi2_lcdm', 'chi2_zfp'}
+    assert_chi2_result(result)
+
+def test_conjugado_combines_the_probe_results():
+    bao = chi2_bao.run(data=DATA[0], output=None)
+    sn = chi2_sn.run(data=DATA[1])
+    result = chi2_conjugado.run(bao_result=bao, sn_result=sn)
+    assert set(result) == {'chi2_lcdm', 'chi2_zfp'}
+    assert_chi2_result(result)
+    for key in result:
+        assert result[key] == pytest.approx(chi2_conjugado.chi2_combined(bao[key], sn[key]))
+    # Without inputs it computes the probes itself
+    assert chi2_conjugado.run() == pytest.approx(result)
+
+@pytest.fixture
+def mcmc_result():
+    pytest.importorskip('emcee')
+    return mcmc_exploration.run(data=DATA, nwalkers=8, nsteps=20)
+
+def test_mcmc_run(mcmc_result):
+    samples = mcmc_result['samples']
+    assert samples.shape == (8 * 20, 3)
+    np.testing.assert_array_equal(np.load('mcmc_chains.npy'), samples)
+    assert (mcmc_result['n_steps'], mcmc_result['discard'], mcmc_result['thin']) == (20, 0, 1)
+    assert list(mcmc_result['summary']) == mcmc_exploration.PARAM_NAMES
+    for i, name in enumerate(mcmc_exploration.PARAM_NAMES):
+        np.testing.assert_allclose(mcmc_result['summary'][name],
+                                   np.percentile(samples[:, i], [16, 50, 84]))
+
+def test_plot_constraints_run(mcmc_result, monkeypatch):
+    pytest.importorskip('matplotlib')
+    pytest.importorskip('pandas')
+    monkeypatch.setenv('ZFP_HEADLESS', '1')
+    monkeypatch.setenv('MPLBACKEND', 'Agg')
+    import plot_constraints
+    samples = mcmc_result['samples']
+    stats = plot_constraints.run(samples=samples)
+    assert list(stats) == mcmc_exploration.PARAM_NAMES
+    for i, name in enumerate(stats):
+        s = stats[name]
+        assert set(s) == {'mean', 'median', 'std', 'ci_low', 'ci_high'}
+        assert s['mean'] == pytest.approx(samples[:, i].mean())
+        assert s['ci_low'] < s['median'] < s['ci_high']
+    assert os.path.getsize('constraints_zfp.png') > 0
+    assert len(open('constraint_statistics.csv').readlines()) == 1 + len(stats)
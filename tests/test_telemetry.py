@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pytest
+
+import mcmc_exploration
+import telemetry
+from telemetry import TELEMETRY, Histogram, Telemetry, scoped
+
+def test_histogram_merge_equals_single_histogram():
+    rng = np.random.default_rng(0)
+    a, b = 10**rng.uniform(-6, 2, 200), 10**rng.uniform(-4, 4, 300)
+    whole, left, right = Histogram(), Histogram(), Histogram()
+    for x in a:
+        left.add(x)
+        whole.add(x)
+    for x in b:
+        right.add(x)
+        whole.add(x)
+    left.merge(right.summary())
+    left.merge(Histogram().summary())  # empty: no-op
+    assert left.summary() == pytest.approx(whole.summary())
+    assert (left.min, left.max) == (whole.min, whole.max)
+    assert whole.quantile(0.5) >= np.median(np.concatenate([a, b]))
+
+def test_merge_adds_counters_and_histograms():
+    worker, parent = Telemetry(), Telemetry()
+    worker.count('solver.calls', 3)
+    worker.observe('solver.wall', 0.01)
+    parent.count('solver.calls')
+    parent.observe('solver.wall', 0.02)
+    parent.merge(worker.snapshot())
+    assert parent.counters['solver.calls'] == 4
+    assert parent.histograms['solver.wall'].n == 2
+    assert parent.histograms['solver.wall'].total == pytest.approx(0.03)
+
+def test_scoped_isolates_then_folds_back(monkeypatch):
+    monkeypatch.setattr(telemetry, 'TELEMETRY', Telemetry())
+    telemetry.TELEMETRY.count('outer')
+    with telemetry.scoped() as scope:
+        telemetry.TELEMETRY.count('inner', 2)
+    assert scope.snapshot()['counters'] == {'inner': 2}
+    assert telemetry.TELEMETRY.counters == {'outer': 1, 'inner': 2}
+
+def test_export_json_round_trip(tmp_path):
+    t = Telemetry()
+    t.count('likelihood.evals', 32)
+    with t.timer('chi2.sn'):
+        pass
+    path = tmp_path / 'telemetry.json'
+    t.export_json(str(path))
+    loaded = json.loads(path.read_text())
+    assert loaded == json.loads(json.dumps(t.snapshot()))
+    merged = Telemetry()
+    merged.merge(loaded)
+    assert merged.snapshot() == t.snapshot()
+
+@pytest.mark.parametrize('vectorize', [True, False])
+def test_pool_workers_report_their_telemetry(vectorize):
+    pytest.importorskip('emcee')
+    data = mcmc_exploration.load_data()
+    nwalkers, nburn, nsteps = 8, 2, 3
+    TELEMETRY.reset()
+    with scoped() as scope:
+        mcmc_exploration.run_mcmc(data, nwalkers=nwalkers, nsteps=nsteps, nburn=nburn,
+                                  vectorize=vectorize, workers=2, seed=0)
+    counters = scope.snapshot()['counters']
+    # Initial state + one evaluation per walker and step, all made in workers
+    assert counters['likelihood.evals'] == nwalkers * (1 + nburn + nsteps)
+    assert scope.snapshot()['histograms']['chi2.sn']['n'] > 0